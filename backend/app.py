@@ -1,14 +1,15 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import tempfile
 from pathlib import Path
 import sys
 
 # Add parent directory to path to import lens modules
 sys.path.append(str(Path(__file__).parent.parent))
+from metrics import collect_timings, format_seconds, instrument_flask, stage
+from singleflight import SingleFlight, content_key
 try:
-    from lens import analyze_image
+    from lens import analyze_image, analyze_image_buffer
     from scorer import compute_pait_score
     OCR_AVAILABLE = True
 except ImportError as e:
@@ -23,16 +24,61 @@ except ImportError as e:
             "ocrText": "OCR dependencies not installed.\nUsing demo mode.\nInstall: pip install Pillow pytesseract opencv-python"
         }
     
+    def analyze_image_buffer(data, filename=None):
+        return analyze_image(None)
+    
     def compute_pait_score(tags, confidence):
         return round(confidence * len(tags), 2)
 
+try:
+    from visual_analysis import register_visual_analysis_job_routes
+    VISUAL_JOBS_AVAILABLE = True
+except ImportError as e:
+    print(f"Visual analysis jobs not available: {e}")
+    VISUAL_JOBS_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app, "crella-lens")
+
+# Long multi-agent visual analyses run as background jobs (poll or SSE)
+if VISUAL_JOBS_AVAILABLE:
+    register_visual_analysis_job_routes(app)
 
 # Create upload directory if it doesn't exist
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Identical uploads arriving while one is being analysed share its result
+ANALYSIS_FLIGHTS = SingleFlight("analyze")
+
+def analyze_upload(image_data, filename=None):
+    """OCR + pAIt score for one uploaded image, in the /api/analyze response shape"""
+    with collect_timings() as timings:
+        # Analyze the image using existing lens module
+        analysis_result = analyze_image_buffer(image_data, filename)
+        
+        # Compute pAIt score using existing scorer module
+        with stage("scoring"):
+            pait_score = compute_pait_score(
+                analysis_result.get('tags', []), 
+                analysis_result.get('confidence', 0.0)
+            )
+    
+    # Format response
+    return {
+        'ocrText': analysis_result.get('ocrText', 'Sample extracted text from image analysis...'),
+        'tags': analysis_result.get('tags', []),
+        'confidence': analysis_result.get('confidence', 0.0),
+        'paitScore': pait_score,
+        'metadata': {
+            'imageSize': f"{len(image_data)} bytes",
+            'processingTime': format_seconds(timings.total_seconds),
+            'stageTimings': timings.as_ms(),  # Milliseconds per stage
+            'language': 'en'
+        }
+    }
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_image_api():
     try:
@@ -44,46 +90,20 @@ def analyze_image_api():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-            file.save(temp_file.name)
-            temp_path = temp_file.name
+        # Decode straight from the request stream (no temp-file round trip)
+        image_data = file.read()
         
-        try:
-            # Analyze the image using existing lens module
-            analysis_result = analyze_image(temp_path)
-            
-            # Compute pAIt score using existing scorer module
-            pait_score = compute_pait_score(
-                analysis_result.get('tags', []), 
-                analysis_result.get('confidence', 0.0)
-            )
-            
-            # Format response
-            response = {
-                'ocrText': analysis_result.get('ocrText', 'Sample extracted text from image analysis...'),
-                'tags': analysis_result.get('tags', []),
-                'confidence': analysis_result.get('confidence', 0.0),
-                'paitScore': pait_score,
-                'metadata': {
-                    'imageSize': f"{os.path.getsize(temp_path)} bytes",
-                    'processingTime': '1.2s',  # Mock timing for now
-                    'language': 'en'
-                }
-            }
-            
-            return jsonify(response)
-            
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_path)
+        response = ANALYSIS_FLIGHTS.do(content_key(image_data), analyze_upload, image_data, file.filename)
+        
+        return jsonify(response)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'service': 'Crella Lens API'})
+    return jsonify({'status': 'healthy', 'service': 'Crella Lens API',
+                    'singleFlight': ANALYSIS_FLIGHTS.stats()})
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8002)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+⚡ Crella Lens ASGI Service - Async /api/analyze with backpressure
+Production serving mode; app.py stays the Flask dev server
+
+OCR and scoring are CPU-bound, so every upload is analysed end to end in a
+bounded process pool (OCR runs inline in each pool process) while the
+event loop keeps receiving and parsing other uploads:
+
+- in-flight limit: at most N analyses run at once
+- queue limit: up to M more requests wait for a slot; past that the
+  request gets 429 with a Retry-After estimated from recent analysis times
+- graceful drain: on shutdown new uploads get 503, queued and running
+  analyses finish (up to the drain timeout), then the pool is shut down
+- /api/analyze/batch: many images in one multipart request, fanned out to
+  the pool and streamed back as NDJSON, one line per image as it finishes;
+  each image takes its own place under the in-flight + queue limit
+- identical uploads in flight at the same time share one analysis
+  (singleflight.py, keyed on the content hash)
+- a client that goes away drops its queued analyses; one already running
+  in the pool can't be stopped, so it keeps its place under the limits
+  until it finishes
+
+Responses are built by app.analyze_upload, so the JSON shape is exactly
+the Flask server's and the React front end is unaffected.
+
+Usage:
+    python backend/asgi_app.py --workers 4 --max-in-flight 4 --max-queue 16
+    LENS_MAX_QUEUE=16 uvicorn asgi_app:app --app-dir backend --port 8002
+"""
+
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+import logging
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app import analyze_upload
+from metrics import PROMETHEUS_CONTENT_TYPE, get_registry, record_stage
+from singleflight import SingleFlight, content_key
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.datastructures import UploadFile
+    from starlette.exceptions import HTTPException
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.responses import JSONResponse, Response, StreamingResponse
+    from starlette.routing import Route
+    ASGI_AVAILABLE = True
+except ImportError:
+    ASGI_AVAILABLE = False
+
+DEFAULT_RETRY_AFTER = 2.0  # Seconds per analysis before any have been timed
+BATCH_FIELDS = ('images', 'image')  # Multipart fields read by /api/analyze/batch
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _init_analysis_worker():
+    """Pool processes are the unit of parallelism: run OCR inline, no nested pool"""
+    os.environ["LENS_OCR_WORKERS"] = "0"
+
+
+def _timed_analysis(image_data, filename):
+    """analyze_upload plus its in-process seconds (excludes pool queueing)"""
+    started = time.perf_counter()
+    response = analyze_upload(image_data, filename)
+    return response, time.perf_counter() - started
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _record_worker_stages(response: dict):
+    """Stage timings measured in a pool process go into this process's metrics"""
+    for name, milliseconds in response.get('metadata', {}).get('stageTimings', {}).items():
+        record_stage(name, milliseconds / 1000)
+
+
+class AdmissionGate:
+    """In-flight and queue-depth limits for pooled analyses"""
+
+    def __init__(self, max_in_flight: int, max_queue: int, window: int = 50):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.pending = 0  # Admitted requests, from body upload until response
+        self.in_flight = 0
+        self.rejected = 0
+        self.draining = False
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._durations = deque(maxlen=window)
+
+    @property
+    def queued(self) -> int:
+        return self.pending - self.in_flight
+
+    def rejection(self, count: int = 1) -> Optional[int]:
+        """503 while draining, 429 when count more analyses would not fit in the slots and queue"""
+        if self.draining:
+            return 503
+        if self.pending + count > self.max_in_flight + self.max_queue:
+            self.rejected += 1
+            return 429
+        return None
+
+    def retry_after(self, count: int = 0) -> int:
+        """Seconds until the current backlog (plus count new analyses) should have cleared"""
+        average = sum(self._durations) / len(self._durations) if self._durations else DEFAULT_RETRY_AFTER
+        waves = max(1, self.pending + count) / self.max_in_flight
+        return max(1, math.ceil(average * waves))
+
+    @asynccontextmanager
+    async def admitted(self, count: int = 1):
+        """Count count analyses against the limits from admission until they complete"""
+        self._take(count)
+        try:
+            yield
+        finally:
+            self._give_back(count)
+
+    def _take(self, count: int):
+        self.pending += count
+        self._idle.clear()
+
+    def _give_back(self, count: int):
+        self.pending -= count
+        if self.pending == 0:
+            self._idle.set()
+
+    async def run(self, executor, function, *args):
+        """Run function in the pool once an in-flight slot is free
+
+        A pool task can't be cancelled once submitted, so when the caller
+        goes away the task keeps its slot and takes over the caller's place
+        under the limits until it finishes.
+        """
+        await self._slots.acquire()
+        self.in_flight += 1
+        started = time.perf_counter()
+        abandoned = False
+
+        def finished(_):
+            self.in_flight -= 1
+            self._durations.append(time.perf_counter() - started)
+            self._slots.release()
+            if abandoned:
+                self._give_back(1)
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, function, *args)
+        except BaseException:
+            finished(None)
+            raise
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done():
+                abandoned = True
+                self._take(1)
+            raise
+
+    async def drain(self, timeout: float) -> bool:
+        """Refuse new work and wait for admitted requests; False on timeout"""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def report(self) -> dict:
+        return {
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "maxInFlight": self.max_in_flight,
+            "maxQueue": self.max_queue,
+            "rejected": self.rejected
+        }
+
+
+def create_app(workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+               max_queue: Optional[int] = None, drain_timeout: Optional[float] = None,
+               batch_max_files: Optional[int] = None, batch_max_mb: Optional[float] = None):
+    """Starlette app serving /api/analyze(/batch) and /api/health from a process pool"""
+    if not ASGI_AVAILABLE:
+        raise RuntimeError("ASGI serving needs: pip install starlette uvicorn python-multipart")
+
+    workers = workers or _env_int("LENS_ANALYSIS_WORKERS", os.cpu_count() or 1)
+    max_in_flight = max_in_flight or _env_int("LENS_MAX_IN_FLIGHT", workers)
+    max_queue = max_queue if max_queue is not None else _env_int("LENS_MAX_QUEUE", 4 * max_in_flight)
+    drain_timeout = drain_timeout if drain_timeout is not None else float(os.environ.get("LENS_DRAIN_TIMEOUT", 30))
+    batch_max_files = batch_max_files or _env_int("LENS_BATCH_MAX_FILES", 50)
+    batch_max_bytes = int((batch_max_mb or float(os.environ.get("LENS_BATCH_MAX_MB", 200))) * 1024 * 1024)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.gate = AdmissionGate(max_in_flight, max_queue)
+        app.state.flights = SingleFlight("analyze")
+        app.state.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_analysis_worker)
+        logger.info(f"Analysis pool started: {workers} workers, "
+                    f"{max_in_flight} in flight, queue {max_queue}")
+        try:
+            yield
+        finally:
+            if not await app.state.gate.drain(drain_timeout):
+                logger.warning(f"Drain timed out after {drain_timeout}s, "
+                               f"dropping {app.state.gate.queued} queued analyses")
+            app.state.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def pooled(app, image_data, filename):
+        """(response, analysis seconds), one pool run per content hash in flight"""
+        async def run():
+            response, seconds = await app.state.gate.run(app.state.executor, _timed_analysis,
+                                                         image_data, filename)
+            _record_worker_stages(response)  # Once, not per joined caller
+            return response, seconds
+        return await app.state.flights.do_async(content_key(image_data), run)
+
+    def rejected(gate: AdmissionGate, status: int, count: int = 0):
+        error = 'Server is shutting down' if status == 503 else 'Analysis queue is full'
+        return JSONResponse({'error': error}, status_code=status,
+                            headers={'Retry-After': str(gate.retry_after(count))})
+
+    async def analyze_image_api(request):
+        gate = request.app.state.gate
+        status = gate.rejection()
+        if status is not None:
+            return rejected(gate, status)
+
+        try:
+            async with gate.admitted():
+                form = await request.form()
+                try:
+                    file = form.get('image')
+                    # Check if image file is in request
+                    if not isinstance(file, UploadFile):
+                        return JSONResponse({'error': 'No image file provided'}, status_code=400)
+                    if not file.filename:
+                        return JSONResponse({'error': 'No file selected'}, status_code=400)
+
+                    image_data = await file.read()
+                finally:
+                    await form.close()
+
+                response, _ = await pooled(request.app, image_data, file.filename)
+                return JSONResponse(response)
+
+        except Exception as e:
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+    async def analyze_batch_api(request):
+        gate = request.app.state.gate
+        status = gate.rejection()
+        if status is not None:
+            return rejected(gate, status)
+
+        too_large = {'error': f'Batch exceeds {batch_max_bytes // (1024 * 1024)} MB'}
+        if int(request.headers.get('content-length') or 0) > batch_max_bytes:
+            return JSONResponse(too_large, status_code=413)
+
+        # One place while the body is parsed, then one per image until the stream ends
+        stack = AsyncExitStack()
+        await stack.enter_async_context(gate.admitted())
+        try:
+            form = await request.form(max_files=batch_max_files + 1)
+            try:
+                files = [item for field in BATCH_FIELDS for item in form.getlist(field)
+                         if isinstance(item, UploadFile)]
+                if len(files) > batch_max_files:
+                    await stack.aclose()
+                    return JSONResponse({'error': f'Batch exceeds {batch_max_files} images'}, status_code=413)
+                if not files:
+                    await stack.aclose()
+                    return JSONResponse({'error': 'No image files provided'}, status_code=400)
+
+                uploads = [(file.filename, await file.read()) for file in files]
+            finally:
+                await form.close()
+        except HTTPException as e:
+            await stack.aclose()
+            return JSONResponse({'error': e.detail}, status_code=413 if 'Too many' in str(e.detail) else e.status_code)
+        except Exception as e:
+            await stack.aclose()
+            return JSONResponse({'error': str(e)}, status_code=500)
+
+        if sum(len(data) for _, data in uploads) > batch_max_bytes:
+            await stack.aclose()
+            return JSONResponse(too_large, status_code=413)
+
+        # Every image is queued on the pool, so each needs its own place under max_queue
+        status = gate.rejection(len(uploads) - 1)
+        if status is not None:
+            await stack.aclose()
+            return rejected(gate, status, len(uploads))
+        await stack.enter_async_context(gate.admitted(len(uploads) - 1))
+
+        received = time.perf_counter()
+
+        async def analyze_item(index: int, filename: str, image_data: bytes) -> dict:
+            line = {'index': index, 'filename': filename}
+            analysis_seconds = 0.0
+            try:
+                if not filename:
+                    line.update(status=400, error='No file selected')
+                else:
+                    response, analysis_seconds = await pooled(request.app, image_data, filename)
+                    line.update(status=200, result=response)
+            except Exception as e:
+                line.update(status=500, error=str(e))
+            total_seconds = time.perf_counter() - received
+            line['timing'] = {'queueMs': _ms(max(0.0, total_seconds - analysis_seconds)),
+                              'analysisMs': _ms(analysis_seconds),
+                              'totalMs': _ms(total_seconds)}
+            return line
+
+        async def stream():
+            tasks = [asyncio.ensure_future(analyze_item(index, filename, data))
+                     for index, (filename, data) in enumerate(uploads)]
+            try:
+                # One line per image in completion order, not upload order
+                for finished in asyncio.as_completed(tasks):
+                    yield json.dumps(await finished) + '\n'
+            finally:
+                for task in tasks:
+                    task.cancel()  # Client went away: images still waiting for a slot are dropped
+                await stack.aclose()
+
+        return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+    async def metrics_endpoint(request):
+        return Response(get_registry().render(), headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+    async def health_check(request):
+        return JSONResponse({'status': 'healthy', 'service': 'Crella Lens API',
+                             'load': request.app.state.gate.report(),
+                             'singleFlight': request.app.state.flights.stats()})
+
+    return Starlette(
+        routes=[
+            Route('/api/analyze', analyze_image_api, methods=['POST']),
+            Route('/api/analyze/batch', analyze_batch_api, methods=['POST']),
+            Route('/api/health', health_check, methods=['GET']),
+            Route('/metrics', metrics_endpoint, methods=['GET'])
+        ],
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        lifespan=lifespan
+    )
+
+
+app = create_app() if ASGI_AVAILABLE else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="⚡ Crella Lens async analysis service")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8002)
+    parser.add_argument('--workers', type=int, help='Analysis pool processes (default: CPU count)')
+    parser.add_argument('--max-in-flight', type=int, help='Concurrent analyses (default: --workers)')
+    parser.add_argument('--max-queue', type=int, help='Waiting requests before 429 (default: 4x in-flight)')
+    parser.add_argument('--drain-timeout', type=float, default=30.0, help='Shutdown drain limit in seconds')
+    parser.add_argument('--batch-max-files', type=int, help='Images per /api/analyze/batch request (default: 50)')
+    parser.add_argument('--batch-max-mb', type=float, help='Upload size per batch request (default: 200)')
+    args = parser.parse_args()
+
+    if not ASGI_AVAILABLE:
+        print("❌ ASGI serving needs: pip install starlette uvicorn python-multipart")
+        return
+
+    logging.basicConfig(level=logging.INFO)
+    service = create_app(args.workers, args.max_in_flight, args.max_queue, args.drain_timeout,
+                         args.batch_max_files, args.batch_max_mb)
+    uvicorn.run(service, host=args.host, port=args.port, timeout_graceful_shutdown=int(args.drain_timeout))
+
+
+if __name__ == '__main__':
+    main()
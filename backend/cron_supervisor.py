@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+👷 Cron Supervisor - N YouTube cron worker processes, restarted when they die
+Each worker is a YouTubeCronProcessor in its own process (spawned, so OCR
+runs on every core), named worker-0 ... worker-N-1:
+
+- workers lease uploads from the shared work queue and claim each one by
+  renaming it into lens-data/in_progress/<worker>/, so no upload is
+  analyzed twice
+- a worker that exits is restarted under the same name (after 1s, then
+  2s, 4s... up to 60s while it keeps crashing quickly); on start it moves
+  its leftover claims back to uploads/, and their leases expire so the
+  queue hands them out again
+- the supervisor alone writes processing_stats.json: the folded event log
+  of every worker (with byWorker) plus a "supervisor" section with worker
+  pids, restarts and the queue's state counts
+
+With once=True each worker drains the due uploads and exits; the
+supervisor returns when all of them have finished cleanly.
+
+Usage:
+    python backend/youtube_cron_processor.py --workers 4
+    python backend/youtube_cron_processor.py --workers 4 --once
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from metrics import get_registry
+from processing_stats import ProcessingStatsLog
+from work_queue import WorkQueue
+
+RESTARTS = get_registry().counter(
+    "lens_cron_worker_restarts_total", "Cron worker processes restarted after exiting", ("worker",))
+WORKERS_ALIVE = get_registry().gauge("lens_cron_workers_alive", "Cron worker processes running")
+
+
+async def _run_until_terminated(coroutine):
+    """Run a processor coroutine; SIGTERM cancels it, which releases its leases and claims"""
+    task = asyncio.ensure_future(coroutine)
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def run_worker(worker_name: str, options: Dict, interval: int, use_inotify: bool, once: bool):
+    """Worker process entry point: one processor on the shared queue"""
+    from youtube_cron_processor import YouTubeCronProcessor
+
+    processor = YouTubeCronProcessor(worker_name=worker_name, stats_interval=0, **options)
+    try:
+        if once:
+            asyncio.run(_run_until_terminated(processor.run_once()))
+        else:
+            asyncio.run(_run_until_terminated(processor.run_continuous(interval, use_inotify=use_inotify)))
+    except KeyboardInterrupt:
+        pass  # Ctrl-C reaches the whole process group; the supervisor handles shutdown
+
+
+class WorkerSlot:
+    """One named worker and its restart history"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.process: Optional[multiprocessing.Process] = None
+        self.started = 0.0
+        self.restarts = 0
+        self.quick_failures = 0  # Consecutive exits before healthy_after seconds
+        self.restart_at: Optional[float] = None
+        self.finished = False
+
+
+class CronSupervisor:
+    """Start N worker processes, restart any that exit and roll their stats into one snapshot"""
+
+    def __init__(self, workers: int, processor_options: Dict, interval: int = 60, use_inotify: bool = True,
+                 once: bool = False, stats_interval: float = 30.0, healthy_after: float = 60.0,
+                 max_restart_delay: float = 60.0, stop_timeout: float = 30.0):
+        self.processor_options = processor_options
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.once = once
+        self.stats_interval = stats_interval
+        self.healthy_after = healthy_after
+        self.max_restart_delay = max_restart_delay
+        self.stop_timeout = stop_timeout
+        self.check_interval = 0.5
+        self.context = multiprocessing.get_context("spawn")  # No inherited sqlite handles or event loops
+        self.slots: List[WorkerSlot] = [WorkerSlot(f"worker-{index}") for index in range(max(1, workers))]
+        self.stats = ProcessingStatsLog(snapshot_interval=stats_interval)
+        self.queue = WorkQueue("lens-data/work_queue.db", "uploads")
+        self.log_file = "lens-data/cron_logs/youtube_processor.log"
+        self.stopping = False
+        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+
+    def log_message(self, message: str):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_entry = f"[{timestamp}] [supervisor] {message}\n"
+        print(log_entry.strip())
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(log_entry)
+
+    def start_worker(self, slot: WorkerSlot):
+        slot.process = self.context.Process(
+            target=run_worker, name=slot.name,
+            args=(slot.name, self.processor_options, self.interval, self.use_inotify, self.once))
+        slot.process.start()
+        slot.started = time.monotonic()
+        slot.restart_at = None
+
+    def check_workers(self):
+        """Notice exited workers and (re)start them when due"""
+        now = time.monotonic()
+        for slot in self.slots:
+            if slot.finished:
+                continue
+            if slot.process is None:
+                if slot.restart_at is not None and now >= slot.restart_at:
+                    self.start_worker(slot)
+                continue
+            if slot.process.is_alive():
+                continue
+
+            pid, code = slot.process.pid, slot.process.exitcode
+            slot.process = None
+            if self.once and code == 0:
+                slot.finished = True
+                continue
+
+            slot.quick_failures = 0 if now - slot.started >= self.healthy_after else slot.quick_failures + 1
+            delay = min(self.max_restart_delay, 2 ** slot.quick_failures)
+            slot.restart_at = now + delay
+            slot.restarts += 1
+            RESTARTS.inc(slot.name)
+            self.log_message(f"💥 {slot.name} (pid {pid}) exited with code {code}; restarting in {delay}s")
+
+        WORKERS_ALIVE.set(sum(1 for slot in self.slots if slot.process is not None and slot.process.is_alive()))
+
+    def report(self) -> Dict:
+        """Worker processes, restarts and queue state"""
+        now = time.monotonic()
+        return {
+            "workers": [{
+                "name": slot.name,
+                "pid": slot.process.pid if slot.process is not None else None,
+                "alive": slot.process is not None and slot.process.is_alive(),
+                "finished": slot.finished,
+                "restarts": slot.restarts,
+                "uptimeSeconds": round(now - slot.started, 1) if slot.process is not None else None
+            } for slot in self.slots],
+            "restarts": sum(slot.restarts for slot in self.slots),
+            "queue": self.queue.stats(),
+            "updatedAt": datetime.now().isoformat()
+        }
+
+    def snapshot(self) -> Dict:
+        """processing_stats.json for all workers, with the supervisor section"""
+        try:
+            return self.stats.snapshot({"supervisor": self.report()})
+        except OSError as e:
+            self.log_message(f"Error writing stats snapshot: {e}")
+            return {}
+
+    def request_stop(self, signum=None, frame=None):
+        self.stopping = True
+
+    def stop(self):
+        """SIGTERM every worker (they release leases and claims), then kill stragglers"""
+        running = [slot.process for slot in self.slots if slot.process is not None and slot.process.is_alive()]
+        for process in running:
+            process.terminate()
+        deadline = time.monotonic() + self.stop_timeout
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        WORKERS_ALIVE.set(0)
+
+    def run(self) -> int:
+        """Supervise until stopped (or, with once, until every worker finished); 0 on a clean finish"""
+        previous_handlers = {signum: signal.signal(signum, self.request_stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+
+        for slot in self.slots:
+            self.start_worker(slot)
+        self.log_message(f"👷 Started {len(self.slots)} workers ({'once' if self.once else 'continuous'}, "
+                         f"concurrency {self.processor_options.get('concurrency')} each)")
+
+        next_snapshot = time.monotonic() + self.stats_interval
+        try:
+            while not self.stopping:
+                self.check_workers()
+                if self.once and all(slot.finished for slot in self.slots):
+                    break
+                if self.stats_interval and time.monotonic() >= next_snapshot:
+                    self.snapshot()
+                    next_snapshot = time.monotonic() + self.stats_interval
+                time.sleep(self.check_interval)
+        finally:
+            self.stop()
+            stats = self.snapshot()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        self.log_message(f"✅ Supervisor done: {stats.get('totalProcessed', 0)} processed in total, "
+                         f"{sum(slot.restarts for slot in self.slots)} worker restarts")
+        return 0 if all(slot.finished for slot in self.slots) or not self.once else 1
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+📊 Processing Stats - Append-only event log behind processing_stats.json
+Every processed upload appends one JSON line to
+lens-data/processing_events.jsonl. Each processor folds the log (its own
+events and every other processor's) into an in-memory aggregate and
+writes processing_stats.json from it on an interval, atomically.
+
+- many processors can append at once: each event is a single O_APPEND
+  write (under flock where available), so lines never interleave
+- snapshots are complete folds of the same log, so concurrent writers
+  agree instead of clobbering each other's counts
+- dailyStats and the per-day percentiles (dailyPercentiles: pAIt score
+  and processing time) keep the last retention_days days; the all-time
+  totals keep everything
+- byWorker breaks the totals down by the processor (worker) that did
+  the work, so a --workers N supervisor shows one rolled-up view
+- an existing processing_stats.json from before the log is carried over
+  as a baseline event the first time the log is created
+- the log stays bounded: once it holds events older than retention_days,
+  a snapshot rolls them into a single baseline event and rewrites the
+  log under the same lock (readers notice the new file and re-fold it;
+  skipped where flock is unavailable)
+
+Usage:
+    stats = ProcessingStatsLog()
+    stats.record(analysis_result, processing_seconds=12.4)
+    stats.snapshot()  # or: await stats.run_snapshots()
+"""
+
+import os
+import json
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    FLOCK_AVAILABLE = True
+except ImportError:
+    FLOCK_AVAILABLE = False
+
+PERCENTILES = (50, 90, 99)
+GRADES = ("high", "moderate", "low", "critical")
+
+
+def retention_cutoff(retention_days: int, today: Optional[datetime] = None) -> str:
+    """First day (YYYY-MM-DD) still inside the retention window"""
+    return ((today or datetime.now()) - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+
+
+def percentile_summary(values: List[float]) -> Optional[Dict]:
+    """Nearest-rank p50/p90/p99 plus min, max and mean"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    summary = {f"p{p}": ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] for p in PERCENTILES}
+    summary.update({"min": ordered[0], "max": ordered[-1], "mean": round(sum(ordered) / len(ordered), 2)})
+    return summary
+
+
+class StatsEventLog:
+    """JSONL file that processors only ever append to"""
+
+    def __init__(self, path: str = "lens-data/processing_events.jsonl"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, event: Dict):
+        """Write one event as a single line in a single write"""
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if FLOCK_AVAILABLE:
+                    fcntl.flock(fd, fcntl.LOCK_EX)  # Large lines are not atomic under O_APPEND alone
+                    if not self._is_current(fd):
+                        continue  # Compacted while we waited: append to the new file instead
+                os.write(fd, line)
+                return
+            finally:
+                os.close(fd)  # Also releases the lock
+
+    def _is_current(self, fd: int) -> bool:
+        """Whether fd is still the file at self.path (compact() replaces it)"""
+        try:
+            return os.fstat(fd).st_ino == os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return False
+
+    def create(self, first_event: Dict) -> bool:
+        """Start the log with first_event; False if it already exists"""
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return False
+        try:
+            os.write(fd, (json.dumps(first_event, separators=(",", ":")) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+        return True
+
+    def read_from(self, offset: int, file_id: Optional[int] = None) -> Tuple[List[Dict], int, Optional[int]]:
+        """Complete events after offset, the offset to continue from, and the file's id
+
+        If the log was compacted since file_id was read, the new file is
+        read from the start; a changed id tells the caller to re-fold.
+        """
+        events = []
+        try:
+            with open(self.path, "rb") as f:
+                current_id = os.fstat(f.fileno()).st_ino
+                if file_id is not None and current_id != file_id:
+                    offset = 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # A line still being written is left for the next read
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        logger.warning(f"Skipping malformed stats event in {self.path}: {line[:80]!r}")
+        except FileNotFoundError:
+            return [], offset, file_id
+        return events, offset, current_id
+
+    def compact(self, retention_days: int) -> bool:
+        """Roll events older than the retention window into one baseline event; False if nothing to roll
+
+        Runs under the append lock and replaces the file, so appenders
+        waiting on the old file retry against the new one.
+        """
+        if not FLOCK_AVAILABLE:
+            return False  # Appenders can't be held off without flock
+        cutoff = retention_cutoff(retention_days)
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            if not self._is_current(f.fileno()):
+                return False  # Another processor just compacted it
+
+            rolled, kept, expired = StatsAggregator(retention_days), [], 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn line from a writer that died mid-write
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("type") == "baseline" or event.get("ts", "")[:10] < cutoff:
+                    rolled.fold([event])
+                    expired += event.get("type") != "baseline"
+                else:
+                    kept.append(line)
+            if not expired:
+                return False
+
+            rolled.prune()
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".",
+                                             prefix=f".{os.path.basename(self.path)}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    out.write((json.dumps(rolled.baseline_event(), separators=(",", ":")) + "\n").encode("utf-8"))
+                    out.writelines(kept)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        logger.info(f"Compacted {expired} events older than {cutoff} in {self.path}")
+        return True
+
+
+class StatsAggregator:
+    """Running totals plus per-day score and processing-time samples"""
+
+    def __init__(self, retention_days: int = 90):
+        self.retention_days = retention_days
+        self.total = 0
+        self.score_sum = 0.0
+        self.distribution = {grade: 0 for grade in GRADES}
+        self.last_processed = None
+        self.daily_counts: Dict[str, int] = {}
+        self.daily_scores: Dict[str, List[float]] = {}
+        self.daily_processing_ms: Dict[str, List[float]] = {}
+        self.by_worker: Dict[str, List[float]] = {}  # Worker -> [processed, score sum]
+        self.oldest_day: Optional[str] = None        # Of the individual events folded (not baselines)
+
+    def fold(self, events: Iterable[Dict]):
+        for event in events:
+            if event.get("type") == "baseline":
+                self._fold_baseline(event)
+            else:
+                self._fold_processed(event)
+
+    def _fold_processed(self, event: Dict):
+        day = event["ts"][:10]
+        score = event.get("paitScore") or 0
+        self.total += 1
+        self.score_sum += score
+        if event.get("grade") in self.distribution:
+            self.distribution[event["grade"]] += 1
+        self.last_processed = max(self.last_processed or "", event["ts"])
+        worker = self.by_worker.setdefault(event.get("worker") or "main", [0, 0.0])
+        worker[0] += 1
+        worker[1] += score
+
+        self.oldest_day = min(self.oldest_day or day, day)
+        self.daily_counts[day] = self.daily_counts.get(day, 0) + 1
+        self.daily_scores.setdefault(day, []).append(score)
+        if event.get("processingMs") is not None:
+            self.daily_processing_ms.setdefault(day, []).append(event["processingMs"])
+
+    def _fold_baseline(self, event: Dict):
+        """Counts carried over from a pre-log processing_stats.json or a compaction (no samples)"""
+        total = event.get("totalProcessed", 0)
+        self.total += total
+        self.score_sum += event.get("scoreSum", event.get("averagePAItScore", 0) * total)
+        for grade, count in event.get("scoreDistribution", {}).items():
+            if grade in self.distribution:
+                self.distribution[grade] += count
+        if event.get("lastProcessed"):
+            self.last_processed = max(self.last_processed or "", event["lastProcessed"])
+        for day, count in event.get("dailyStats", {}).items():
+            self.daily_counts[day] = self.daily_counts.get(day, 0) + count
+        for name, totals in event.get("byWorker", {}).items():
+            worker = self.by_worker.setdefault(name, [0, 0.0])
+            worker[0] += totals.get("processed", 0)
+            worker[1] += totals.get("scoreSum", 0)
+
+    def baseline_event(self) -> Dict:
+        """Everything folded so far as one baseline event (counts only, no samples)"""
+        return {
+            "type": "baseline",
+            "totalProcessed": self.total,
+            "averagePAItScore": self.score_sum / self.total if self.total else 0,
+            "scoreSum": self.score_sum,
+            "scoreDistribution": dict(self.distribution),
+            "lastProcessed": self.last_processed,
+            "dailyStats": dict(sorted(self.daily_counts.items())),
+            "byWorker": {name: {"processed": processed, "scoreSum": score_sum}
+                         for name, (processed, score_sum) in sorted(self.by_worker.items())}
+        }
+
+    def prune(self, today: Optional[datetime] = None):
+        """Drop per-day detail older than retention_days"""
+        cutoff = retention_cutoff(self.retention_days, today)
+        for daily in (self.daily_counts, self.daily_scores, self.daily_processing_ms):
+            for day in [day for day in daily if day < cutoff]:
+                del daily[day]
+
+    def snapshot(self) -> Dict:
+        """processing_stats.json contents (the original fields plus dailyPercentiles)"""
+        self.prune()
+        days = sorted(self.daily_counts)
+        return {
+            "totalProcessed": self.total,
+            "averagePAItScore": self.score_sum / self.total if self.total else 0,
+            "scoreDistribution": dict(self.distribution),
+            "lastProcessed": self.last_processed,
+            "dailyStats": {day: self.daily_counts[day] for day in days},
+            "dailyPercentiles": {
+                day: {
+                    "paitScore": percentile_summary(self.daily_scores.get(day, [])),
+                    "processingMs": percentile_summary(self.daily_processing_ms.get(day, []))
+                }
+                for day in days if day in self.daily_scores
+            },
+            "byWorker": {
+                worker: {"processed": processed, "averagePAItScore": round(score_sum / processed, 1)}
+                for worker, (processed, score_sum) in sorted(self.by_worker.items())
+            },
+            "retentionDays": self.retention_days,
+            "generatedAt": datetime.now().isoformat()
+        }
+
+
+class ProcessingStatsLog:
+    """Record processed uploads to the event log and snapshot the fold to processing_stats.json"""
+
+    def __init__(self, events_path: str = "lens-data/processing_events.jsonl",
+                 snapshot_path: str = "lens-data/processing_stats.json",
+                 snapshot_interval: float = 30.0, retention_days: int = 90):
+        self.log = StatsEventLog(events_path)
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.aggregator = StatsAggregator(retention_days)
+        self.offset = 0
+        self.file_id = None  # Inode of the log file self.offset points into
+        self._carry_over_snapshot()
+
+    def record(self, analysis_result: Dict, processing_seconds: Optional[float] = None,
+               file_name: Optional[str] = None, worker: Optional[str] = None):
+        """Append one processed-upload event (folded on the next refresh)"""
+        if processing_seconds is None:
+            processing_seconds = sum(analysis_result.get("stageTimings", {}).values()) / 1000
+        self.log.append({
+            "ts": datetime.now().isoformat(),
+            "file": file_name,
+            "paitScore": analysis_result.get("paitScores", {}).get("overallScore", 0),
+            "grade": analysis_result.get("profitabilityGrade", "Unknown").lower(),
+            "processingMs": round(processing_seconds * 1000, 1),
+            "worker": worker,
+            "pid": os.getpid()
+        })
+
+    def refresh(self) -> StatsAggregator:
+        """Fold events appended since the last refresh, by any processor"""
+        events, self.offset, file_id = self.log.read_from(self.offset, self.file_id)
+        if self.file_id is not None and file_id != self.file_id:
+            # Compacted: the new file's baseline already holds everything folded so far
+            self.aggregator = StatsAggregator(self.aggregator.retention_days)
+        self.file_id = file_id
+        self.aggregator.fold(events)
+        return self.aggregator
+
+    def compact(self) -> bool:
+        """Roll events that have left the retention window into the log's baseline"""
+        aggregator = self.refresh()
+        if not aggregator.oldest_day or aggregator.oldest_day >= retention_cutoff(aggregator.retention_days):
+            return False
+        compacted = self.log.compact(aggregator.retention_days)
+        if compacted:
+            self.refresh()
+        return compacted
+
+    def snapshot(self, extra: Optional[Dict] = None) -> Dict:
+        """Refresh and compact, then write processing_stats.json atomically (with extra top-level sections)"""
+        self.compact()
+        stats = self.refresh().snapshot()
+        stats.update(extra or {})
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(stats, f, indent=2)
+        os.replace(temp_path, self.snapshot_path)
+        return stats
+
+    async def run_snapshots(self):
+        """Snapshot every snapshot_interval seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                self.snapshot()
+            except OSError as e:
+                logger.error(f"Error writing stats snapshot: {e}")
+
+    def _carry_over_snapshot(self):
+        """Seed a new log with the counts in a processing_stats.json written before it existed"""
+        if os.path.exists(self.log.path) or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path) as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        baseline = {key: legacy.get(key) for key in
+                    ("totalProcessed", "averagePAItScore", "scoreDistribution", "lastProcessed", "dailyStats")
+                    if legacy.get(key) is not None}
+        if self.log.create({"type": "baseline", **baseline}):  # Only one processor wins the creation
+            logger.info(f"Carried {baseline.get('totalProcessed', 0)} processed uploads over into {self.log.path}")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+👀 Upload Watcher - Event-driven queue of new screenshot uploads
+Feeds YouTubeCronProcessor without a fixed 60-second directory walk
+
+- inotify (Linux, inotify_simple from backend/requirements.txt): a file
+  is queued the moment its writer closes it (IN_CLOSE_WRITE) or it is
+  renamed into the directory (IN_MOVED_TO); no scan involved, plus a
+  rescan every rescan_interval seconds that catches anything missed
+  (inotify queue overflow, failed uploads left in place for retry)
+- polling fallback (other platforms, or inotify failing to start): one
+  scandir every poll_interval seconds (1s by default, not the rescan
+  interval, so uploads still start within about a second), and only
+  names not already queued are checked against processed/ (a stat per
+  new file, not per entry); files are queued once their mtime has settled
+
+The watcher only hands uploads over; the processor exports the real
+backlog and detection-to-start latency (youtube_cron_processor.py), using
+detected_at() for the detection time.
+
+Usage:
+    watcher = UploadWatcher("lens-data/uploads/", "lens-data/processed/")
+    await watcher.start()
+    path = await watcher.get()
+    ...
+    watcher.task_done(path)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
+
+
+class UploadWatcher:
+    """asyncio queue of settled, unprocessed uploads in a directory"""
+
+    def __init__(self, watch_dir: str, processed_dir: str, rescan_interval: float = 60.0,
+                 settle_seconds: float = 2.0, use_inotify: bool = True, poll_interval: float = 1.0):
+        self.watch_dir = Path(watch_dir)
+        self.processed_dir = Path(processed_dir)
+        self.rescan_interval = rescan_interval  # Safety-net rescan with inotify
+        self.poll_interval = min(poll_interval, rescan_interval)  # Scan interval without inotify
+        self.settle_seconds = settle_seconds  # Scans skip files modified this recently (still being written)
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._detected: Dict[str, float] = {}  # Queued or in-progress name -> detection time (epoch)
+        self._inotify = None
+        self._rescan_task = None
+        self.detected_count = 0
+        self.started_count = 0
+
+    async def start(self):
+        """Queue existing uploads, then follow new ones"""
+        self.queue = asyncio.Queue()
+        self.mode = "polling"
+
+        if self.use_inotify and INOTIFY_AVAILABLE:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(str(self.watch_dir), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+                asyncio.get_running_loop().add_reader(self._inotify.fileno(), self._on_inotify)
+                self.mode = "inotify"
+            except OSError as e:
+                logger.warning(f"inotify unavailable ({e}), falling back to polling")
+                self._close_inotify()
+
+        self._rescan_task = asyncio.ensure_future(self._rescan_loop(unsettled=self.scan()))
+
+    async def get(self) -> str:
+        """Next upload to process (waits until one arrives)"""
+        path = await self.queue.get()
+        self.started_count += 1
+        return path
+
+    def detected_at(self, path: str) -> float:
+        """When the upload was detected (time.time()); now if it is not being tracked"""
+        return self._detected.get(Path(path).name, time.time())
+
+    def task_done(self, path: str):
+        """Processing finished (either way); a file still present is found again by a later rescan"""
+        self._detected.pop(Path(path).name, None)
+
+    def scan(self) -> bool:
+        """Queue every settled, unprocessed upload; True if some were still being written"""
+        unsettled = False
+        now = time.time()
+        try:
+            with os.scandir(self.watch_dir) as entries:
+                for entry in entries:
+                    if entry.name in self._detected or not entry.is_file() or not self._candidate(entry.name):
+                        continue
+                    if now - entry.stat().st_mtime < self.settle_seconds:
+                        unsettled = True  # May still be written: IN_CLOSE_WRITE or the next (prompt) scan picks it up
+                        continue
+                    self._enqueue(entry.name)
+        except OSError as e:
+            logger.error(f"Error scanning uploads: {e}")
+        return unsettled
+
+    def stop(self):
+        if self._rescan_task is not None:
+            self._rescan_task.cancel()
+            self._rescan_task = None
+        self._close_inotify()
+
+    def stats(self) -> Dict:
+        """Uploads detected and handed over"""
+        queued = self.queue.qsize() if self.queue is not None else 0
+        return {
+            "mode": self.mode,
+            "queueDepth": queued,
+            "inProgress": len(self._detected) - queued,
+            "detected": self.detected_count,
+            "started": self.started_count
+        }
+
+    def _candidate(self, name: str) -> bool:
+        """Supported image not already in processed/"""
+        return (Path(name).suffix.lower() in SUPPORTED_FORMATS
+                and not (self.processed_dir / name).exists())
+
+    def _enqueue(self, name: str):
+        self._detected[name] = time.time()
+        self.detected_count += 1
+        self.queue.put_nowait(str(self.watch_dir / name))
+
+    def _on_inotify(self):
+        for event in self._inotify.read(timeout=0):
+            if event.mask & inotify_flags.Q_OVERFLOW:
+                logger.warning("inotify queue overflow, rescanning uploads")
+                self.scan()
+            elif event.name and event.name not in self._detected and self._candidate(event.name):
+                self._enqueue(event.name)
+
+    async def _rescan_loop(self, unsettled: bool = False):
+        while True:
+            # Rescan soon after unsettled files, in inotify mode too: a file renamed in or closed
+            # before the watch was added (a worker returning its claims) gets no further event
+            interval = self.rescan_interval if self.mode == "inotify" else self.poll_interval
+            await asyncio.sleep(min(self.settle_seconds, interval) if unsettled else interval)
+            unsettled = self.scan()
+
+    def _close_inotify(self):
+        if self._inotify is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._inotify.fileno())
+            except (RuntimeError, ValueError):
+                pass
+            self._inotify.close()
+            self._inotify = None
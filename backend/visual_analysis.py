@@ -2,45 +2,85 @@
 """
 🎨 Visual pAIt Analysis Backend
 Handles image-to-visual-analysis generation with H100 integration
+
+Analyses can also run as background jobs (VisualAnalysisJobs): POST returns
+a job id at once, clients poll the job or follow its stage progress
+(ocr_done, kathy_done, package_saved) over Server-Sent Events, so web
+workers never sit on H100 latency. Submissions beyond the worker count
+plus max_backlog (LENS_MAX_JOB_BACKLOG, default 4x workers) get a 429 with
+a Retry-After, like the ASGI admission gate.
 """
 
 import json
+import math
+import os
+import sys
+import time
 import requests
 import hashlib
+import threading
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import logging
 
+# Shared OCR modules live at the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+from metrics import collect_timings, format_seconds, stage
+from singleflight import SingleFlight, content_key
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VisualAnalysisBackend:
+    # Shared by every instance: the Flask endpoint builds a backend per request
+    flights = SingleFlight("visual_analysis")
+    
     def __init__(self, h100_ip="143.198.44.252"):
         self.h100_ip = h100_ip
         self.ollama_base = f"http://{h100_ip}:11434"
         self.output_dir = Path("../lens-data/visual_analysis")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-    def analyze_social_media_image(self, image_data, image_metadata=None):
-        """Analyze uploaded social media image with multi-agent system"""
+    def analyze_social_media_image(self, image_data, image_metadata=None, progress=None):
+        """Analyze uploaded social media image with multi-agent system
         
+        progress, if given, is called as progress(stage, details) after each
+        stage (ocr_done, kathy_done, package_saved). Concurrent calls with the
+        same image bytes share one run (and its result and progress events).
+        """
+        key = f"{self.h100_ip}:{content_key(image_data)}"
+        return self.flights.do_with_progress(key, self._analyze_social_media_image,
+                                             image_data, image_metadata, progress=progress)
+    
+    def _analyze_social_media_image(self, image_data, image_metadata, report):
+        """One OCR → Kathy → package → save run"""
         try:
-            # Extract text from image (simplified OCR)
-            extracted_text = self.extract_text_from_image(image_data)
-            
-            # Get enhanced analysis from Kathy-Ops
-            kathy_analysis = self.get_kathy_analysis(extracted_text)
-            
-            # Generate visual analysis package
-            visual_package = self.create_visual_package(
-                extracted_text, 
-                kathy_analysis,
-                image_metadata
-            )
-            
-            # Save analysis
-            self.save_analysis(visual_package)
+            with collect_timings() as timings:
+                # Extract text from image (simplified OCR)
+                with stage("ocr"):
+                    extracted_text = self.extract_text_from_image(image_data)
+                report("ocr_done", {"characters": len(extracted_text)})
+                
+                # Get enhanced analysis from Kathy-Ops
+                with stage("llm"):
+                    kathy_analysis = self.get_kathy_analysis(extracted_text)
+                report("kathy_done", {"characters": len(kathy_analysis)})
+                
+                # Generate visual analysis package
+                visual_package = self.create_visual_package(
+                    extracted_text, 
+                    kathy_analysis,
+                    image_metadata,
+                    timings
+                )
+                
+                # Save analysis
+                with stage("persistence"):
+                    saved_path = self.save_analysis(visual_package)
+                report("package_saved", {"path": saved_path})
             
             return {
                 "success": True,
@@ -57,9 +97,25 @@ class VisualAnalysisBackend:
             }
     
     def extract_text_from_image(self, image_data):
-        """Extract text from uploaded image (simplified OCR)"""
-        # In production, this would use actual OCR
-        # For demo, return representative text based on common social media patterns
+        """Extract text from uploaded image, OCR'ing only detected text regions"""
+        try:
+            from ocr_engine import get_engine, OCR_AVAILABLE
+            from ocr_preprocess import decode_image, normalize_for_ocr
+            from text_regions import ocr_text_regions
+            
+            image = decode_image(image_data) if OCR_AVAILABLE else None
+            if image is not None:
+                # Rescale so text is OCR-sized first, as lens.analyze_decoded does
+                image, _ = normalize_for_ocr(image)
+                text = ocr_text_regions(image, get_engine())["text"].strip()
+                if text:
+                    return text
+        except ImportError as e:
+            logger.warning(f"OCR unavailable, using demo extraction: {e}")
+        except Exception as e:
+            logger.warning(f"OCR failed, using demo extraction: {e}")
+        
+        # No OCR (or nothing readable): return representative text based on common social media patterns
         
         demo_extractions = [
             {
@@ -122,8 +178,11 @@ Format as JSON with specific scores and insights.
             logger.warning(f"H100 analysis failed: {e}")
             return "Multi-agent analysis: AI music democratization shows framework-level innovation with 2200 pAIt score. Platforms identified: Suno, Udio, Amper Music. Technical accuracy 7/10, strategic depth 8/10."
     
-    def create_visual_package(self, extracted_text, kathy_analysis, image_metadata):
-        """Create comprehensive visual analysis package"""
+    def create_visual_package(self, extracted_text, kathy_analysis, image_metadata, timings=None):
+        """Create comprehensive visual analysis package
+        
+        timings (metrics.StageTimings) supplies the real processing time so far.
+        """
         
         analysis_id = str(uuid.uuid4())[:8]
         timestamp = datetime.now()
@@ -139,7 +198,8 @@ Format as JSON with specific scores and insights.
                 "analysis_id": analysis_id,
                 "generated_at": timestamp.isoformat(),
                 "version": "crella_lens_v2.0",
-                "processing_time": "3.2s",
+                "processing_time": format_seconds(timings.elapsed()) if timings else None,
+                "stage_timings_ms": timings.as_ms() if timings else {},
                 "h100_server": self.h100_ip
             },
             "pait_scoring": {
@@ -240,6 +300,150 @@ Format as JSON with specific scores and insights.
         logger.info(f"Visual analysis saved: {filename}")
         return str(filename)
 
+JOB_STAGES = ("ocr_done", "kathy_done", "package_saved")
+JOB_FINISHED = ("done", "failed")
+DEFAULT_JOB_SECONDS = 10.0  # Retry-After estimate per job before any have finished
+
+class VisualAnalysisJobs:
+    """Background worker pool running visual analyses as pollable jobs"""
+    
+    def __init__(self, backend=None, workers=4, retention=3600, max_backlog=None):
+        self.backend = backend or VisualAnalysisBackend()
+        self.retention = retention  # Seconds finished jobs stay queryable
+        self.workers = workers
+        if max_backlog is None:
+            max_backlog = int(os.environ.get("LENS_MAX_JOB_BACKLOG") or 4 * workers)
+        self.max_backlog = max(0, max_backlog)  # Queued jobs allowed beyond the running ones
+        self.rejected = 0
+        self._durations = deque(maxlen=50)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="visual-job")
+        self._jobs = OrderedDict()
+        self._finished = {}  # job id -> monotonic finish time, for pruning
+        self._changed = threading.Condition()
+    
+    def submit(self, image_data, image_metadata=None):
+        """Queue an analysis and return its job id immediately, or None if the backlog is full"""
+        job_id = uuid.uuid4().hex[:12]
+        with self._changed:
+            self._prune()
+            if self._unfinished() >= self.workers + self.max_backlog:
+                self.rejected += 1
+                return None
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "stage": None,
+                "created_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "events": [],
+                "result": None,
+                "error": None
+            }
+            self._record(job_id, "queued", {})
+        
+        self._executor.submit(self._run, job_id, image_data, image_metadata)
+        return job_id
+    
+    def get(self, job_id):
+        """Snapshot of a job (status, stage, events, result), or None"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return dict(job, events=list(job["events"]))
+    
+    def events(self, job_id, after=0, heartbeat=15.0):
+        """Yield (event id, event) as the job records them until it finishes
+        
+        Yields (None, None) when nothing happened for heartbeat seconds, so
+        streams can send a keep-alive. after skips already-seen event ids.
+        """
+        while True:
+            with self._changed:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if len(job["events"]) <= after and job["status"] not in JOB_FINISHED:
+                    self._changed.wait(heartbeat)
+                new_events = job["events"][after:]
+                finished = job["status"] in JOB_FINISHED
+            
+            for event in new_events:
+                after += 1
+                yield after, event
+            if finished:
+                return
+            if not new_events:
+                yield None, None
+    
+    def retry_after(self):
+        """Seconds until the current backlog should have cleared"""
+        with self._changed:
+            average = sum(self._durations) / len(self._durations) if self._durations else DEFAULT_JOB_SECONDS
+            waves = max(1, self._unfinished()) / self.workers
+        return max(1, math.ceil(average * waves))
+    
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, job_id, image_data, image_metadata):
+        started = time.monotonic()
+        with self._changed:
+            self._jobs[job_id]["status"] = "running"
+            self._record(job_id, "started", {})
+        
+        def progress(stage, details):
+            with self._changed:
+                self._jobs[job_id]["stage"] = stage
+                self._record(job_id, stage, details)
+        
+        try:
+            result = self.backend.analyze_social_media_image(image_data, image_metadata, progress)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        
+        with self._changed:
+            job = self._jobs[job_id]
+            job["status"] = "done" if result.get("success") else "failed"
+            job["result"] = result
+            job["error"] = result.get("error")
+            job["finished_at"] = datetime.now().isoformat()
+            self._finished[job_id] = time.monotonic()
+            self._durations.append(self._finished[job_id] - started)
+            self._record(job_id, job["status"], {"error": job["error"]} if job["error"] else {})
+    
+    def _record(self, job_id, event, details):
+        """Append a progress event and wake event streams (caller holds the lock)"""
+        self._jobs[job_id]["events"].append({
+            "event": event,
+            "at": datetime.now().isoformat(),
+            **details
+        })
+        self._changed.notify_all()
+    
+    def _unfinished(self):
+        """Queued plus running jobs (caller holds the lock)"""
+        return len(self._jobs) - len(self._finished)
+    
+    def _prune(self):
+        """Forget finished jobs older than the retention window (caller holds the lock)"""
+        cutoff = time.monotonic() - self.retention
+        expired = [job_id for job_id, finished in self._finished.items() if finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+            del self._finished[job_id]
+
+_visual_jobs = None
+_visual_jobs_lock = threading.Lock()
+
+def get_visual_analysis_jobs():
+    """Process-wide job pool (created on first use)"""
+    global _visual_jobs
+    with _visual_jobs_lock:
+        if _visual_jobs is None:
+            _visual_jobs = VisualAnalysisJobs()
+        return _visual_jobs
+
 def create_visual_analysis_endpoint():
     """Create Flask endpoint for visual analysis"""
     
@@ -270,6 +474,68 @@ def create_visual_analysis_endpoint():
     
     return analyze_visual
 
+def register_visual_analysis_job_routes(app, jobs=None, url_prefix="/api/visual-analysis/jobs"):
+    """Register the job API on a Flask app
+    
+    POST   {url_prefix}                  -> 202 {"job_id", "status_url", "events_url"}
+                                            (429 + Retry-After when the backlog is full)
+    GET    {url_prefix}/<job_id>         -> job snapshot (poll)
+    GET    {url_prefix}/<job_id>/events  -> text/event-stream of stage events
+    """
+    from flask import Response, request, jsonify, stream_with_context
+    
+    def job_pool():
+        return jobs or get_visual_analysis_jobs()
+    
+    def submit_job():
+        if 'image' not in request.files:
+            return jsonify({"error": "No image provided"}), 400
+        
+        image_file = request.files['image']
+        image_data = image_file.read()
+        job_id = job_pool().submit(image_data, {"filename": image_file.filename, "size": len(image_data)})
+        if job_id is None:
+            return jsonify({"error": "Analysis queue is full"}), 429, {"Retry-After": str(job_pool().retry_after())}
+        
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"{url_prefix}/{job_id}",
+            "events_url": f"{url_prefix}/{job_id}/events"
+        }), 202
+    
+    def job_status(job_id):
+        job = job_pool().get(job_id)
+        if job is None:
+            return jsonify({"error": "Unknown job"}), 404
+        return jsonify(job)
+    
+    def job_events(job_id):
+        if job_pool().get(job_id) is None:
+            return jsonify({"error": "Unknown job"}), 404
+        try:
+            after = max(0, int(request.headers.get("Last-Event-ID") or 0))
+        except ValueError:
+            after = 0  # Not one of our ids: replay from the start
+        
+        def stream():
+            for event_id, event in job_pool().events(job_id, after=after):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = dict(event)
+                if event["event"] in JOB_FINISHED:
+                    job = job_pool().get(job_id)  # None if pruned since the event was read
+                    payload["result"] = job["result"] if job else None
+                yield f"id: {event_id}\nevent: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+        
+        return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    
+    app.add_url_rule(url_prefix, "visual_analysis_job_submit", submit_job, methods=["POST"])
+    app.add_url_rule(f"{url_prefix}/<job_id>", "visual_analysis_job_status", job_status, methods=["GET"])
+    app.add_url_rule(f"{url_prefix}/<job_id>/events", "visual_analysis_job_events", job_events, methods=["GET"])
+
 # For testing
 if __name__ == "__main__":
     backend = VisualAnalysisBackend()
@@ -6,25 +6,188 @@ Advanced AI-powered trading video analysis with pAIt scoring
 
 import json
 import os
+import sys
+import time
+import asyncio
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import requests
 try:
     from PIL import Image, ExifTags
-    import pytesseract
     import cv2
     import numpy as np
 except ImportError as e:
     print(f"Warning: Some dependencies not available: {e}")
     print("Run: pip install pillow opencv-python pytesseract numpy")
 
+# Shared OCR engine lives at the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+from ocr_engine import get_engine
+from ocr_result import OCRResult
+from scoring_engine import camel_case, document_features, get_scoring_engine
+from metrics import record_stage
+try:
+    from ocr_preprocess import normalize_for_ocr, recognize_tiled
+except ImportError:
+    pass  # OpenCV/NumPy missing: warned above, stages fall back to empty results
+
+class AnalysisContext:
+    """Per-request artifact store: every stage output is computed at most once"""
+    
+    def __init__(self, image_file_path: str):
+        self.image_file_path = image_file_path
+        self.artifacts: Dict[str, object] = {}
+        self.timings: Dict[str, float] = {}  # Stage name -> milliseconds
+    
+    def has(self, stage: str) -> bool:
+        return stage in self.artifacts
+    
+    def get(self, stage: str):
+        return self.artifacts[stage]
+
 class YouTubeAnalysisService:
+    # Stage graph: stage -> upstream stages it reads from
+    # decode → preprocess → OCR → parse details → score → SWOT → agents → persist
+    STAGE_GRAPH = {
+        "decode": (),
+        "preprocess": ("decode",),
+        "ocr": ("preprocess",),
+        "details": ("ocr",),
+        "score": ("ocr",),
+        "swot": ("score", "ocr"),
+        "agents": ("details", "score"),
+        "persist": ("details", "ocr", "score", "swot", "agents"),
+    }
+    # Stage names as reported in the shared lens_stage_seconds histogram
+    METRIC_STAGES = {"score": "scoring", "agents": "llm", "persist": "persistence"}
+    # CPU-bound stages that can run in a pool process (see run_cpu_stages)
+    CPU_STAGES = ("details", "swot")
+    
     def __init__(self):
         self.analysis_data_dir = "lens-data/youtube-analysis/"
         self.claire_api_url = "http://localhost:5001/api/claire/chat"
         os.makedirs(self.analysis_data_dir, exist_ok=True)
     
-    def extract_metadata(self, image_file_path: str) -> Dict:
+    async def run_stage(self, ctx: AnalysisContext, stage: str):
+        """Run a stage (and its upstream stages) once per context, recording timings"""
+        if ctx.has(stage):
+            return ctx.get(stage)
+        
+        for upstream in self.STAGE_GRAPH[stage]:
+            await self.run_stage(ctx, upstream)
+        
+        start = time.perf_counter()
+        result = getattr(self, f"stage_{stage}")(ctx)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return self._record_stage(ctx, stage, result, start)
+    
+    def run_stage_sync(self, ctx: AnalysisContext, stage: str):
+        """Synchronous variant for the CPU-only stages (decode → swot)"""
+        if ctx.has(stage):
+            return ctx.get(stage)
+        
+        stage_fn = getattr(self, f"stage_{stage}")
+        if asyncio.iscoroutinefunction(stage_fn):
+            raise ValueError(f"Stage '{stage}' is async; use run_stage()")
+        
+        for upstream in self.STAGE_GRAPH[stage]:
+            self.run_stage_sync(ctx, upstream)
+        
+        start = time.perf_counter()
+        return self._record_stage(ctx, stage, stage_fn(ctx), start)
+    
+    def _record_stage(self, ctx: AnalysisContext, stage: str, result, start: float):
+        seconds = time.perf_counter() - start
+        ctx.timings[stage] = round(seconds * 1000, 2)
+        record_stage(self.METRIC_STAGES.get(stage, stage), seconds)
+        ctx.artifacts[stage] = result
+        return result
+    
+    # --- Stages -------------------------------------------------------
+    
+    def stage_decode(self, ctx: AnalysisContext):
+        """Decode the screenshot once (BGR array, or None if unreadable)"""
+        try:
+            return cv2.imread(ctx.image_file_path)
+        except Exception as e:
+            print(f"Image decode error: {e}")
+            return None
+    
+    def stage_preprocess(self, ctx: AnalysisContext):
+        """Grayscale + size normalization + morphology + median blur for better OCR"""
+        image = ctx.get("decode")
+        if image is None:
+            return None
+        try:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray, _ = normalize_for_ocr(gray)
+            kernel = np.ones((1,1), np.uint8)
+            gray = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
+            return cv2.medianBlur(gray, 3)
+        except Exception as e:
+            print(f"Preprocessing error: {e}")
+            return None
+    
+    def stage_ocr(self, ctx: AnalysisContext) -> OCRResult:
+        """Single OCR pass (text + word confidences) shared by metadata parsing and scoring"""
+        gray = ctx.get("preprocess")
+        if gray is None:
+            return OCRResult()
+        try:
+            # Tall screen recordings are OCR'd as parallel tiles, with the trading vocabulary profile
+            return recognize_tiled(get_engine(), gray, config='--psm 3', profile='trading')
+        except Exception as e:
+            print(f"OCR extraction error: {e}")
+            return OCRResult()
+    
+    def _ocr_text(self, ctx: AnalysisContext) -> str:
+        return ctx.get("ocr").text.strip()
+    
+    def stage_details(self, ctx: AnalysisContext) -> Dict:
+        """Build metadata from file info and the parsed OCR text"""
+        metadata = self.extract_metadata(ctx.image_file_path, text_content=self._ocr_text(ctx))
+        metadata["ocrConfidence"] = round(ctx.get("ocr").mean_confidence, 1)
+        return metadata
+    
+    def stage_score(self, ctx: AnalysisContext) -> Dict:
+        return self.calculate_pait_scores({}, self._ocr_text(ctx))
+    
+    def stage_swot(self, ctx: AnalysisContext) -> Dict:
+        return self.generate_swot_analysis(ctx.get("score"), self._ocr_text(ctx))
+    
+    async def stage_agents(self, ctx: AnalysisContext) -> Dict:
+        metadata, pait_scores = ctx.get("details"), ctx.get("score")
+        return {
+            "claireInsight": await self.activate_claire_analysis(metadata, pait_scores),
+            "kathyAnalysis": self.activate_kathy_analysis(pait_scores, metadata)
+        }
+    
+    def stage_persist(self, ctx: AnalysisContext) -> Dict:
+        pait_scores = ctx.get("score")
+        agents = ctx.get("agents")
+        text_content = self._ocr_text(ctx)
+        
+        analysis_result = {
+            "metadata": ctx.get("details"),
+            "paitScores": pait_scores,
+            "swot": ctx.get("swot"),
+            "claireInsight": agents["claireInsight"],
+            "kathyAnalysis": agents["kathyAnalysis"],
+            "profitabilityGrade": self.determine_profitability_grade(pait_scores["overallScore"]),
+            "isVIPAnalysis": False,
+            "textContent": text_content[:500],  # First 500 chars for debugging
+            "stageTimings": dict(ctx.timings),  # Milliseconds per upstream stage
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        self.save_analysis(analysis_result, text_content)  # Adds the feature vector for re-scoring
+        return analysis_result
+    
+    # --- Standalone helpers (kept for direct callers) ------------------
+    
+    def extract_metadata(self, image_file_path: str, text_content: Optional[str] = None) -> Dict:
         """Extract metadata from YouTube shorts screenshot"""
         try:
             # Basic file metadata
@@ -36,8 +199,9 @@ class YouTubeAnalysisService:
                 "fileSize": os.path.getsize(image_file_path)
             }
             
-            # Try to extract text from image for title/author
-            text_content = self.extract_text_from_image(image_file_path)
+            # Reuse OCR text from the pipeline when available
+            if text_content is None:
+                text_content = self.extract_text_from_image(image_file_path)
             
             # Parse extracted text for video details
             video_details = self.parse_video_details(text_content)
@@ -60,23 +224,7 @@ class YouTubeAnalysisService:
     
     def extract_text_from_image(self, image_path: str) -> str:
         """Extract text content from screenshot using OCR"""
-        try:
-            # Load and preprocess image
-            image = cv2.imread(image_path)
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Apply preprocessing for better OCR
-            kernel = np.ones((1,1), np.uint8)
-            gray = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
-            gray = cv2.medianBlur(gray, 3)
-            
-            # Extract text
-            text = pytesseract.image_to_string(gray)
-            return text.strip()
-            
-        except Exception as e:
-            print(f"OCR extraction error: {e}")
-            return ""
+        return self.run_stage_sync(AnalysisContext(image_path), "ocr").text.strip()
     
     def parse_video_details(self, text_content: str) -> Dict:
         """Parse extracted text to identify video title, author, views"""
@@ -110,77 +258,19 @@ class YouTubeAnalysisService:
         return details
     
     def calculate_pait_scores(self, metadata: Dict, text_content: str) -> Dict:
-        """Calculate pAIt scores for trading video analysis"""
+        """Calculate pAIt scores for trading video analysis
         
-        # Define scoring categories with weights
-        categories = {
-            "technicalAccuracy": self.score_technical_accuracy(text_content),
-            "executionFeasibility": self.score_execution_feasibility(text_content),
-            "riskManagement": self.score_risk_management(text_content),
-            "marketConditions": self.score_market_conditions(text_content),
-            "strategyClarity": self.score_strategy_clarity(text_content),
-            "profitabilityPotential": self.score_profitability_potential(text_content)
-        }
-        
-        # Calculate weighted overall score
-        weights = {
-            "technicalAccuracy": 0.20,
-            "executionFeasibility": 0.18,
-            "riskManagement": 0.22,
-            "marketConditions": 0.15,
-            "strategyClarity": 0.15,
-            "profitabilityPotential": 0.10
-        }
-        
-        weighted_score = sum(categories[cat] * weights[cat] * 100 for cat in weights.keys())
-        overall_score = int(weighted_score)
+        Category rules, weights and the score range come from the pait_scoring
+        section of youtube_analysis_config.json (see scoring_engine.py).
+        """
+        result = get_scoring_engine().profile("pait_scoring").score(text_content)
+        categories = {camel_case(name): score for name, score in result["categories"].items()}
         
         return {
             **categories,
-            "overallScore": max(200, min(1000, overall_score))  # Clamp to reasonable range
+            "overallScore": int(result["overall"])
         }
     
-    def score_technical_accuracy(self, text: str) -> int:
-        """Score technical analysis accuracy (0-10)"""
-        technical_terms = ['support', 'resistance', 'breakout', 'moving average', 'rsi', 'macd', 'bollinger', 'fibonacci']
-        score = min(10, sum(2 for term in technical_terms if term in text.lower()))
-        return max(3, score)  # Minimum base score
-    
-    def score_execution_feasibility(self, text: str) -> int:
-        """Score how executable the strategy is (0-10)"""
-        execution_terms = ['entry', 'exit', 'stop loss', 'take profit', 'timeframe']
-        score = min(10, sum(2 for term in execution_terms if term in text.lower()))
-        return max(3, score)
-    
-    def score_risk_management(self, text: str) -> int:
-        """Score risk management quality (0-10)"""
-        risk_terms = ['stop loss', 'risk', 'position size', 'money management', 'drawdown']
-        score = min(10, sum(2 for term in risk_terms if term in text.lower()))
-        return max(2, score)  # Risk management often lacking
-    
-    def score_market_conditions(self, text: str) -> int:
-        """Score market condition awareness (0-10)"""
-        market_terms = ['trend', 'volatility', 'volume', 'market conditions', 'economic']
-        score = min(10, sum(2 for term in market_terms if term in text.lower()))
-        return max(4, score)
-    
-    def score_strategy_clarity(self, text: str) -> int:
-        """Score how clearly the strategy is explained (0-10)"""
-        clarity_indicators = len(text.split()), any(word in text.lower() for word in ['step', 'first', 'then', 'next'])
-        word_count_score = min(5, len(text.split()) // 20)  # More words = more detail
-        structure_score = 3 if clarity_indicators[1] else 1
-        return min(10, word_count_score + structure_score + 2)
-    
-    def score_profitability_potential(self, text: str) -> int:
-        """Score profit potential claims (0-10)"""
-        profit_terms = ['profit', 'gain', 'return', 'win rate', 'success']
-        unrealistic_claims = ['guaranteed', '100%', 'never lose', 'easy money']
-        
-        profit_score = min(6, sum(1 for term in profit_terms if term in text.lower()))
-        penalty = sum(2 for claim in unrealistic_claims if claim in text.lower())
-        
-        return max(2, min(10, profit_score + 2 - penalty))
-    
     def generate_swot_analysis(self, pait_scores: Dict, text_content: str) -> Dict:
         """Generate SWOT analysis based on scores and content"""
         
@@ -250,7 +340,8 @@ class YouTubeAnalysisService:
             Give a brief, encouraging but honest analysis in your natural style.
             """
             
-            response = requests.post(self.claire_api_url, json={
+            # Off the event loop, so concurrent analyses wait on Claire together
+            response = await asyncio.to_thread(requests.post, self.claire_api_url, json={
                 "message": prompt,
                 "provider": "claude"
             }, timeout=10)
@@ -287,44 +378,26 @@ class YouTubeAnalysisService:
         else:
             return "Critical"
     
-    async def process_youtube_analysis(self, image_file_path: str) -> Dict:
-        """Main processing pipeline for YouTube analysis"""
+    async def process_youtube_analysis(self, image_file_path: str, executor=None) -> Dict:
+        """Main processing pipeline for YouTube analysis
+        
+        With a process pool executor the CPU stages (decode → SWOT) run in a
+        pool process and only the agent calls and persistence run here.
+        """
         try:
-            # Step 1: Extract metadata
-            metadata = self.extract_metadata(image_file_path)
-            
-            # Step 2: Extract text content
-            text_content = self.extract_text_from_image(image_file_path)
-            
-            # Step 3: Calculate pAIt scores
-            pait_scores = self.calculate_pait_scores(metadata, text_content)
+            ctx = AnalysisContext(image_file_path)
+            if executor is not None:
+                artifacts, timings = await asyncio.get_running_loop().run_in_executor(
+                    executor, run_cpu_stages, image_file_path)
+                ctx.artifacts.update(artifacts)
+                ctx.timings.update(timings)
+                for stage, milliseconds in timings.items():
+                    record_stage(self.METRIC_STAGES.get(stage, stage), milliseconds / 1000)
             
-            # Step 4: Generate SWOT analysis
-            swot = self.generate_swot_analysis(pait_scores, text_content)
-            
-            # Step 5: Get AI agent insights
-            claire_insight = await self.activate_claire_analysis(metadata, pait_scores)
-            kathy_analysis = self.activate_kathy_analysis(pait_scores, metadata)
-            
-            # Step 6: Determine profitability grade
-            profitability_grade = self.determine_profitability_grade(pait_scores["overallScore"])
-            
-            # Step 7: Package results
-            analysis_result = {
-                "metadata": metadata,
-                "paitScores": pait_scores,
-                "swot": swot,
-                "claireInsight": claire_insight,
-                "kathyAnalysis": kathy_analysis,
-                "profitabilityGrade": profitability_grade,
-                "isVIPAnalysis": False,
-                "textContent": text_content[:500],  # First 500 chars for debugging
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            # Step 8: Save analysis to file
-            self.save_analysis(analysis_result)
+            analysis_result = await self.run_stage(ctx, "persist")
             
+            # Persist timing is only known after the file is written
+            analysis_result["stageTimings"]["persist"] = ctx.timings["persist"]
             return analysis_result
             
         except Exception as e:
@@ -334,9 +407,17 @@ class YouTubeAnalysisService:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def save_analysis(self, analysis_result: Dict):
-        """Save analysis result to file"""
+    def save_analysis(self, analysis_result: Dict, text_content: Optional[str] = None):
+        """Save analysis result to file
+        
+        With text_content, the scoring inputs (keyword hit counts, word and
+        claim counts) are stored as "features" so the analysis can be
+        re-scored later without re-OCR (rescore_archive.py).
+        """
         try:
+            if "features" not in analysis_result and text_content is not None:
+                analysis_result["features"] = document_features(text_content)
+            
             filename = f"{analysis_result['metadata']['analysisId']}.json"
             filepath = os.path.join(self.analysis_data_dir, filename)
             
@@ -348,6 +429,29 @@ class YouTubeAnalysisService:
         except Exception as e:
             print(f"Error saving analysis: {e}")
 
+_worker_service: Optional[YouTubeAnalysisService] = None
+
+def init_cpu_worker():
+    """Pool process initializer: the process is the unit of parallelism, OCR runs inline"""
+    os.environ["LENS_OCR_WORKERS"] = "0"
+
+def run_cpu_stages(image_file_path: str) -> Tuple[Dict, Dict]:
+    """Run decode → SWOT for one file (in a pool process)
+    
+    Returns the picklable artifacts (decoded arrays stay behind) and the
+    stage timings, ready to seed an AnalysisContext in the parent.
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = YouTubeAnalysisService()
+    
+    ctx = AnalysisContext(image_file_path)
+    for stage in YouTubeAnalysisService.CPU_STAGES:
+        _worker_service.run_stage_sync(ctx, stage)
+    
+    artifacts = {stage: result for stage, result in ctx.artifacts.items() if stage not in ("decode", "preprocess")}
+    return artifacts, ctx.timings
+
 # Example usage and testing
 if __name__ == "__main__":
     service = YouTubeAnalysisService()
@@ -2,32 +2,122 @@
 """
 ⏰ YouTube Analysis Cron Processor
 Automated background processing for YouTube trading analysis
+
+Continuous mode is event-driven: uploads are picked up as soon as their
+writes close (inotify, see upload_watcher.py), with a rescan every
+--interval seconds as the safety net. Without inotify (or with --poll)
+the upload directory is polled every second instead.
+
+Files are processed --concurrency at a time: the CPU stages (decode, OCR,
+scoring) run in a process pool, the Claire call off the event loop, and
+each file gets --timeout seconds before it is left for the next pass. A
+timeout kills and replaces the pool, so the abandoned analysis stops
+instead of holding a pool slot while its upload is retried; files that
+were sharing the pool are released without using an attempt.
+
+Work state lives in a leased SQLite queue (lens-data/work_queue.db, see
+work_queue.py): uploads are enqueued once, leased by a worker, acked after
+the move to processed/, and retried with exponential backoff until
+--max-attempts sends them to the dead-letter state. Several processor
+processes can share the queue; a crashed worker's lease expires and the
+upload is picked up again.
+
+A worker claims a leased upload by renaming it into its own
+lens-data/in_progress/<worker>/ directory (atomic on one filesystem), so a
+file is never analyzed twice even if a slow worker's lease expires; a
+supervisor worker restarting under the same name moves its leftover
+claims back to uploads/. A standalone process claims into its own
+<host>-<pid> directory and, on start, returns the claims of standalone
+processes on the same host that are no longer running. --workers N runs
+N such processes under a supervisor that restarts any that die (see
+cron_supervisor.py).
+
+Stats are appended to lens-data/processing_events.jsonl (safe with several
+processors running); lens-data/processing_stats.json is a snapshot of the
+whole log written every --stats-interval seconds (see processing_stats.py).
+
+Metrics: lens_upload_queue_depth is the shared queue's pending count, and
+lens_upload_start_latency_seconds runs from detection (carried in the job
+payload) to a worker claiming the upload for its first attempt.
 """
 
 import os
-import json
 import time
+import socket
+import argparse
 import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict
-from youtube_analysis_service import YouTubeAnalysisService
+from typing import Dict, List, Optional
+from youtube_analysis_service import YouTubeAnalysisService, init_cpu_worker
+from upload_watcher import UploadWatcher
+from processing_stats import ProcessingStatsLog
+from metrics import get_registry, serve_metrics
+from work_queue import Job, WorkQueue, default_owner
+
+QUEUE_DEPTH = get_registry().gauge(
+    "lens_upload_queue_depth", "Uploads in the work queue waiting to be processed (incl. backing off)")
+START_LATENCY = get_registry().histogram(
+    "lens_upload_start_latency_seconds", "Time from upload detection to processing start (first attempt)",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0))
+
+def process_claim_dir() -> str:
+    """In-progress directory name for a standalone (unnamed) processor: host-pid"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def is_dead_process_claim_dir(name: str) -> bool:
+    """Whether name is a standalone processor's directory on this host whose process has exited"""
+    prefix = f"{socket.gethostname()}-"
+    if not name.startswith(prefix) or not name[len(prefix):].isdigit():
+        return False
+    try:
+        os.kill(int(name[len(prefix):]), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass  # Alive, owned by another user
+    return False
 
 class YouTubeCronProcessor:
-    def __init__(self):
+    def __init__(self, concurrency: int = None, file_timeout: float = 300.0, stats_interval: float = 30.0,
+                 max_attempts: int = 5, worker_name: Optional[str] = None):
         self.service = YouTubeAnalysisService()
+        self.concurrency = max(1, concurrency or os.cpu_count() or 1)
+        self.file_timeout = file_timeout  # Seconds per file before it is left for the next pass
+        self.executor = None  # CPU stage pool, started on first use
+        self.pool_generation = 0  # Bumped each time the pool is killed and replaced
         self.watch_dir = "lens-data/uploads/"
         self.processed_dir = "lens-data/processed/"
+        self.worker_name = worker_name  # Set by the supervisor (worker-0 ...); None for a standalone process
+        self.in_progress_root = "lens-data/in_progress/"
+        # Files this worker has claimed; a standalone process gets its own host-pid directory
+        self.in_progress_dir = os.path.join(self.in_progress_root, worker_name or process_claim_dir())
         self.log_file = "lens-data/cron_logs/youtube_processor.log"
+        self.watcher = None  # UploadWatcher while run_continuous is running
         
         # Create directories
         os.makedirs(self.watch_dir, exist_ok=True)
         os.makedirs(self.processed_dir, exist_ok=True)
+        os.makedirs(self.in_progress_dir, exist_ok=True)
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        
+        self.stats = ProcessingStatsLog(snapshot_interval=stats_interval)
+        
+        # Lease outlives the per-file timeout so a live worker never loses its job
+        self.queue = WorkQueue("lens-data/work_queue.db", "uploads",
+                               lease_seconds=file_timeout + 60, max_attempts=max_attempts)
+        self.worker_id = f"{worker_name}@{default_owner()}" if worker_name else default_owner()
+        self.idle_poll = 5.0  # Seconds between lease attempts when idle (other processes enqueue too)
+        self.work_available = None  # asyncio.Event, set when this process enqueues
+        self.start_latencies = deque(maxlen=1000)  # Seconds from detection to first processing start
     
     def log_message(self, message: str):
         """Log processing messages"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self.worker_name:
+            message = f"[{self.worker_name}] {message}"
         log_entry = f"[{timestamp}] {message}\n"
         
         print(log_entry.strip())
@@ -64,101 +154,230 @@ class YouTubeCronProcessor:
     async def process_file(self, file_path: str) -> bool:
         """Process a single uploaded file"""
         try:
-            self.log_message(f"Processing: {os.path.basename(file_path)}")
-            
-            # Run analysis
-            result = await self.service.process_youtube_analysis(file_path)
-            
-            if "error" in result:
-                self.log_message(f"Analysis failed: {result['error']}")
-                return False
-            
-            # Move file to processed directory
-            processed_path = os.path.join(self.processed_dir, os.path.basename(file_path))
-            os.rename(file_path, processed_path)
-            
-            # Log success
-            pait_score = result.get('paitScores', {}).get('overallScore', 'Unknown')
-            title = result.get('metadata', {}).get('title', 'Unknown')
-            
-            self.log_message(f"✅ Completed: {title} (pAIt: {pait_score})")
-            
-            # Update processing statistics
-            self.update_stats(result)
-            
+            await self.analyze_upload(file_path)
             return True
-            
         except Exception as e:
             self.log_message(f"Error processing {file_path}: {e}")
             return False
     
-    def update_stats(self, analysis_result: Dict):
-        """Update processing statistics"""
+    async def analyze_upload(self, file_path: str) -> Dict:
+        """Analyze, move to processed/ and record stats; raises if the analysis failed"""
+        self.log_message(f"Processing: {os.path.basename(file_path)}")
+        started = time.perf_counter()
+        
+        # Run analysis (CPU stages in the pool)
+        result = await self.service.process_youtube_analysis(file_path, self.get_executor())
+        
+        if "error" in result:
+            raise RuntimeError(f"Analysis failed: {result['error']}")
+        
+        # Move file to processed directory
+        processed_path = os.path.join(self.processed_dir, os.path.basename(file_path))
+        os.rename(file_path, processed_path)
+        
+        # Log success
+        pait_score = result.get('paitScores', {}).get('overallScore', 'Unknown')
+        title = result.get('metadata', {}).get('title', 'Unknown')
+        
+        self.log_message(f"✅ Completed: {title} (pAIt: {pait_score})")
+        
+        # Update processing statistics
+        self.update_stats(result, time.perf_counter() - started, os.path.basename(file_path))
+        
+        return result
+    
+    def claim(self, file_path: str) -> str:
+        """Rename an upload into this worker's in-progress directory; FileNotFoundError if it is gone"""
+        claimed_path = os.path.join(self.in_progress_dir, os.path.basename(file_path))
+        os.rename(file_path, claimed_path)
+        return claimed_path
+    
+    def unclaim(self, claimed_path: str, file_path: str):
+        """Put a claimed upload back in uploads/ for its retry"""
         try:
-            stats_file = "lens-data/processing_stats.json"
-            
-            # Load existing stats
-            if os.path.exists(stats_file):
-                with open(stats_file, 'r') as f:
-                    stats = json.load(f)
-            else:
-                stats = {
-                    "totalProcessed": 0,
-                    "averagePAItScore": 0,
-                    "scoreDistribution": {"high": 0, "moderate": 0, "low": 0, "critical": 0},
-                    "lastProcessed": None,
-                    "dailyStats": {}
-                }
-            
-            # Update stats
-            pait_score = analysis_result.get('paitScores', {}).get('overallScore', 0)
-            grade = analysis_result.get('profitabilityGrade', 'Unknown').lower()
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            stats["totalProcessed"] += 1
-            stats["lastProcessed"] = datetime.now().isoformat()
-            
-            # Update average score
-            if stats["totalProcessed"] == 1:
-                stats["averagePAItScore"] = pait_score
-            else:
-                stats["averagePAItScore"] = (stats["averagePAItScore"] * (stats["totalProcessed"] - 1) + pait_score) / stats["totalProcessed"]
-            
-            # Update distribution
-            if grade in stats["scoreDistribution"]:
-                stats["scoreDistribution"][grade] += 1
-            
-            # Daily stats
-            if today not in stats["dailyStats"]:
-                stats["dailyStats"][today] = 0
-            stats["dailyStats"][today] += 1
-            
-            # Save updated stats
-            with open(stats_file, 'w') as f:
-                json.dump(stats, f, indent=2)
-                
+            os.rename(claimed_path, file_path)
+        except FileNotFoundError:
+            pass
+    
+    def recover_claims(self) -> int:
+        """Move uploads claimed by crashed runs back to uploads/
+        
+        A named worker recovers its own directory (the supervisor only
+        restarts it once the previous process has exited); a standalone
+        process recovers the directories of standalone processes on this
+        host that are no longer running.
+        """
+        if self.worker_name:
+            directories = [self.in_progress_dir]
+        else:
+            directories = [os.path.join(self.in_progress_root, name) for name in os.listdir(self.in_progress_root)
+                           if is_dead_process_claim_dir(name)]
+        
+        recovered = 0
+        for directory in directories:
+            for name in os.listdir(directory):
+                self.unclaim(os.path.join(directory, name), os.path.join(self.watch_dir, name))
+                recovered += 1
+            if directory != self.in_progress_dir:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass  # Not empty (the upload was back in uploads/ already) or removed by another process
+        if recovered:
+            self.log_message(f"♻️ Returned {recovered} uploads claimed before a crash to {self.watch_dir}")
+        return recovered
+    
+    def enqueue_uploads(self, file_paths: List[str], detected_at: Optional[float] = None) -> int:
+        """Queue uploads by file name; ones already queued, leased or dead are left alone"""
+        payload = {"detectedAt": detected_at or time.time()}  # Start latency is measured from here
+        added = sum(self.queue.enqueue(os.path.basename(path), {"path": path, **payload}) for path in file_paths)
+        self.export_queue_depth()
+        if added and self.work_available is not None:
+            self.work_available.set()  # Wakes every idle worker
+            self.work_available.clear()
+        return added
+    
+    def export_queue_depth(self, stats: Optional[Dict] = None):
+        """lens_upload_queue_depth from the shared queue (every worker's backlog, not just this process's)"""
+        QUEUE_DEPTH.set((stats or self.queue.stats())["pending"])
+    
+    def record_start(self, job: Job):
+        """Detection-to-start latency, once per upload (retries wait out their backoff on purpose)"""
+        if job.attempts != 1 or "detectedAt" not in job.payload:
+            return
+        latency = max(0.0, time.time() - job.payload["detectedAt"])
+        self.start_latencies.append(latency)
+        START_LATENCY.observe(latency)
+    
+    def start_latency_percentile(self, p: int) -> Optional[float]:
+        latencies = sorted(self.start_latencies)
+        return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 3) if latencies else None
+    
+    async def process_job(self, job: Job) -> bool:
+        """Claim and process one leased upload: ack on success, back off or dead-letter on failure"""
+        file_path = job.payload["path"]
+        name = os.path.basename(file_path)
+        
+        try:
+            claimed_path = self.claim(file_path)
+        except FileNotFoundError:
+            return await self.resolve_missing(job, name)
+        self.record_start(job)
+        await asyncio.to_thread(self.export_queue_depth)
+        
+        generation = self.pool_generation
+        try:
+            with self.queue.keep_alive(job):
+                await asyncio.wait_for(self.analyze_upload(claimed_path), self.file_timeout)
+        except asyncio.TimeoutError:
+            # Cancelling the wait leaves the pool task running: stop it before the upload can be retried
+            for process in self.recycle_executor():
+                await asyncio.to_thread(process.join)
+            error = f"timed out after {self.file_timeout}s"
+        except asyncio.CancelledError:
+            processes = self.recycle_executor()
+            self.unclaim(claimed_path, file_path)
+            self.queue.release(job)  # Shutdown: back to pending without using an attempt
+            for process in processes:
+                await asyncio.to_thread(process.join)  # Killed: returns as soon as the process is reaped
+            raise
+        except Exception as e:
+            if self.pool_generation != generation:
+                # Killed along with the pool when another file timed out: not this upload's fault
+                self.unclaim(claimed_path, file_path)
+                await asyncio.to_thread(self.queue.release, job)
+                self.log_message(f"↩️ {name} interrupted by a pool restart; released for another attempt")
+                return False
+            error = str(e)
+        else:
+            await asyncio.to_thread(self.queue.ack, job)
+            return True
+        
+        self.unclaim(claimed_path, file_path)
+        state = await asyncio.to_thread(self.queue.fail, job, error)
+        outcome = "dead-lettered" if state == "dead" else "will retry with backoff"
+        self.log_message(f"❌ {name} failed (attempt {job.attempts}/{self.queue.max_attempts}, {outcome}): {error}")
+        return False
+    
+    async def resolve_missing(self, job: Job, name: str) -> bool:
+        """A leased job whose upload is no longer in uploads/"""
+        if os.path.exists(os.path.join(self.processed_dir, name)):
+            # Moved to processed/ before a crash that kept the ack from reaching the queue
+            await asyncio.to_thread(self.queue.ack, job)
+            return True
+        if any(os.path.exists(os.path.join(self.in_progress_root, worker, name))
+               for worker in os.listdir(self.in_progress_root)):
+            # Still claimed by a worker that outlived its lease: check again once it should be done
+            await asyncio.to_thread(self.queue.release, job, self.file_timeout)
+            return False
+        await asyncio.to_thread(self.queue.fail, job, "upload no longer exists", False)
+        return False
+    
+    def update_stats(self, analysis_result: Dict, processing_seconds: float = None, file_name: str = None):
+        """Append a processed-upload event to the stats log (processing_stats.json is its periodic snapshot)"""
+        try:
+            self.stats.record(analysis_result, processing_seconds, file_name, self.worker_name)
         except Exception as e:
             self.log_message(f"Error updating stats: {e}")
     
+    def snapshot_stats(self):
+        if not self.stats.snapshot_interval:
+            return  # Snapshots are someone else's job (the supervisor's)
+        try:
+            self.stats.snapshot()
+        except Exception as e:
+            self.log_message(f"Error writing stats snapshot: {e}")
+    
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.concurrency, initializer=init_cpu_worker)
+        return self.executor
+    
+    def recycle_executor(self) -> list:
+        """Kill the CPU pool so an abandoned analysis stops running; the next file starts a fresh pool
+        
+        Returns the killed pool processes (join them to wait until they are gone).
+        """
+        executor, self.executor = self.executor, None
+        if executor is None:
+            return []
+        self.pool_generation += 1
+        processes = list((executor._processes or {}).values())
+        for process in processes:
+            process.kill()  # A running pool task can't be cancelled, only killed with its process
+        executor.shutdown(wait=False, cancel_futures=True)
+        return processes
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+    
     async def process_batch(self):
-        """Process all pending files"""
+        """Queue pending uploads, then process every due job, concurrency at a time"""
         new_files = self.find_new_uploads()
+        queued = await asyncio.to_thread(self.enqueue_uploads, new_files)
+        due = await asyncio.to_thread(self.queue.next_available_in)
         
-        if not new_files:
+        if due != 0:
             return 0
         
-        self.log_message(f"Found {len(new_files)} files to process")
+        self.log_message(f"Found {len(new_files)} uploads ({queued} newly queued, concurrency {self.concurrency})")
+        started = time.perf_counter()
         
-        processed_count = 0
-        for file_path in new_files:
-            success = await self.process_file(file_path)
-            if success:
-                processed_count += 1
-            
-            # Small delay between files
-            await asyncio.sleep(1)
+        async def drain():
+            succeeded = 0
+            while True:
+                jobs = await asyncio.to_thread(self.queue.lease, self.worker_id)
+                if not jobs:
+                    return succeeded  # Nothing due: failures wait out their backoff for a later run
+                succeeded += await self.process_job(jobs[0])
+        
+        processed_count = sum(await asyncio.gather(*(drain() for _ in range(self.concurrency))))
         
-        self.log_message(f"Batch complete: {processed_count}/{len(new_files)} successful")
+        stats = self.queue.stats()
+        self.log_message(f"Batch complete: {processed_count} successful in {time.perf_counter() - started:.1f}s "
+                         f"({stats['pending']} waiting to retry, {stats['dead']} dead-lettered)")
         return processed_count
     
     def cleanup_old_logs(self, days_to_keep: int = 30):
@@ -177,47 +396,143 @@ class YouTubeCronProcessor:
         except Exception as e:
             self.log_message(f"Cleanup error: {e}")
     
-    async def run_continuous(self, interval_seconds: int = 60):
-        """Run continuous monitoring"""
-        self.log_message(f"🚀 Starting continuous YouTube analysis processor (interval: {interval_seconds}s)")
+    async def run_continuous(self, interval_seconds: int = 60, use_inotify: bool = True):
+        """Run continuous monitoring: process uploads as they arrive
         
+        With inotify a file starts processing as soon as its writer closes it
+        and the upload directory is rescanned every interval_seconds as a
+        safety net; otherwise it is polled every watcher.poll_interval seconds.
+        """
+        self.recover_claims()
+        self.watcher = UploadWatcher(self.watch_dir, self.processed_dir,
+                                     rescan_interval=interval_seconds, use_inotify=use_inotify)
+        await self.watcher.start()
+        self.log_message(f"🚀 Starting continuous YouTube analysis processor "
+                         f"({self.watcher.mode}, scan every "
+                         f"{interval_seconds if self.watcher.mode == 'inotify' else self.watcher.poll_interval}s, "
+                         f"concurrency {self.concurrency})")
+        self.work_available = asyncio.Event()
+        background = [asyncio.ensure_future(self.run_daily_cleanup()), asyncio.ensure_future(self.run_feeder())]
+        if self.stats.snapshot_interval:
+            background.append(asyncio.ensure_future(self.stats.run_snapshots()))
+        workers = [asyncio.ensure_future(self.run_queue_worker()) for _ in range(self.concurrency)]
+        
+        try:
+            await asyncio.gather(*workers)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.log_message("👋 Shutdown requested")
+        finally:
+            for task in workers + background:
+                task.cancel()
+            # Let cancelled jobs release their leases and claims before the pool goes away;
+            # what is still running in the pool is killed (and reaped), not waited for
+            await asyncio.gather(*workers, *background, return_exceptions=True)
+            self.watcher.stop()
+            for process in self.recycle_executor():
+                await asyncio.to_thread(process.join)
+            self.snapshot_stats()
+    
+    async def run_feeder(self):
+        """Move uploads from the watcher into the durable queue"""
+        while True:
+            file_path = await self.watcher.get()
+            try:
+                await asyncio.to_thread(self.enqueue_uploads, [file_path], self.watcher.detected_at(file_path))
+            except Exception as e:
+                self.log_message(f"Error queueing {file_path}: {e}")  # Picked up again by the next rescan
+            finally:
+                self.watcher.task_done(file_path)
+    
+    async def run_queue_worker(self):
+        """Lease jobs one at a time; when none are due, wait for an enqueue, a backoff to expire or idle_poll"""
         while True:
             try:
-                await self.process_batch()
-                
-                # Cleanup old files once per day
-                if datetime.now().hour == 2 and datetime.now().minute < 5:  # 2 AM cleanup
-                    self.cleanup_old_logs()
-                
-                await asyncio.sleep(interval_seconds)
-                
-            except KeyboardInterrupt:
-                self.log_message("👋 Shutdown requested")
-                break
+                jobs = await asyncio.to_thread(self.queue.lease, self.worker_id)
+                if jobs:
+                    await self.process_job(jobs[0])
+                    self.log_if_drained()
+                    continue
+                wait = await asyncio.to_thread(self.queue.next_available_in)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                self.log_message(f"Unexpected error: {e}")
-                await asyncio.sleep(interval_seconds)  # Continue despite errors
+                self.log_message(f"Unexpected error: {e}")  # Continue despite errors
+                wait = None
+            
+            timeout = self.idle_poll if wait is None else min(max(wait, 0.05), self.idle_poll)
+            try:
+                await asyncio.wait_for(self.work_available.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def log_if_drained(self):
+        stats = self.queue.stats()
+        self.export_queue_depth(stats)
+        if stats["leased"] == 0 and stats["oldestPendingSeconds"] is None:
+            self.log_message(f"Queue drained: {stats['done']} done, {stats['pending']} waiting to retry, "
+                             f"{stats['dead']} dead-lettered; start latency p50 {self.start_latency_percentile(50)}s / "
+                             f"p95 {self.start_latency_percentile(95)}s")
+    
+    async def run_daily_cleanup(self, hour: int = 2):
+        """Clean up old processed files once a day (2 AM)"""
+        while True:
+            now = datetime.now()
+            next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            self.cleanup_old_logs()
+            self.queue.prune()
     
     async def run_once(self):
         """Run one-time batch processing"""
         self.log_message("🎯 Running one-time YouTube analysis batch")
-        processed = await self.process_batch()
+        self.recover_claims()
+        try:
+            processed = await self.process_batch()
+        finally:
+            self.shutdown()
+            self.snapshot_stats()
         self.log_message(f"✅ One-time processing complete: {processed} files")
         return processed
 
 # CLI interface
 if __name__ == "__main__":
-    import sys
+    parser = argparse.ArgumentParser(description="⏰ YouTube analysis upload processor")
+    parser.add_argument('--once', action='store_true', help='Process pending uploads once and exit')
+    parser.add_argument('--continuous', action='store_true', help='Watch for uploads (the default)')
+    parser.add_argument('--workers', type=int, help='Run N worker processes under a supervisor that restarts them')
+    parser.add_argument('--interval', type=int, default=60, help='Safety-net rescan interval with inotify, in seconds (default: 60)')
+    parser.add_argument('--poll', action='store_true', help='Poll only, even if inotify is available')
+    parser.add_argument('--concurrency', type=int, help='Files processed at once, per worker (default: CPU count / workers)')
+    parser.add_argument('--timeout', type=float, default=300.0, help='Seconds per file before giving up (default: 300)')
+    parser.add_argument('--max-attempts', type=int, default=5, help='Attempts per upload before it is dead-lettered (default: 5)')
+    parser.add_argument('--retry-dead', action='store_true', help='Re-queue dead-lettered uploads and exit')
+    parser.add_argument('--stats-interval', type=float, default=30.0, help='Seconds between processing_stats.json snapshots (default: 30)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus /metrics on this port')
+    args = parser.parse_args()
+    
+    if args.retry_dead:
+        print(f"📬 Re-queued {WorkQueue('lens-data/work_queue.db', 'uploads').retry_dead()} dead-lettered uploads")
+        raise SystemExit(0)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    
+    if args.workers:
+        # Supervisor mode: worker processes on the shared queue, stats snapshots written here
+        from cron_supervisor import CronSupervisor
+        supervisor = CronSupervisor(args.workers, {
+            "concurrency": args.concurrency or max(1, (os.cpu_count() or 1) // args.workers),
+            "file_timeout": args.timeout,
+            "max_attempts": args.max_attempts
+        }, interval=args.interval, use_inotify=not args.poll, once=args.once, stats_interval=args.stats_interval)
+        raise SystemExit(supervisor.run())
     
-    processor = YouTubeCronProcessor()
+    processor = YouTubeCronProcessor(args.concurrency, args.timeout, args.stats_interval, args.max_attempts)
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--once":
+    if args.once:
         # Run once
         asyncio.run(processor.run_once())
-    elif len(sys.argv) > 1 and sys.argv[1] == "--interval":
-        # Run with custom interval
-        interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
-        asyncio.run(processor.run_continuous(interval))
     else:
         # Default continuous mode
-        asyncio.run(processor.run_continuous())
+        asyncio.run(processor.run_continuous(args.interval, use_inotify=not args.poll))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+💰 Benchmark: claim_patterns bank vs the old per-call regex loops
+Throughput and recall on benchmarks/fixtures/ocr_claims.jsonl
+
+The fixture holds screenshot texts with hand-labelled amounts, time claims
+and percentages: clean readings of the sample screenshots used around the
+repo, and the same screens with typical Tesseract confusions (S for $, O
+for 0, l for 1). Baseline reproduces ScreenshotAnalyzer.analyze_profit_claims
+before the bank (money regex + three time patterns over text.lower()) and
+the five-pattern extract_pait_score loop.
+
+Usage:
+    python benchmarks/bench_claim_patterns.py
+    python benchmarks/bench_claim_patterns.py --repeat 2000
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from claim_patterns import extract_claims, extract_score
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "ocr_claims.jsonl"
+
+SCORE_SAMPLES = [
+    "Overall this is a mixed strategy. pAIt score: 62. Risk management is thin.",
+    "Technical accuracy 7/10, execution 6/10. Overall score: 71",
+    "I would rate this 45/100 - the claims are not realistic.",
+    "Score: 88/100. Solid, well explained setup with clear stops.",
+    "No explicit rating given; the content is promotional and vague.",
+    # Full-length model analysis with no explicit score (the fallback path)
+    ("The strategy relies on support and resistance with RSI confirmation. Entries are reasonably "
+     "defined but exits are vague and position sizing is never discussed. Technical accuracy 7/10. ") * 15
+]
+
+
+def baseline_claims(text: str) -> dict:
+    """Old analyze_profit_claims extraction"""
+    amounts = re.findall(r'\$[\d,]+(?:\.\d{2})?', text)
+    time_patterns = [
+        r'(\d+)\s*(hour|hr|minute|min|day|week|month)s?',
+        r'in\s+(\d+)\s*(hour|hr|minute|min|day|week|month)s?',
+        r'just\s+(\d+)\s*(hour|hr|minute|min|day|week|month)s?'
+    ]
+    time_claims = []
+    for pattern in time_patterns:
+        time_claims.extend(re.findall(pattern, text.lower()))
+    percentages = re.findall(r'(\d+(?:\.\d+)?)%', text)
+    return {"amounts": amounts, "time_claims": time_claims, "percentages": percentages}
+
+
+def baseline_score(text: str):
+    """Old extract_pait_score pattern loop"""
+    for pattern in [r'pAIt score[:\s]+(\d+)', r'overall score[:\s]+(\d+)', r'score[:\s]+(\d+)/100',
+                    r'(\d+)/100', r'score[:\s]+(\d+)']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match and 0 <= int(match.group(1)) <= 100:
+            return int(match.group(1))
+    return None
+
+
+def overlap(expected: list, found: list) -> tuple:
+    """(true positives, false positives) with multiset matching"""
+    remaining = list(found)
+    hits = 0
+    for item in expected:
+        if item in remaining:
+            remaining.remove(item)
+            hits += 1
+    return hits, len(remaining)
+
+
+def evaluate(fixtures: list, extract) -> dict:
+    totals = {}
+    for fixture in fixtures:
+        found = extract(fixture["text"])
+        for kind in ("amounts", "time_claims", "percentages"):
+            expected = [tuple(item) if isinstance(item, list) else item for item in fixture[kind]]
+            got = [tuple(item) for item in found[kind]] if kind == "time_claims" else found[kind]
+            if kind == "time_claims":
+                got = list(dict.fromkeys(got)) if extract is baseline_claims else got  # Old patterns overlap
+            hits, false = overlap(expected, got)
+            stats = totals.setdefault(kind, [0, 0, 0])
+            stats[0] += hits
+            stats[1] += false
+            stats[2] += len(expected)
+    return totals
+
+
+def timed(function, texts: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            function(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="💰 Claim pattern bank benchmark")
+    parser.add_argument('--repeat', type=int, default=1000, help='Passes over the fixture for timing (default: 1000)')
+    args = parser.parse_args()
+
+    fixtures = [json.loads(line) for line in FIXTURE.read_text(encoding='utf-8').splitlines() if line.strip()]
+    texts = [fixture["text"] for fixture in fixtures]
+
+    print(f"\n💰 CLAIM PATTERN BENCHMARK ({len(fixtures)} fixture texts x {args.repeat})")
+    print("=" * 60)
+
+    print(f"{'recall (false +)':<18}{'baseline':>14}{'claim bank':>14}")
+    old, new = evaluate(fixtures, baseline_claims), evaluate(fixtures, extract_claims)
+    for kind in ("amounts", "time_claims", "percentages"):
+        total = old[kind][2]
+        print(f"{kind:<18}{f'{old[kind][0]}/{total} ({old[kind][1]})':>14}{f'{new[kind][0]}/{total} ({new[kind][1]})':>14}")
+
+    claim_old, claim_new = timed(baseline_claims, texts, args.repeat), timed(extract_claims, texts, args.repeat)
+    score_texts = SCORE_SAMPLES * (len(texts) // len(SCORE_SAMPLES) + 1)
+    score_old, score_new = timed(baseline_score, score_texts, args.repeat), timed(extract_score, score_texts, args.repeat)
+    score_mismatches = sum(1 for text in SCORE_SAMPLES if baseline_score(text) != extract_score(text))
+
+    calls = len(texts) * args.repeat
+    print(f"\n{'µs/call':<18}{'baseline':>14}{'claim bank':>14}{'speedup':>10}")
+    print(f"{'claims':<18}{claim_old / calls * 1e6:>14.1f}{claim_new / calls * 1e6:>14.1f}{claim_old / claim_new:>9.2f}x")
+    calls = len(score_texts) * args.repeat
+    print(f"{'score':<18}{score_old / calls * 1e6:>14.1f}{score_new / calls * 1e6:>14.1f}{score_old / score_new:>9.2f}x")
+    print(f"\nScore mismatches: {score_mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+⏰ Benchmark: YouTubeCronProcessor.process_batch, sequential vs concurrent
+Drains a backlog of synthetic screenshots from a scratch lens-data/
+
+Baseline reproduces process_batch before the worker pool: one file at a
+time, every stage inline on the event loop, a blocking Claire call and a
+1 second sleep between files. The concurrent run uses --concurrency pool
+processes for the CPU stages and overlaps the Claire calls.
+
+Claire is whatever answers on localhost:5001 (connection refused returns
+the fallback insight immediately), so the numbers are the local pipeline.
+
+Usage:
+    python benchmarks/bench_cron_batch.py
+    python benchmarks/bench_cron_batch.py --count 500 --concurrency 8 --sleep 0
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT))
+
+from youtube_cron_processor import YouTubeCronProcessor
+
+LINES = ["$322 IN JUST 1 HOUR", "RSI + MACD breakout strategy", "Stop loss below support",
+         "141K views - 3 weeks ago", "@TradingCreator"]
+
+
+def write_backlog(directory: Path, count: int):
+    """Phone-screenshot sized captures with a few lines of trading text"""
+    for index in range(count):
+        image = np.full((1600, 720, 3), 250, dtype=np.uint8)
+        for line_number, line in enumerate(LINES):
+            cv2.putText(image, line, (30, 200 + 90 * line_number), cv2.FONT_HERSHEY_SIMPLEX,
+                        1.1, (20, 20, 20), 2)
+        cv2.imwrite(str(directory / f"short_{index:04d}.png"), image)
+
+
+async def baseline_batch(processor: YouTubeCronProcessor, sleep_seconds: float) -> int:
+    """The old loop: sequential, inline stages, fixed sleep between files"""
+    processed = 0
+    for file_path in processor.find_new_uploads():
+        result = await processor.service.process_youtube_analysis(file_path)
+        if "error" not in result:
+            os.rename(file_path, os.path.join(processor.processed_dir, os.path.basename(file_path)))
+            processor.update_stats(result)
+            processed += 1
+        await asyncio.sleep(sleep_seconds)
+    return processed
+
+
+def run(label: str, count: int, batch) -> float:
+    scratch = Path(tempfile.mkdtemp())
+    cwd = os.getcwd()
+    try:
+        os.chdir(scratch)
+        processor = YouTubeCronProcessor(concurrency=args.concurrency)
+        processor.log_message = lambda message: None
+        write_backlog(Path(processor.watch_dir), count)
+
+        start = time.perf_counter()
+        processed = asyncio.run(batch(processor))
+        seconds = time.perf_counter() - start
+        processor.shutdown()
+
+        print(f"{label:<22}{processed:>6}/{count}{seconds:>10.2f}{count / seconds:>10.1f}")
+        return seconds
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch)
+
+
+def main():
+    global args
+    parser = argparse.ArgumentParser(description="⏰ Cron batch concurrency benchmark")
+    parser.add_argument('--count', type=int, default=40, help='Screenshots in the backlog (default: 40)')
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count(), help='Concurrent files (default: CPU count)')
+    parser.add_argument('--sleep', type=float, default=1.0, help='Baseline inter-file sleep (default: 1.0, as before)')
+    args = parser.parse_args()
+
+    print(f"\n⏰ CRON BATCH BENCHMARK ({args.count} screenshots, concurrency {args.concurrency})")
+    print("=" * 60)
+    print(f"{'':<22}{'done':>10}{'total s':>10}{'files/s':>10}")
+
+    baseline = run("sequential (before)", args.count, lambda processor: baseline_batch(processor, args.sleep))
+    concurrent = run("concurrent pool", args.count, lambda processor: processor.process_batch())
+
+    print(f"\nSpeedup: {baseline / concurrent:.2f}x")
+    print(f"500-file backlog: ~{500 * baseline / args.count / 60:.1f} min before, "
+          f"~{500 * concurrent / args.count / 60:.1f} min now")
+
+
+if __name__ == "__main__":
+    main()
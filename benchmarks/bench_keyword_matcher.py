@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+🔎 Benchmark: shared single-pass keyword scan vs per-scorer substring loops
+Scores 10k transcripts with every rule-based scorer vocabulary
+
+Baseline reproduces the old pattern (each scorer lower-cases the text and
+loops `term in text` over its own list); the new path scans each
+transcript once with keyword_matcher and reads every list from the hit
+set. Results are checked for equality.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py
+    python benchmarks/bench_keyword_matcher.py --transcripts lens-data/transcripts
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import lens
+import visual_analyzer
+import screenshot_analyzer_local
+import frankenstein_integration
+import keyword_matcher
+from keyword_matcher import scan
+from scoring_engine import get_scoring_engine
+
+# Term lists of every rule group in the config-driven scoring profiles
+SCORING_GROUPS = [
+    [term for term, groups in profile.term_groups.items() if group in groups]
+    for profile in (get_scoring_engine().profile(name) for name in ("pait_scoring", "screenshot_scoring"))
+    for group in range(len(profile.group_points))
+]
+
+VOCABULARIES = [
+    lens.FINANCIAL_TERMS, lens.SECURE_TERMS, lens.PAIT_TERMS, lens.TECHNICAL_TERMS,
+    *[terms for terms in SCORING_GROUPS if terms],
+    *visual_analyzer.PLATFORM_INDICATORS.values(),
+    visual_analyzer.CREDIBILITY_POSITIVE, visual_analyzer.CREDIBILITY_NEGATIVE,
+    screenshot_analyzer_local.PLATFORMS, screenshot_analyzer_local.TOOLS, screenshot_analyzer_local.INDICATORS,
+    list(frankenstein_integration.TRADING_INDICATORS)
+]
+
+FILLER = ("so today i want to show you how this works the market opened and we saw "
+          "price action on the daily you can see here that the candle closed above "
+          "and below this level which is why i like to wait for confirmation").split()
+
+
+def synthetic_transcripts(count: int, words_per: int = 400, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    vocabulary = [term for terms in VOCABULARIES for term in terms]
+    transcripts = []
+    for _ in range(count):
+        words = [rng.choice(vocabulary) if rng.random() < 0.08 else rng.choice(FILLER)
+                 for _ in range(words_per)]
+        transcripts.append(" ".join(words).capitalize())
+    return transcripts
+
+
+def baseline(text: str) -> list:
+    """Old pattern: every list re-lowers the text and scans it once per term"""
+    return [[term for term in terms if term.lower() in text.lower()] for terms in VOCABULARIES]
+
+
+def shared_scan(text: str) -> list:
+    hits = scan(text)
+    return [hits.found(terms) for terms in VOCABULARIES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🔎 Keyword matcher benchmark")
+    parser.add_argument('--count', type=int, default=10000, help='Synthetic transcripts (default: 10000)')
+    parser.add_argument('--transcripts', help='Directory of .txt transcripts instead of synthetic ones')
+    args = parser.parse_args()
+
+    if args.transcripts:
+        transcripts = [p.read_text(encoding='utf-8', errors='ignore')
+                       for p in sorted(Path(args.transcripts).glob('*.txt'))]
+    else:
+        transcripts = synthetic_transcripts(args.count)
+    if not transcripts:
+        print("❌ No transcripts")
+        sys.exit(1)
+
+    terms = sum(len(terms) for terms in VOCABULARIES)
+    backend = "pyahocorasick" if keyword_matcher.AHOCORASICK_AVAILABLE else "trie regex"
+
+    start = time.perf_counter()
+    expected = [baseline(text) for text in transcripts]
+    baseline_seconds = time.perf_counter() - start
+
+    keyword_matcher.shared_matcher()  # Compile outside the timed loop
+    start = time.perf_counter()
+    actual = [shared_scan(text) for text in transcripts]
+    scan_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    chars = sum(len(text) for text in transcripts)
+
+    print(f"\n🔎 KEYWORD MATCHER BENCHMARK ({len(transcripts)} transcripts, "
+          f"{chars / 1e6:.1f}M chars, {terms} terms, {backend})")
+    print("=" * 60)
+    print(f"{'':<16}{'total s':>10}{'µs/doc':>10}")
+    print(f"{'per-scorer loops':<16}{baseline_seconds:>10.2f}{baseline_seconds / len(transcripts) * 1e6:>10.1f}")
+    print(f"{'shared scan':<16}{scan_seconds:>10.2f}{scan_seconds / len(transcripts) * 1e6:>10.1f}")
+    print(f"\nSpeedup: {baseline_seconds / scan_seconds:.2f}x")
+    print(f"Mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
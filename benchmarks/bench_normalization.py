@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+📐 Benchmark: size-normalized vs full-resolution OCR
+Latency percentiles across upload sizes before/after normalization
+
+For each image runs full-resolution OCR (--psm 6) and normalized OCR
+(ocr_preprocess.recognize_normalized), then reports p50/p95/p99 wall
+time, pixels handed to Tesseract and word recall vs full resolution.
+Mix phone screenshots, camera photos and long scrolling captures in the
+directory to see the tail.
+
+Usage:
+    python benchmarks/bench_normalization.py lens-data/uploads
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Cache would make the second pass free; measure raw OCR
+os.environ.setdefault("LENS_OCR_CACHE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+from ocr_engine import get_engine
+from ocr_preprocess import normalize_for_ocr, recognize_normalized
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+
+
+def words(text: str) -> set:
+    return set(re.findall(r'[a-z0-9$%]+', text.lower()))
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📐 Size normalization OCR benchmark")
+    parser.add_argument('image_dir', help='Directory of uploads')
+    args = parser.parse_args()
+
+    images = sorted(p for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        print(f"❌ No images found in {args.image_dir}")
+        sys.exit(1)
+
+    engine = get_engine()
+    timings = {"full": [], "normalized": []}
+    pixels = {"full": 0, "normalized": 0}
+    recalls = []
+
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+
+        start = time.perf_counter()
+        full_text = engine.image_to_string(image, config='--psm 6')
+        timings["full"].append(time.perf_counter() - start)
+        pixels["full"] += image.shape[0] * image.shape[1]
+
+        start = time.perf_counter()
+        result = recognize_normalized(engine, image, config='--psm 6')
+        timings["normalized"].append(time.perf_counter() - start)
+        normalized, _ = normalize_for_ocr(image)
+        pixels["normalized"] += normalized.shape[0] * normalized.shape[1]
+
+        reference = words(full_text)
+        recalls.append(len(reference & words(result.text)) / len(reference) if reference else 1.0)
+
+    count = len(recalls)
+    print(f"\n📐 NORMALIZATION BENCHMARK ({count} images)")
+    print("=" * 60)
+    print(f"{'':<12}{'Mpx':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in ("full", "normalized"):
+        values = timings[name]
+        print(f"{name:<12}{pixels[name] / 1e6:>10.1f}"
+              f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}"
+              f"{percentile(values, 99) * 1000:>10.1f}")
+    print(f"\np99 speedup: {percentile(timings['full'], 99) / percentile(timings['normalized'], 99):.2f}x")
+    print(f"Word recall vs full resolution: {sum(recalls) / count:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+🎯 Benchmark: trading OCR profile vs default Tesseract settings
+Keyword accuracy and wall time with and without ocr_profiles 'trading'
+
+For each screenshot runs OCR with the default settings and with the
+trading profile (--psm 6 both), then reports ms/image and how many
+scorer terms survive OCR. If a ground-truth transcript sits next to the
+image (shot.png + shot.txt), word accuracy against it is reported too.
+
+Usage:
+    python benchmarks/bench_ocr_profile.py lens-data/screenshots
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Cache would make the second pass free; measure raw OCR
+os.environ.setdefault("LENS_OCR_CACHE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+from ocr_engine import get_engine
+from ocr_profiles import SCORER_TERMS, ACRONYMS, config_terms
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+KEYWORDS = sorted(set(SCORER_TERMS + config_terms()) | {a.lower() for a in ACRONYMS if len(a) > 2})
+
+
+def words(text: str) -> list:
+    return re.findall(r'[a-z0-9$%.]+', text.lower())
+
+
+def keyword_hits(text: str) -> set:
+    text_lower = text.lower()
+    return {term for term in KEYWORDS if term in text_lower}
+
+
+def word_accuracy(reference: list, hypothesis: list) -> float:
+    """Share of reference words recovered (multiset overlap)"""
+    if not reference:
+        return 1.0
+    remaining = {}
+    for word in hypothesis:
+        remaining[word] = remaining.get(word, 0) + 1
+    found = 0
+    for word in reference:
+        if remaining.get(word):
+            remaining[word] -= 1
+            found += 1
+    return found / len(reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎯 Trading OCR profile benchmark")
+    parser.add_argument('image_dir', help='Directory of screenshots (optional .txt ground truth alongside)')
+    args = parser.parse_args()
+
+    images = sorted(p for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        print(f"❌ No images found in {args.image_dir}")
+        sys.exit(1)
+
+    engine = get_engine()
+    runs = {"default": None, "trading": "trading"}
+    seconds = {name: 0.0 for name in runs}
+    hits = {name: 0 for name in runs}
+    accuracy = {name: [] for name in runs}
+    truth_hits = 0
+    count = 0
+
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        count += 1
+
+        truth_path = path.with_suffix('.txt')
+        truth = truth_path.read_text(encoding='utf-8') if truth_path.exists() else None
+        if truth is not None:
+            truth_hits += len(keyword_hits(truth))
+
+        for name, profile in runs.items():
+            start = time.perf_counter()
+            text = engine.image_to_string(image, config='--psm 6', profile=profile)
+            seconds[name] += time.perf_counter() - start
+
+            found = keyword_hits(text)
+            hits[name] += len(found & keyword_hits(truth)) if truth is not None else len(found)
+            if truth is not None:
+                accuracy[name].append(word_accuracy(words(truth), words(text)))
+
+    print(f"\n🎯 OCR PROFILE BENCHMARK ({count} images)")
+    print("=" * 60)
+    print(f"{'':<10}{'ms/image':>10}{'keywords':>10}{'word acc':>10}")
+    for name in runs:
+        acc = f"{sum(accuracy[name]) / len(accuracy[name]):.3f}" if accuracy[name] else "n/a"
+        print(f"{name:<10}{seconds[name] / count * 1000:>10.1f}{hits[name]:>10}{acc:>10}")
+    if truth_hits:
+        print(f"\nKeywords in ground truth: {truth_hits}")
+    print(f"Speedup: {seconds['default'] / seconds['trading']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+📏 Benchmark: adaptive PSM selection vs exhaustive OCR
+Compares VisualContentAnalyzer OCR modes on a directory of screenshots
+
+For each mode reports wall time per image and word recall. Recall is
+measured against a ground-truth `<image>.txt` sidecar when present,
+otherwise against the exhaustive mode's output (the previous behaviour).
+
+Usage:
+    python benchmarks/bench_psm_selection.py lens-data/screenshots
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# OCR cache would turn every mode after the first into a cache hit
+os.environ.setdefault("LENS_OCR_CACHE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from visual_analyzer import VisualContentAnalyzer
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+
+
+def words(text: str) -> set:
+    return set(re.findall(r'[a-z0-9$%]+', text.lower()))
+
+
+def recall(reference: str, candidate: str) -> float:
+    ref_words = words(reference)
+    if not ref_words:
+        return 1.0
+    return len(ref_words & words(candidate)) / len(ref_words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📏 PSM selection benchmark")
+    parser.add_argument('image_dir', help='Directory of screenshots')
+    parser.add_argument('--threshold', type=float, default=80.0, help='Race-mode confidence threshold')
+    args = parser.parse_args()
+
+    images = sorted(p for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        print(f"❌ No images found in {args.image_dir}")
+        sys.exit(1)
+
+    analyzer = VisualContentAnalyzer("lens-data", confidence_threshold=args.threshold)
+    modes = ["exhaustive", "adaptive", "race"]
+    outputs = {mode: {} for mode in modes}
+    timings = {mode: 0.0 for mode in modes}
+
+    for mode in modes:
+        for image in images:
+            start = time.perf_counter()
+            result = analyzer.extract_text_from_image(str(image), ocr_mode=mode)
+            timings[mode] += time.perf_counter() - start
+            outputs[mode][image] = result.get("text", "")
+
+    print(f"\n📏 PSM SELECTION BENCHMARK ({len(images)} images)")
+    print("=" * 60)
+    print(f"{'mode':<12}{'ms/image':>12}{'speedup':>10}{'recall':>10}")
+
+    for mode in modes:
+        recalls = []
+        for image in images:
+            truth_file = image.with_suffix('.txt')
+            reference = truth_file.read_text(encoding='utf-8') if truth_file.exists() else outputs["exhaustive"][image]
+            recalls.append(recall(reference, outputs[mode][image]))
+
+        ms_per_image = timings[mode] / len(images) * 1000
+        speedup = timings["exhaustive"] / timings[mode] if timings[mode] else 0.0
+        print(f"{mode:<12}{ms_per_image:>12.1f}{speedup:>9.2f}x{sum(recalls) / len(recalls):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+📏 Benchmark: text-region cropping vs full-frame OCR
+Pixels scanned and wall time before/after text detection
+
+For each screenshot runs full-frame OCR (--psm 6) and region OCR
+(text_regions.ocr_text_regions), then reports pixels handed to
+Tesseract, wall time and word recall of regions vs full frame.
+
+Usage:
+    python benchmarks/bench_text_regions.py lens-data/screenshots
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Cache would make the second pass free; measure raw OCR
+os.environ.setdefault("LENS_OCR_CACHE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+from ocr_engine import get_engine
+from text_regions import ocr_text_regions
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+
+
+def words(text: str) -> set:
+    return set(re.findall(r'[a-z0-9$%]+', text.lower()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📏 Text-region OCR benchmark")
+    parser.add_argument('image_dir', help='Directory of screenshots')
+    args = parser.parse_args()
+
+    images = sorted(p for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        print(f"❌ No images found in {args.image_dir}")
+        sys.exit(1)
+
+    engine = get_engine()
+    totals = {"full_pixels": 0, "region_pixels": 0, "full_seconds": 0.0, "region_seconds": 0.0}
+    recalls = []
+
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+
+        start = time.perf_counter()
+        full_text = engine.image_to_string(image, config='--psm 6')
+        totals["full_seconds"] += time.perf_counter() - start
+        totals["full_pixels"] += image.shape[0] * image.shape[1]
+
+        start = time.perf_counter()
+        region_result = ocr_text_regions(image, engine)
+        totals["region_seconds"] += time.perf_counter() - start
+        totals["region_pixels"] += region_result["pixels_scanned"]
+
+        reference = words(full_text)
+        recalls.append(len(reference & words(region_result["text"])) / len(reference) if reference else 1.0)
+
+    count = len(recalls)
+    print(f"\n📏 TEXT REGION BENCHMARK ({count} images)")
+    print("=" * 60)
+    print(f"{'':<14}{'Mpx scanned':>14}{'ms/image':>12}")
+    print(f"{'full frame':<14}{totals['full_pixels'] / 1e6:>14.1f}{totals['full_seconds'] / count * 1000:>12.1f}")
+    print(f"{'regions':<14}{totals['region_pixels'] / 1e6:>14.1f}{totals['region_seconds'] / count * 1000:>12.1f}")
+    print(f"\nPixels scanned: {totals['region_pixels'] / totals['full_pixels']:.1%} of full frame")
+    print(f"Speedup: {totals['full_seconds'] / totals['region_seconds']:.2f}x")
+    print(f"Word recall vs full frame: {sum(recalls) / count:.3f}")
+
+
+if __name__ == "__main__":
+    main()
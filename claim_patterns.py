@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+💰 Claim Patterns - Precompiled profit-claim and score regex bank
+One combined alternation per job, compiled once at import
+
+- CLAIM_PATTERN: $ amounts, time periods and percentages in a single pass
+  (named groups money / time_count / time_unit / percent)
+- SCORE_PATTERN: "pAIt score: 82", "85/100", ... in model output, with the
+  old pattern priority preserved
+
+OCR-tolerant variants cover the usual Tesseract confusions in screenshots:
+S for $ ("S322", but not the S1/S2 pivot labels: an S amount needs two
+digits or a separator), O/o for 0 ("$1,5OO") and l/I for 1 ("$l00", "l hour").
+Tolerant matches are normalized back to digits, and a clean reading always
+wins over a tolerant one (so "$50off" stays $50).
+
+Usage:
+    from claim_patterns import extract_claims
+    extract_claims("S322 in l hour, 99% win rate")
+    # {"amounts": ["$322"], "time_claims": [("1", "hour")], "percentages": ["99"]}
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# OCR look-alikes of digits (in lower-cased text), normalized by normalize_digits
+_OCR_DIGIT_MAP = str.maketrans({"o": "0", "i": "1", "l": "1"})
+
+_LOOKALIKE = r"[\doil]"
+_END = r"(?![\doil,a-z])"  # A tolerant token may not run into more letters
+
+_MONEY = (
+    r"(?P<money>"
+    r"\$\s?" + _LOOKALIKE + r"[\doil,]*(?:\.[\do]{2})?" + _END +     # $1,5OO  $l00
+    r"|\$[\d,]+(?:\.\d{2})?"                                         # $500 (clean, as before)
+    r"|(?<![a-z0-9])s\d(?:[\doil]+|[\doil]*(?=[,.]\d))"                # S322 read for $322, not S1/S2 pivots
+    r"[\doil,]*(?:\.[\do]{2})?" + _END +
+    r")"
+)
+
+_TIME_UNITS = r"hour|hr|minute|min|day|week|month"
+_TIME = (
+    r"(?P<time_count>\d+"
+    r"|(?<![a-z])[\doil]*\d[\doil]*"                                 # 1O minutes
+    r"|(?<![a-z])l(?=\s*(?:" + _TIME_UNITS + r")))"                    # l hour
+    r"\s*(?P<time_unit>" + _TIME_UNITS + r")s?"
+)
+
+_PERCENT = (
+    r"(?P<percent>\d+(?:\.\d+)?"
+    r"|(?<![a-z])[\doil]*\d[\doil]*(?:\.\d+)?"                      # 1OO%
+    r"|(?<![a-z])l(?=\s*%))\s*%"                                      # l%
+)
+
+# Runs on lower-cased text (the old time patterns did too); the leading
+# lookahead skips positions no claim can start at, which keeps the single
+# combined pass cheaper than the separate scans it replaces
+CLAIM_PATTERN = re.compile(r"(?=[$\doils])(?:" + "|".join((_MONEY, _TIME, _PERCENT)) + ")")
+
+# Score mentions in model output (lower-cased), highest priority first; the
+# lookahead lets every position be tried so overlapping mentions are all seen
+SCORE_PRIORITY = ("pait", "overall", "of_100", "bare", "score")
+SCORE_PATTERN = re.compile(
+    r"(?=[pos\d])"
+    r"(?=pait score[:\s]+(?P<pait>\d+)"
+    r"|overall score[:\s]+(?P<overall>\d+)"
+    r"|score[:\s]+(?P<score>\d+)(?P<out_of>/100)?"
+    r"|(?P<bare>\d+)/100)"
+)
+
+
+def normalize_digits(token: str) -> str:
+    """'1,5oo' -> '1,500', 'l0' -> '10' (lower-cased OCR tokens)"""
+    return token.translate(_OCR_DIGIT_MAP)
+
+
+def extract_claims(text: str) -> Dict[str, List]:
+    """All money amounts, (count, unit) time claims and percentages in one pass"""
+    amounts: List[str] = []
+    time_claims: List[Tuple[str, str]] = []
+    percentages: List[str] = []
+
+    for match in CLAIM_PATTERN.finditer((text or "").lower()):
+        if match.group("money"):
+            amounts.append("$" + normalize_digits(match.group("money").lstrip("$s").lstrip()))
+        elif match.group("time_unit"):
+            time_claims.append((normalize_digits(match.group("time_count")), match.group("time_unit")))
+        else:
+            percentages.append(normalize_digits(match.group("percent")))
+
+    return {"amounts": amounts, "time_claims": time_claims, "percentages": percentages}
+
+
+def count_claims(text: str) -> int:
+    """Money amounts plus percentages (the claim_count scoring feature)"""
+    claims = extract_claims(text)
+    return len(claims["amounts"]) + len(claims["percentages"])
+
+
+def extract_score(text: str, low: int = 0, high: int = 100) -> Optional[int]:
+    """First in-range score by pattern priority (pAIt score, overall score, N/100, score)"""
+    first: Dict[str, int] = {}
+    for match in SCORE_PATTERN.finditer((text or "").lower()):
+        pait, overall, score, out_of, bare = match.groups()
+        if pait and "pait" not in first:
+            if low <= int(pait) <= high:
+                return int(pait)  # Top priority: nothing later can win
+            first["pait"] = int(pait)
+        for name, value in (("overall", overall), ("score", score), ("bare", bare)):
+            if value:
+                first.setdefault(name, int(value))
+        if out_of:
+            first.setdefault("of_100", int(score))
+
+    for name in SCORE_PRIORITY:
+        if name in first and low <= first[name] <= high:
+            return first[name]
+    return None
@@ -13,12 +13,14 @@ from flask_cors import CORS
 import openai
 import anthropic
 from dotenv import load_dotenv
+from metrics import collect_timings, format_seconds, instrument_flask, stage
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app, "claire-api")
 
 # Initialize API clients
 openai.api_key = os.getenv('OPENAI_API_KEY')
@@ -127,28 +129,34 @@ async def claire_chat():
                 'status': 'error'
             }), 400
         
-        # Choose API provider with fallback to local responses
-        response = None
-        actual_provider = provider
-        
-        if provider == 'openai' and os.getenv('OPENAI_API_KEY'):
-            response = await query_openai(user_input, context)
-        elif provider == 'claude' and os.getenv('ANTHROPIC_API_KEY'):
-            response = await query_claude(user_input, context)
-        else:
-            # Fallback to built-in Claire personality responses
-            response = get_claire_fallback_response(user_input)
-            actual_provider = 'local-personality'
-            print(f"✅ Using local Claire personality responses")
-        
-        # Log interaction for Kathy's learning
-        log_claire_interaction(user_input, response, actual_provider)
+        with collect_timings() as timings:
+            # Choose API provider with fallback to local responses
+            response = None
+            actual_provider = provider
+            
+            if provider == 'openai' and os.getenv('OPENAI_API_KEY'):
+                with stage("llm"):
+                    response = await query_openai(user_input, context)
+            elif provider == 'claude' and os.getenv('ANTHROPIC_API_KEY'):
+                with stage("llm"):
+                    response = await query_claude(user_input, context)
+            else:
+                # Fallback to built-in Claire personality responses
+                response = get_claire_fallback_response(user_input)
+                actual_provider = 'local-personality'
+                print(f"✅ Using local Claire personality responses")
+            
+            # Log interaction for Kathy's learning
+            with stage("persistence"):
+                log_claire_interaction(user_input, response, actual_provider)
         
         return jsonify({
             'response': response,
             'timestamp': datetime.now().isoformat(),
             'provider': provider,
-            'status': 'success'
+            'status': 'success',
+            'processingTime': format_seconds(timings.total_seconds),
+            'stageTimings': timings.as_ms()
         })
         
     except Exception as e:
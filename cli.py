@@ -1,14 +1,52 @@
 # cli.py
 import sys
-from lens import analyze_image
+import glob
+import json
+import argparse
+from pathlib import Path
+from lens import analyze_images
 from scorer import compute_pait_score
 
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+
+def expand_targets(targets):
+    """Resolve image paths, directories and glob patterns to a sorted file list"""
+    paths = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            paths.extend(p for p in sorted(path.rglob('*')) if p.suffix.lower() in IMAGE_SUFFIXES)
+        elif any(ch in target for ch in '*?['):
+            paths.extend(Path(p) for p in sorted(glob.glob(target, recursive=True))
+                         if Path(p).suffix.lower() in IMAGE_SUFFIXES)
+        else:
+            paths.append(path)
+    return [str(p) for p in paths]
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python cli.py <image_path>")
+    parser = argparse.ArgumentParser(description="Crella Lens OCR + pAIt scoring")
+    parser.add_argument('targets', nargs='+', help='Image path, directory or glob (e.g. "archive/**/*.png")')
+    parser.add_argument('--jsonl', help='Also write one JSON result per line to this file')
+    args = parser.parse_args()
+
+    image_paths = expand_targets(args.targets)
+    if not image_paths:
+        print("No images found")
         sys.exit(1)
 
-    image_path = sys.argv[1]
-    result = analyze_image(image_path)
-    score = compute_pait_score(result["tags"], result["confidence"])
-    print(f"Tags: {result['tags']} | Score: {score}")
+    # One file or many, every image goes through the same batched pipeline
+    results = analyze_images(image_paths)
+
+    out = open(args.jsonl, 'a', encoding='utf-8') if args.jsonl else None
+    try:
+        for image_path, result in zip(image_paths, results):
+            score = compute_pait_score(result["tags"], result["confidence"])
+            if len(image_paths) == 1:
+                print(f"Tags: {result['tags']} | Score: {score}")
+            else:
+                print(f"{image_path} | Tags: {result['tags']} | Score: {score}")
+            if out:
+                out.write(json.dumps({"path": image_path, "paitScore": score, **result}, ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
@@ -10,9 +10,23 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+from keyword_matcher import register_vocabulary, scan
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Strategy-element vocabularies (matched in one shared scan, see keyword_matcher.py)
+TRADING_INDICATORS = {
+    "rsi": "RSI momentum indicator",
+    "macd": "MACD trend indicator", 
+    "bollinger": "Bollinger Bands volatility",
+    "ema": "Exponential Moving Average",
+    "sma": "Simple Moving Average",
+    "stochastic": "Stochastic oscillator",
+    "fibonacci": "Fibonacci retracement"
+}
+register_vocabulary(TRADING_INDICATORS, ["trading", "bot", "breakout", "support", "resistance", "stop loss"])
+
 class FrankensteinIntegrator:
     """Integrate Frankenstein strategies with AiiQ-tAIq trading platform"""
     
@@ -158,19 +172,11 @@ class FrankensteinIntegrator:
                 }
             ])
         
-        # Technical indicators from content
-        indicators = {
-            "rsi": "RSI momentum indicator",
-            "macd": "MACD trend indicator", 
-            "bollinger": "Bollinger Bands volatility",
-            "ema": "Exponential Moving Average",
-            "sma": "Simple Moving Average",
-            "stochastic": "Stochastic oscillator",
-            "fibonacci": "Fibonacci retracement"
-        }
+        hits = scan(content)
         
-        for indicator, description in indicators.items():
-            if indicator in content:
+        # Technical indicators from content
+        for indicator, description in TRADING_INDICATORS.items():
+            if indicator in hits:
                 elements.append({
                     "type": "technical_indicator",
                     "name": indicator,
@@ -179,7 +185,7 @@ class FrankensteinIntegrator:
                 })
         
         # Strategy patterns from title/content
-        if "trading" in content:
+        if "trading" in hits:
             elements.append({
                 "type": "strategy_pattern",
                 "name": "active_trading",
@@ -187,7 +193,7 @@ class FrankensteinIntegrator:
                 "integration_method": "execution_framework"
             })
             
-        if "bot" in content:
+        if "bot" in hits:
             elements.append({
                 "type": "automation",
                 "name": "trading_bot",
@@ -195,7 +201,7 @@ class FrankensteinIntegrator:
                 "integration_method": "bot_integration"
             })
         
-        if "breakout" in content:
+        if "breakout" in hits:
             elements.append({
                 "type": "strategy_pattern",
                 "name": "breakout",
@@ -203,7 +209,7 @@ class FrankensteinIntegrator:
                 "integration_method": "pattern_recognition"
             })
         
-        if "support" in content or "resistance" in content:
+        if "support" in hits or "resistance" in hits:
             elements.append({
                 "type": "strategy_pattern", 
                 "name": "support_resistance",
@@ -212,7 +218,7 @@ class FrankensteinIntegrator:
             })
         
         # Risk management
-        if "stop loss" in content:
+        if "stop loss" in hits:
             elements.append({
                 "type": "risk_management",
                 "name": "stop_loss",
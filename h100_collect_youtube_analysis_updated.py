@@ -12,6 +12,8 @@ import os
 import time
 import logging
 
+from claim_patterns import extract_score
+
 # Setup logging to match your existing pattern
 os.makedirs("video_analysis_logs", exist_ok=True)
 logging.basicConfig(
@@ -190,24 +192,10 @@ def analyze_video_with_models(video_data, max_videos=3):
 def extract_pait_score(analysis_text):
     """Extract pAIt score from analysis text"""
     try:
-        # Look for score patterns in the analysis
-        import re
-        
-        # Look for explicit score mentions
-        score_patterns = [
-            r'pAIt score[:\s]+(\d+)',
-            r'overall score[:\s]+(\d+)',
-            r'score[:\s]+(\d+)/100',
-            r'(\d+)/100',
-            r'score[:\s]+(\d+)'
-        ]
-        
-        for pattern in score_patterns:
-            match = re.search(pattern, analysis_text, re.IGNORECASE)
-            if match:
-                score = int(match.group(1))
-                if 0 <= score <= 100:
-                    return score
+        # Explicit score mentions (pAIt score, overall score, N/100), one pass
+        score = extract_score(analysis_text)
+        if score is not None:
+            return score
         
         # Fallback scoring based on content quality indicators
         score = 60  # Base score
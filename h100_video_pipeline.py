@@ -5,6 +5,12 @@ Designed to run on your H100 GPU server with existing infrastructure
 
 This script should be deployed to your H100 server alongside your existing
 collection system and PM2 services.
+
+Batch mode runs on a durable work queue (work_queue.db under the base
+directory, see work_queue.py): --batch-file queues the URLs and works
+through them, failed videos are retried with exponential backoff and
+dead-lettered after --max-attempts, and extra processes started with
+--worker pull from the same queue.
 """
 
 import json
@@ -17,6 +23,8 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
 
+from work_queue import WorkQueue
+
 # Configure logging for H100 server
 logging.basicConfig(
     level=logging.INFO,
@@ -381,6 +389,47 @@ Respond with ONLY the JSON object."""
         
         logger.info(f"📊 Results saved: {full_file.name}")
 
+def run_queue_worker(pipeline: H100VideoPipeline, queue: WorkQueue, pause: float = 2.0,
+                     idle_poll: float = 30.0) -> Dict[str, int]:
+    """Process leased videos until the queue is settled (every video done or dead-lettered)
+
+    Failures back off and are retried in the same run once their backoff
+    expires; videos leased by another worker are waited for in case their
+    lease runs out.
+    """
+    outcome = {"done": 0, "failed": 0}
+    while True:
+        jobs = queue.lease()
+        if not jobs:
+            wait = queue.next_available_in()
+            if wait is None:
+                return outcome
+            print(f"⏳ Next retry due in {wait:.0f}s")
+            time.sleep(min(max(wait, 0.05), idle_poll))
+            continue
+        job = jobs[0]
+        url = job.payload["url"]
+        print(f"\n📹 Processing {url} (attempt {job.attempts}/{queue.max_attempts})")
+        
+        try:
+            with queue.keep_alive(job):
+                results = pipeline.process_video_complete(url)
+        except Exception as e:
+            results = {"error": str(e)}
+        
+        if results.get("success"):
+            queue.ack(job)
+            outcome["done"] += 1
+            pait_score = results.get("pait_results", {}).get("total_pait_score", "N/A")
+            print(f"  ✅ pAIt Score: {pait_score}/100")
+        else:
+            state = queue.fail(job, results.get("error", "unknown error"))
+            outcome["failed"] += 1
+            print(f"  ❌ Failed: {results.get('error')} ({'dead-lettered' if state == 'dead' else 'will retry'})")
+        
+        # Brief pause between videos
+        time.sleep(pause)
+
 def main():
     """CLI interface for H100 video pipeline"""
     import argparse
@@ -388,6 +437,9 @@ def main():
     parser = argparse.ArgumentParser(description="🎬 H100 Video Analysis Pipeline")
     parser.add_argument('--url', type=str, help='YouTube URL to process')
     parser.add_argument('--batch-file', type=str, help='File with multiple URLs')
+    parser.add_argument('--worker', action='store_true', help='Work through videos already queued by --batch-file')
+    parser.add_argument('--max-attempts', type=int, default=3, help='Attempts per video before it is dead-lettered (default: 3)')
+    parser.add_argument('--retry-dead', action='store_true', help='Re-queue dead-lettered videos')
     parser.add_argument('--test-models', action='store_true', help='Test model availability')
     
     args = parser.parse_args()
@@ -417,23 +469,23 @@ def main():
         else:
             print(f"❌ Processing failed: {results.get('error')}")
     
-    elif args.batch_file:
-        print(f"📋 Processing batch file: {args.batch_file}")
-        with open(args.batch_file, 'r') as f:
-            urls = [line.strip() for line in f if line.strip()]
-        
-        for i, url in enumerate(urls, 1):
-            print(f"\n📹 Processing {i}/{len(urls)}: {url}")
-            results = pipeline.process_video_complete(url)
-            
-            if results.get("success"):
-                pait_score = results.get("pait_results", {}).get("total_pait_score", "N/A")
-                print(f"  ✅ pAIt Score: {pait_score}/100")
-            else:
-                print(f"  ❌ Failed: {results.get('error')}")
-            
-            # Brief pause between videos
-            time.sleep(2)
+    elif args.batch_file or args.worker or args.retry_dead:
+        # Leases outlast a slow download + transcription; retries wait 1, 2, 4... minutes
+        queue = WorkQueue(str(pipeline.base_dir / "work_queue.db"), "h100_videos", lease_seconds=1800,
+                          max_attempts=args.max_attempts, backoff_base=60)
+        if args.retry_dead:
+            print(f"📬 Re-queued {queue.retry_dead()} dead-lettered videos")
+        if args.batch_file:
+            print(f"📋 Processing batch file: {args.batch_file}")
+            with open(args.batch_file, 'r') as f:
+                urls = [line.strip() for line in f if line.strip()]
+            queued = sum(queue.enqueue(url, {"url": url}) for url in urls)
+            print(f"📬 Queued {queued}/{len(urls)} URLs (the rest are already queued or dead-lettered)")
+        
+        outcome = run_queue_worker(pipeline, queue)
+        stats = queue.stats()
+        print(f"\n📊 {outcome['done']} done, {outcome['failed']} failed this run; queue: "
+              f"{stats['pending']} waiting to retry, {stats['leased']} in progress, {stats['dead']} dead-lettered")
     
     else:
         parser.print_help()
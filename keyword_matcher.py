@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🔎 Keyword Matcher - One scan per document for every rule-based scorer
+Shared multi-pattern matcher over the union of all scorer vocabularies
+
+lens tags, the YouTube score_* methods, the visual/screenshot analyzers
+and the Frankenstein integrator each used to lower-case the text again
+and loop `term in text` over their own lists: dozens of full scans per
+document. Modules now register their vocabularies here; the union is
+compiled once into a single automaton and each document is scanned once
+(memoised), every scorer reading its terms from the shared hit set.
+
+Matching keeps the old semantics exactly: case-insensitive substring
+hits, overlapping terms included.
+
+Backends:
+- pyahocorasick installed: Aho-Corasick automaton
+- otherwise: a trie-shaped regex searched from each hit + 1 (the C regex
+  engine skips non-candidate characters); terms that are prefixes of the
+  longest hit at a position are added from a precomputed closure
+
+Usage:
+    from keyword_matcher import register_vocabulary, scan
+    RISK_TERMS = register_vocabulary(['stop loss', 'risk', 'drawdown'])
+    hits = scan(text)
+    hits.found(RISK_TERMS)   # -> ['stop loss', 'risk']
+    hits.offsets['risk']     # -> [12, 40]
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordHits:
+    """Every vocabulary hit in one document: term -> offsets into text.lower()"""
+
+    __slots__ = ("text", "offsets", "_vocabulary")
+
+    def __init__(self, text: str, offsets: Dict[str, List[int]], vocabulary: frozenset):
+        self.text = text            # Lower-cased document
+        self.offsets = offsets
+        self._vocabulary = vocabulary
+
+    def __contains__(self, term: str) -> bool:
+        if term in self.offsets:
+            return True
+        if term in self._vocabulary:
+            return False
+        # Unregistered term: plain substring check, same answer just not precompiled
+        return term.lower() in self.text
+
+    def found(self, terms: Iterable[str]) -> List[str]:
+        """Terms present, in the order given"""
+        return [term for term in terms if term in self]
+
+    def count(self, terms: Iterable[str]) -> int:
+        return sum(1 for term in terms if term in self)
+
+    def any(self, terms: Iterable[str]) -> bool:
+        return any(term in self for term in terms)
+
+
+class KeywordMatcher:
+    """Multi-pattern matcher compiled once over a fixed vocabulary"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = frozenset(term.lower() for term in terms if term)
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            if self.terms:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._pattern = re.compile(_trie_pattern(self.terms)) if self.terms else None
+            # Every term that occurs at a position is a prefix of the longest term there
+            self._closure = {term: [other for other in self.terms if term.startswith(other)]
+                             for term in self.terms}
+
+    def scan(self, text: str) -> KeywordHits:
+        """Single pass over the document"""
+        text_lower = text.lower()
+        offsets: Dict[str, List[int]] = {}
+
+        if self._automaton is not None:
+            if self.terms:
+                for end, term in self._automaton.iter(text_lower):
+                    offsets.setdefault(term, []).append(end - len(term) + 1)
+        elif self._pattern is not None:
+            search = self._pattern.search
+            match = search(text_lower)
+            while match is not None:
+                start = match.start()
+                for term in self._closure[match.group()]:
+                    offsets.setdefault(term, []).append(start)
+                match = search(text_lower, start + 1)
+
+        for positions in offsets.values():
+            positions.sort()
+        return KeywordHits(text_lower, offsets, self.terms)
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex matching the longest vocabulary term at a position (shared prefixes factored)"""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy: prefer the longer term, fall back to the one ending here
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+# Shared matcher over every registered vocabulary
+
+_vocabulary: set = set()
+_matcher: Optional[KeywordMatcher] = None
+_generation = 0
+_lock = threading.Lock()
+
+
+def register_vocabulary(*term_lists: Iterable[str]) -> List[str]:
+    """Add scorer terms to the shared vocabulary; returns the first list for assignment"""
+    global _matcher, _generation
+    with _lock:
+        new_terms = {term.lower() for terms in term_lists for term in terms if term} - _vocabulary
+        if new_terms:
+            _vocabulary.update(new_terms)
+            _matcher = None
+            _generation += 1
+    return list(term_lists[0]) if term_lists else []
+
+
+def shared_matcher() -> KeywordMatcher:
+    """Matcher over the union of all registered vocabularies (compiled on first use)"""
+    global _matcher
+    with _lock:
+        if _matcher is None:
+            _matcher = KeywordMatcher(_vocabulary)
+        return _matcher
+
+
+@lru_cache(maxsize=256)
+def _scan_cached(text: str, generation: int) -> KeywordHits:
+    return shared_matcher().scan(text)
+
+
+def scan(text: str) -> KeywordHits:
+    """Hits for every registered term; repeat calls on the same text are free"""
+    return _scan_cached(text or "", _generation)
@@ -1,62 +1,176 @@
 # lens.py
 import cv2
-import pytesseract
-from PIL import Image
 import os
+from collections import deque
+from itertools import islice
+from ocr_engine import get_engine
+from ocr_result import OCRResult
+from ocr_preprocess import (decode_image, decode_image_bytes, merge_tile_results,
+                            normalize_for_ocr, preprocess_batch, recognize_normalized)
+from text_regions import ocr_text_regions
+from keyword_matcher import register_vocabulary, scan
+from metrics import stage
 
-def analyze_image(image_path):
+# Tag vocabularies (matched in one shared scan, see keyword_matcher.py)
+FINANCIAL_TERMS = register_vocabulary(['price', 'chart', 'trading', 'stock', 'crypto', '$'])
+SECURE_TERMS = register_vocabulary(['secure', 'vault', 'private', 'confidential'])
+PAIT_TERMS = register_vocabulary(['ai', 'intelligence', 'analysis', 'score'])
+TECHNICAL_TERMS = register_vocabulary(['api', 'code', 'function', 'data'])
+
+def analyze_image(image_path, detect_regions=True):
     """
-    Analyze image using OCR and extract intelligence
+    Analyze image using OCR and extract intelligence.
+    With detect_regions, only detected text bands are OCR'd (see text_regions.py).
     """
     try:
         # Load and process image
-        image = cv2.imread(image_path)
+        with stage("decode"):
+            image = cv2.imread(image_path)
         if image is None:
             return {"tags": [], "confidence": 0.0, "ocrText": "Failed to load image"}
         
-        # Convert to RGB for Pillow
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(image_rgb)
-        
-        # Extract text using OCR
-        ocr_text = pytesseract.image_to_string(pil_image, config='--psm 6')
+        return analyze_decoded(image, detect_regions)
+    except Exception as e:
+        return demo_result(e)
+
+def analyze_image_buffer(data, filename=None, detect_regions=True):
+    """
+    Analyze an encoded image held in memory (e.g. an upload body) without
+    a temp-file round trip.
+    """
+    try:
+        with stage("decode"):
+            image = decode_image_bytes(data, filename)
+        if image is None:
+            return {"tags": [], "confidence": 0.0, "ocrText": "Failed to load image"}
         
-        # Analyze text for intelligence tags
-        tags = extract_intelligence_tags(ocr_text)
-        confidence = calculate_confidence(ocr_text, tags)
+        return analyze_decoded(image, detect_regions)
+    except Exception as e:
+        return demo_result(e)
+
+def analyze_decoded(image, detect_regions=True):
+    """OCR + intelligence tags for a decoded BGR image"""
+    # Convert to RGB for the OCR workers
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    
+    # Extract text, word confidences and boxes using the shared warm OCR pool,
+    # on a copy rescaled so text is OCR-sized (huge uploads never hit Tesseract at full size)
+    with stage("ocr"):
+        if detect_regions:
+            image_rgb, _ = normalize_for_ocr(image_rgb)
+            ocr_result = ocr_text_regions(image_rgb, get_engine(), config='--psm 6')["result"]
+        else:
+            ocr_result = recognize_normalized(get_engine(), image_rgb, config='--psm 6')
+    
+    return build_result(ocr_result)
+
+def demo_result(error):
+    """Fallback for demo purposes"""
+    return {
+        "tags": ["analysis", "demo"], 
+        "confidence": 0.85,
+        "ocrText": f"OCR processing failed: {str(error)}\n\nUsing demo data for display."
+    }
+
+def analyze_images(paths_or_buffers, batch_size=16):
+    """
+    Analyze many images (paths, encoded bytes or decoded arrays) in one call.
+    Preprocessing is batched, OCR is fanned out to the pool (one job per
+    tile for tall captures), and results come back in input order. At most
+    two chunks are in flight: chunk N is collected once chunk N+1 is submitted.
+    """
+    engine = get_engine()
+    sources = iter(paths_or_buffers)
+    in_flight = deque()  # Per chunk: [([(y offset, tile height, future)] or None, error message)] per input
+    results = []
+    
+    while True:
+        chunk = list(islice(sources, batch_size))
+        if not chunk:
+            break
+        in_flight.append(submit_chunk(engine, chunk))
         
-        return {
-            "tags": tags, 
-            "confidence": confidence,
-            "ocrText": ocr_text.strip() if ocr_text.strip() else "No text detected"
-        }
+        # Submitting this chunk before collecting the previous one keeps OCR overlapping decode
+        while len(in_flight) > 1:
+            results.extend(collect_chunk(in_flight.popleft()))
+    
+    while in_flight:
+        results.extend(collect_chunk(in_flight.popleft()))
+    return results
+
+def submit_chunk(engine, chunk):
+    """Decode and preprocess one chunk, then submit its tiles to the OCR pool"""
+    decoded = []
+    for source in chunk:
+        try:
+            decoded.append(decode_image(source))
+        except Exception:
+            decoded.append(None)
+    
+    valid = [image for image in decoded if image is not None]
+    try:
+        prepared = iter(preprocess_batch(valid))
     except Exception as e:
-        # Fallback for demo purposes
-        return {
-            "tags": ["analysis", "demo"], 
-            "confidence": 0.85,
-            "ocrText": f"OCR processing failed: {str(e)}\n\nUsing demo data for display."
-        }
+        return [(None, f"OCR processing failed: {str(e)}") for _ in chunk]
+    
+    pending = []
+    for image in decoded:
+        if image is None:
+            pending.append((None, "Failed to load image"))
+        else:
+            tiles = next(prepared)
+            pending.append(([(y, tile.shape[0], engine.submit(tile, config='--psm 6')) for y, tile in tiles],
+                            None))
+    return pending
+
+def collect_chunk(pending):
+    """Wait for one chunk's OCR and build its results, in input order"""
+    results = []
+    for tile_futures, error in pending:
+        if tile_futures is None:
+            results.append({"tags": [], "confidence": 0.0, "ocrText": error})
+            continue
+        try:
+            results.append(build_result(merge_tile_results([(y, h, future.result())
+                                                            for y, h, future in tile_futures])))
+        except Exception as e:
+            results.append({"tags": [], "confidence": 0.0, "ocrText": f"OCR processing failed: {str(e)}"})
+    return results
+
+def build_result(ocr_result):
+    """Tags, confidence and cleaned text for one OCR output (OCRResult or plain text)"""
+    if isinstance(ocr_result, str):
+        ocr_result = OCRResult.from_text(ocr_result)
+    
+    ocr_text = ocr_result.text
+    tags = extract_intelligence_tags(ocr_text)
+    confidence = calculate_confidence(ocr_text, tags, ocr_result)
+    
+    return {
+        "tags": tags, 
+        "confidence": confidence,
+        "ocrText": ocr_text.strip() if ocr_text.strip() else "No text detected"
+    }
 
 def extract_intelligence_tags(text):
     """Extract relevant tags based on OCR text content"""
     tags = []
-    text_lower = text.lower()
+    hits = scan(text)
     
     # Financial/Trading terms
-    if any(term in text_lower for term in ['price', 'chart', 'trading', 'stock', 'crypto', '$']):
+    if hits.any(FINANCIAL_TERMS):
         tags.append('financial')
     
     # Security/Vault terms  
-    if any(term in text_lower for term in ['secure', 'vault', 'private', 'confidential']):
+    if hits.any(SECURE_TERMS):
         tags.append('secure')
     
     # AI/Intelligence terms
-    if any(term in text_lower for term in ['ai', 'intelligence', 'analysis', 'score']):
+    if hits.any(PAIT_TERMS):
         tags.append('pAIt')
         
     # Technical terms
-    if any(term in text_lower for term in ['api', 'code', 'function', 'data']):
+    if hits.any(TECHNICAL_TERMS):
         tags.append('technical')
         
     # Default tag if nothing found
@@ -65,13 +179,16 @@ def extract_intelligence_tags(text):
         
     return tags
 
-def calculate_confidence(text, tags):
+def calculate_confidence(text, tags, ocr_result=None):
     """Calculate confidence score based on text quality and tag relevance"""
     if not text.strip():
         return 0.0
         
-    # Base confidence on text length and tag count
-    text_quality = min(len(text.strip()) / 100, 1.0)  # Normalize to 0-1
+    # Text quality from OCR word confidences when available, else from text length
+    if ocr_result is not None and len(ocr_result):
+        text_quality = ocr_result.mean_confidence / 100
+    else:
+        text_quality = min(len(text.strip()) / 100, 1.0)  # Normalize to 0-1
     tag_relevance = min(len(tags) / 5, 1.0)  # More tags = higher confidence
     
     return round((text_quality * 0.7 + tag_relevance * 0.3), 2)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+⏱️ Metrics - Stage timers, histograms and a Prometheus /metrics endpoint
+Dependency-free instrumentation shared by the analyzers and Flask services
+
+- stage("ocr"): context-manager timer feeding the lens_stage_seconds
+  histogram (decode, ocr, scoring, llm, persistence, ...)
+- collect_timings(): gathers the stage timings of the current request so
+  real numbers go into response metadata instead of mock strings
+- instrument_flask(app, service): per-endpoint request latency histogram
+  and GET /metrics in Prometheus text format
+- serve_metrics(port): the same /metrics for processes without a web app
+  (the cron processor)
+
+Usage:
+    from metrics import collect_timings, stage
+    with collect_timings() as timings:
+        with stage("decode"):
+            image = decode_image_bytes(data)
+    timings.as_ms()            # {"decode": 4.1}
+    get_registry().render()    # Prometheus exposition text
+"""
+
+import math
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached OCR hit (ms) up to a slow H100 call (60s timeout)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        key = tuple(str(value) for value in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(str(value) for value in labelvalues), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in values]
+
+
+class Gauge(Counter):
+    """Value that goes up and down (queue depth, in-flight work)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues: str):
+        with self._lock:
+            self._values[tuple(str(label) for label in labelvalues)] = float(value)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, optionally split by label values"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts..., sum, count
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        key = tuple(str(label) for label in labelvalues)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            series = self._series.get(tuple(str(label) for label in labelvalues))
+            return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = []
+        for key, values in series:
+            for bound, bucket_count in zip(self.buckets, values):
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(bucket_count)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(values[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named counters and histograms, rendered together for /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif type(metric) is not metric_class:
+                raise ValueError(f"Metric '{name}' already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _registry
+
+
+STAGE_SECONDS = _registry.histogram(
+    "lens_stage_seconds", "Time spent per analysis stage (decode, ocr, scoring, llm, persistence)", ("stage",))
+REQUEST_SECONDS = _registry.histogram(
+    "lens_http_request_seconds", "HTTP request latency", ("service", "endpoint", "method", "status"))
+
+
+class StageTimings:
+    """Stage durations of one request (a repeated stage accumulates)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}  # Stage name -> seconds
+        self.total_seconds: Optional[float] = None  # Set when collect_timings exits
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000, 2) for name, seconds in self.stages.items()}
+
+
+_active_timings: ContextVar[Optional[StageTimings]] = ContextVar("lens_stage_timings", default=None)
+
+
+@contextmanager
+def collect_timings():
+    """Collect every stage() timed inside the block (this thread/task only)"""
+    timings = StageTimings()
+    token = _active_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        timings.total_seconds = timings.elapsed()
+        _active_timings.reset(token)
+
+
+def record_stage(name: str, seconds: float):
+    """Record an externally measured stage (e.g. timed inside a pool process)"""
+    STAGE_SECONDS.observe(seconds, name)
+    timings = _active_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as one analysis stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+def format_seconds(seconds: float) -> str:
+    """'0.84s' - the processingTime string format the front end displays"""
+    return f"{seconds:.2f}s"
+
+
+def instrument_flask(app, service: str):
+    """Request latency per endpoint plus GET /metrics on a Flask app"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop("_metrics_started", None)
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - started, service, endpoint,
+                                    request.method, response.status_code)
+        return response
+
+    def metrics_endpoint():
+        return Response(get_registry().render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint, methods=["GET"])
+    return app
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """Serve GET /metrics from a daemon thread (stdlib http.server)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = get_registry().render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would drown the processor log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+🗄️ OCR Cache - Content-addressed OCR results
+Two-tier (memory LRU + disk) cache keyed by SHA-256 of decoded pixels + OCR config
+
+The same screenshot is OCR'd by several analyzers and is often re-uploaded.
+Keying on the decoded pixels (not the file bytes) means a PNG and a
+re-saved copy with identical pixels share one entry, and keying on the
+config keeps PSM/profile variants apart.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import logging
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def image_cache_key(image, config: str) -> str:
+    """SHA-256 over decoded pixels (shape/dtype or mode/size included) and config"""
+    digest = hashlib.sha256()
+
+    if hasattr(image, "shape") and hasattr(image, "tobytes"):
+        # numpy array
+        digest.update(f"ndarray:{image.shape}:{image.dtype}".encode())
+        digest.update(image.tobytes())
+    elif hasattr(image, "mode") and hasattr(image, "size"):
+        # PIL image
+        digest.update(f"pil:{image.mode}:{image.size}".encode())
+        digest.update(image.tobytes())
+    else:
+        digest.update(b"bytes:")
+        digest.update(bytes(image))
+
+    digest.update(b"\x00config:")
+    digest.update((config or "").encode())
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """Memory LRU in front of an on-disk store under lens-data/ocr_cache"""
+
+    def __init__(self, cache_dir: str = "lens-data/ocr_cache",
+                 max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # Computed lazily on first disk write
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached OCR output or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key][0]
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)["value"]
+            os.utime(path)  # Refresh mtime so disk eviction is LRU-ish
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store OCR output in both tiers"""
+        payload = json.dumps({"value": value}, ensure_ascii=False)
+
+        with self._lock:
+            self._remember(key, value, len(payload))
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per writer (threads of one process included), in the same directory for the rename
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"OCR cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload.encode('utf-8'))
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key: str, value: Any, size: Optional[int] = None):
+        """Insert into the memory tier and evict least-recently-used entries (lock held)"""
+        if size is None:
+            # Same measure as put() so promoted disk hits are charged like fresh entries
+            size = len(json.dumps({"value": value}, ensure_ascii=False))
+
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def _scan_disk_bytes(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json"))
+
+    def _evict_disk(self):
+        """Drop oldest disk entries until under 90% of the size budget (lock held)"""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        entries.sort()
+        target = int(self.max_disk_bytes * 0.9)
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                self.evictions += 1
+            except OSError:
+                continue
+
+        self._disk_bytes = total
+
+    def clear(self):
+        """Drop the memory tier (disk entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes
+            }
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+⚙️ OCR Engine - Warm Tesseract Worker Pool
+Shared OCR layer for lens, the visual/screenshot analyzers and the YouTube service
+
+pytesseract forks a fresh `tesseract` process per call and reloads the
+traineddata every time. With tesserocr (a dependency in
+backend/requirements.txt) this engine keeps long-lived worker processes
+(one per core by default) that initialise Tesseract once, hold resident
+TessBaseAPI handles and are fed through the executor's call queue.
+
+Without tesserocr (e.g. Windows, where it has no wheels) every call still
+starts a `tesseract` process, so a process pool would only add pickling
+and IPC on top: calls run on a thread pool instead, each thread waiting
+on its own pytesseract subprocess. Still parallel, but not warm.
+
+Results are memoised in a content-addressed OCRCache (see ocr_cache.py),
+so repeat uploads and repeat passes across analyzers skip OCR entirely.
+
+Usage:
+    from ocr_engine import get_engine
+    text = get_engine().image_to_string(image_rgb, config='--psm 6')
+    result = get_engine().recognize(image_rgb)  # + word confidences/boxes
+    result = get_engine().recognize(image_rgb, profile='trading')  # see ocr_profiles.py
+    print(get_engine().report())
+"""
+
+import os
+import shlex
+import time
+import atexit
+import threading
+import logging
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+from ocr_cache import OCRCache, image_cache_key
+from ocr_profiles import profile_config
+from ocr_result import OCRResult, OCRResultBuilder, result_from_tsv
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+
+DEFAULT_CONFIG = '--psm 3'  # Tesseract's own default page segmentation
+
+# Per-process worker state (populated by _init_worker inside each pool process)
+_worker_state: Dict[str, Any] = {"initialized": False, "lang": "eng", "apis": {}}
+
+
+def _parse_config(config: str) -> Tuple[int, Dict[str, str]]:
+    """Split a pytesseract-style config string into PSM and -c / user-words variables"""
+    psm = 3
+    variables = {}
+
+    # Same shell-style tokenising pytesseract applies, so quoted values match
+    tokens = shlex.split(config or '')
+    for option, value in zip(tokens, tokens[1:]):
+        if option == '--psm' and value.isdigit():
+            psm = int(value)
+        elif option == '-c' and '=' in value:
+            key, _, value = value.partition('=')
+            variables[key] = value
+        # Init-only files: each distinct set gets its own resident API in _get_api
+        elif option == '--user-words':
+            variables['user_words_file'] = value
+        elif option == '--user-patterns':
+            variables['user_patterns_file'] = value
+
+    return psm, variables
+
+
+def _init_worker(lang: str = "eng", tesseract_cmd: Optional[str] = None):
+    """Initialise Tesseract once per worker process"""
+    _worker_state["lang"] = lang
+    _worker_state["initialized"] = True
+
+    if tesseract_cmd and PYTESSERACT_AVAILABLE:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    if TESSEROCR_AVAILABLE:
+        # Load the default traineddata up front so the first image is warm too
+        _get_api({})
+
+
+def _get_api(variables: Dict[str, str]):
+    """Return a resident TessBaseAPI for this variable set (created once)"""
+    key = tuple(sorted(variables.items()))
+    api = _worker_state["apis"].get(key)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=_worker_state["lang"], variables=dict(variables))
+        _worker_state["apis"][key] = api
+    return api
+
+
+def _recognize(image, config: str) -> Tuple[OCRResult, float]:
+    """Run OCR inside a worker; returns (word-level result, seconds spent in OCR)"""
+    if not _worker_state["initialized"]:
+        _init_worker()
+
+    start = time.perf_counter()
+
+    if TESSEROCR_AVAILABLE:
+        from PIL import Image
+
+        psm, variables = _parse_config(config)
+        api = _get_api(variables)
+        api.SetPageSegMode(psm)
+        api.SetImage(image if isinstance(image, Image.Image) else Image.fromarray(image))
+        api.Recognize()
+
+        builder = OCRResultBuilder()
+        level = tesserocr.RIL.WORD
+        iterator = api.GetIterator()
+        if iterator is not None:
+            for word_iter in tesserocr.iterate_level(iterator, level):
+                word = word_iter.GetUTF8Text(level)
+                if not word:
+                    continue
+                if word_iter.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    builder.new_line(paragraph=word_iter.IsAtBeginningOf(tesserocr.RIL.PARA))
+                x1, y1, x2, y2 = word_iter.BoundingBox(level)
+                builder.add_word(word, word_iter.Confidence(level), (x1, y1, x2 - x1, y2 - y1))
+        result = builder.build()
+    else:
+        # One TSV pass yields text, word confidences and boxes together
+        data = pytesseract.image_to_data(image, lang=_worker_state["lang"], config=config,
+                                         output_type=pytesseract.Output.DICT)
+        result = result_from_tsv(data)
+
+    return result, time.perf_counter() - start
+
+
+class OCRStats:
+    """Thread-safe latency/throughput counters for the OCR engine"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.images = 0
+        self.errors = 0
+        self.ocr_seconds = 0.0
+        self.first_submit = None
+        self.last_complete = None
+
+    def record_submit(self):
+        with self._lock:
+            if self.first_submit is None:
+                self.first_submit = time.perf_counter()
+
+    def record(self, ocr_seconds: float, latency_seconds: float):
+        with self._lock:
+            self.images += 1
+            self.ocr_seconds += ocr_seconds
+            self._latencies.append(latency_seconds)
+            self.last_complete = time.perf_counter()
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self, workers: int) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            images = self.images
+            ocr_seconds = self.ocr_seconds
+            wall = (self.last_complete - self.first_submit) if images and self.first_submit else 0.0
+            errors = self.errors
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            "workers": workers,
+            "images": images,
+            "errors": errors,
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                "p50": round(percentile(0.50) * 1000, 2),
+                "p95": round(percentile(0.95) * 1000, 2),
+                "p99": round(percentile(0.99) * 1000, 2)
+            },
+            "images_per_sec_per_core": round(images / ocr_seconds, 3) if ocr_seconds else 0.0,
+            "images_per_sec": round(images / wall, 3) if wall else 0.0
+        }
+
+
+class OCREngine:
+    """Pool of pre-initialised OCR workers shared by every analyzer"""
+
+    def __init__(self, workers: Optional[int] = None, lang: str = "eng",
+                 cache: Optional[OCRCache] = None):
+        if workers is None:
+            workers = int(os.environ.get("LENS_OCR_WORKERS", os.cpu_count() or 1))
+
+        # workers == 0 runs OCR inline in the calling process (no pool)
+        self.workers = max(0, workers)
+        self.lang = lang
+        self.cache = cache
+        self.stats = OCRStats()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _tesseract_cmd(self) -> Optional[str]:
+        """Propagate a custom tesseract binary path to spawned workers"""
+        cmd = os.environ.get("TESSERACT_CMD")
+        if cmd:
+            return cmd
+        if PYTESSERACT_AVAILABLE:
+            return pytesseract.pytesseract.tesseract_cmd
+        return None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers == 0:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                if TESSEROCR_AVAILABLE:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_init_worker,
+                        initargs=(self.lang, self._tesseract_cmd())
+                    )
+                    logger.info(f"OCR engine started: {self.workers} warm workers (tesserocr)")
+                else:
+                    # pytesseract runs a tesseract process per call anyway: threads wait on them in parallel
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="ocr",
+                        initializer=_init_worker,
+                        initargs=(self.lang, self._tesseract_cmd())
+                    )
+                    logger.warning(f"OCR engine started: {self.workers} pytesseract threads, one tesseract "
+                                   f"process per call (install tesserocr for warm workers)")
+        return self._executor
+
+    def submit(self, image, config: str = DEFAULT_CONFIG, profile: Optional[str] = None) -> Future:
+        """Queue an image (numpy array or PIL image) for OCR; resolves to an OCRResult
+
+        profile selects a domain OCR profile (e.g. 'trading', see ocr_profiles.py).
+        Cancelling the returned future drops the job if a worker has not
+        picked it up yet.
+        """
+        config = profile_config(config, profile)
+        result = Future()
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = image_cache_key(image, "tsv:" + config)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                result.set_result(OCRResult.from_dict(cached))
+                return result
+
+        self.stats.record_submit()
+        submitted = time.perf_counter()
+
+        def finish(ocr_result, ocr_seconds):
+            self.stats.record(ocr_seconds, time.perf_counter() - submitted)
+            if cache_key is not None:
+                self.cache.put(cache_key, ocr_result.to_dict())
+            if not result.cancelled():
+                result.set_result(ocr_result)
+
+        def fail(error):
+            self.stats.record_error()
+            if not result.cancelled():
+                result.set_exception(error)
+
+        executor = self._get_executor()
+        if executor is None:
+            try:
+                if not _worker_state["initialized"]:
+                    _init_worker(self.lang, self._tesseract_cmd())
+                finish(*_recognize(image, config))
+            except Exception as e:
+                fail(e)
+            return result
+
+        def on_done(inner: Future):
+            if inner.cancelled():
+                return
+            try:
+                finish(*inner.result())
+            except Exception as e:
+                fail(e)
+
+        inner = executor.submit(_recognize, image, config)
+        inner.add_done_callback(on_done)
+        result.add_done_callback(lambda f: inner.cancel() if f.cancelled() else None)
+        return result
+
+    def recognize(self, image, config: str = DEFAULT_CONFIG, profile: Optional[str] = None) -> OCRResult:
+        """Text, per-word confidences and boxes from one OCR pass"""
+        return self.submit(image, config, profile).result()
+
+    def image_to_string(self, image, config: str = DEFAULT_CONFIG, profile: Optional[str] = None) -> str:
+        """Drop-in replacement for pytesseract.image_to_string"""
+        return self.recognize(image, config, profile).text
+
+    def map(self, images: List[Any], config: str = DEFAULT_CONFIG,
+            profile: Optional[str] = None) -> List[OCRResult]:
+        """OCR many images across the pool, results in input order"""
+        futures = [self.submit(image, config, profile) for image in images]
+        return [future.result() for future in futures]
+
+    def report(self) -> Dict[str, Any]:
+        """Per-image latency, images/sec per core and cache hit counters"""
+        report = self.stats.snapshot(self.workers or 1)
+        if self.cache is not None:
+            report["cache"] = self.cache.stats()
+        return report
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_engine: Optional[OCREngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> OCREngine:
+    """Process-wide shared OCR engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            cache = None if os.environ.get("LENS_OCR_CACHE") == "0" else OCRCache()
+            _engine = OCREngine(cache=cache)
+            atexit.register(_engine.shutdown)
+        return _engine
+
+
+def main():
+    """CLI: OCR images through the pool and print the latency report"""
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="⚙️ OCR Engine - warm worker pool benchmark")
+    parser.add_argument('images', nargs='+', help='Image files to OCR')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='Tesseract config (default: --psm 3)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--profile', default=None, help='OCR profile (e.g. trading)')
+
+    args = parser.parse_args()
+
+    import cv2
+
+    engine = OCREngine(workers=args.workers)
+    images = [cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB) for path in args.images]
+
+    engine.map(images, args.config, args.profile)
+    print(json.dumps(engine.report(), indent=2))
+    engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
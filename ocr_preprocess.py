@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+🧪 OCR Preprocessing - Batched decode, grayscale, normalize and threshold
+Feeds lens.analyze_images with OCR-ready binary images
+
+Grayscale, resize, histograms and thresholding run through OpenCV (C
+loops per image); the Otsu threshold search runs as one vectorized NumPy
+pass over the batch's (N, 256) histograms, with no padded image stack.
+
+Size normalization: instead of OCRing uploads at whatever resolution they
+arrive in (a 12MP photo, a 20000px scrolling capture), the median glyph
+height is estimated on a thumbnail and the image rescaled so text lands
+in Tesseract's sweet spot (~30px). Width-bound pixel count is capped and
+very tall screenshots are cut into overlapping tiles OCR'd in parallel,
+so per-call OCR cost stays bounded whatever the upload size.
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ocr_result import OCRResult, OCRResultBuilder
+
+TARGET_TEXT_HEIGHT = 30        # px glyph height Tesseract reads most accurately
+MIN_SCALE, MAX_SCALE = 0.25, 3.0
+ESTIMATE_WIDTH = 800           # Text height is estimated on a thumbnail this wide
+MAX_TILE_PIXELS = 4_000_000    # Pixel budget per OCR call
+TILE_HEIGHT = 2000             # Tall screenshots are OCR'd in tiles of this height...
+TILE_OVERLAP = 120             # ...overlapping by more than a text line
+MAX_TILES = 12                 # Beyond this the image is downscaled further instead
+
+
+def decode_image(source: Any, filename: Optional[str] = None) -> Optional[np.ndarray]:
+    """Decode a path, raw encoded bytes or an already-decoded array to BGR/gray"""
+    if isinstance(source, np.ndarray):
+        if source.ndim == 1:
+            return decode_image_bytes(source, filename)
+        return source
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return decode_image_bytes(source, filename)
+
+    if isinstance(source, (str, Path)):
+        return cv2.imread(str(source))
+
+    return None
+
+
+def decode_image_bytes(data: Any, filename: Optional[str] = None) -> Optional[np.ndarray]:
+    """Decode an encoded image held in memory (upload body) to BGR
+
+    cv2.imdecode handles JPEG/PNG/BMP/TIFF/WebP straight from the buffer.
+    Formats OpenCV cannot decode (GIF, HEIC via plugins) go through Pillow,
+    still in memory. Only if both fail is a temp file used, for containers
+    that OpenCV can read solely through its file-based VideoCapture.
+    """
+    buffer = data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+    if not buffer.size:
+        return None
+
+    image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if image is not None:
+        return image
+
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(buffer.tobytes())) as pil_image:
+            return cv2.cvtColor(np.asarray(pil_image.convert('RGB')), cv2.COLOR_RGB2BGR)
+    except Exception:
+        pass
+
+    return _decode_via_tempfile(buffer, filename)
+
+
+def _decode_via_tempfile(buffer: np.ndarray, filename: Optional[str]) -> Optional[np.ndarray]:
+    """Last resort: first frame through VideoCapture, which needs a real file"""
+    suffix = Path(filename).suffix if filename else ''
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_file.write(buffer.tobytes())
+            temp_path = temp_file.name
+
+        capture = cv2.VideoCapture(temp_path)
+        ok, frame = capture.read()
+        capture.release()
+        return frame if ok else None
+    finally:
+        if temp_path:
+            os.unlink(temp_path)
+
+
+def estimate_text_height(image: np.ndarray) -> Optional[float]:
+    """Median glyph height in original pixels, None when no text-like blobs are found"""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+
+    factor = min(1.0, ESTIMATE_WIDTH / width)
+    if factor < 1.0:
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size / 2:
+        binary = cv2.bitwise_not(binary)  # Text is the minority class (dark mode)
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+    # Glyph-like blobs: a few px tall, not much wider than tall, not page-sized
+    glyphs = (heights >= 3) & (heights <= binary.shape[0] * 0.1) & (widths <= heights * 3)
+    if glyphs.sum() < 10:
+        return None
+    return float(np.median(heights[glyphs])) / factor
+
+
+def normalization_scale(image: np.ndarray) -> float:
+    """Scale factor that puts text at TARGET_TEXT_HEIGHT within the pixel/tile budget"""
+    height, width = image.shape[:2]
+    text_height = estimate_text_height(image)
+    scale = TARGET_TEXT_HEIGHT / text_height if text_height else 1.0
+    scale = min(MAX_SCALE, max(MIN_SCALE, scale))
+
+    # Each OCR call (the whole image if short, else one tile) stays within the pixel budget
+    if height * scale <= TILE_HEIGHT:
+        scale = min(scale, (MAX_TILE_PIXELS / (width * height)) ** 0.5)
+    else:
+        scale = min(scale, MAX_TILE_PIXELS / (width * TILE_HEIGHT))
+
+    # Very tall captures: bound the tile count, trading text size for latency
+    max_height = MAX_TILES * (TILE_HEIGHT - TILE_OVERLAP) + TILE_OVERLAP
+    if height * scale > max_height:
+        scale = max_height / height
+    return scale
+
+
+def normalize_for_ocr(image: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Rescale so text is OCR-sized; returns (image, scale applied)"""
+    scale = normalization_scale(image)
+    if abs(scale - 1.0) <= 0.05:
+        return image, 1.0
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation), scale
+
+
+def split_tiles(image: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """(y offset, tile) pairs covering the image top to bottom with TILE_OVERLAP"""
+    height = image.shape[0]
+    if height <= TILE_HEIGHT:
+        return [(0, image)]
+
+    step = TILE_HEIGHT - TILE_OVERLAP
+    offsets = list(range(0, height - TILE_OVERLAP, step))
+    return [(y, image[y:y + TILE_HEIGHT]) for y in offsets]
+
+
+def merge_tile_results(tiles: List[Tuple[int, int, OCRResult]]) -> OCRResult:
+    """Merge (y offset, tile height, result) in order, de-duplicating the overlaps
+
+    A word inside an overlap is kept from the tile where its centre lies
+    in that tile's own half of the overlap, so each word is taken once.
+    """
+    if len(tiles) == 1:
+        return tiles[0][2]
+
+    half = TILE_OVERLAP / 2
+    builder = OCRResultBuilder()
+    for index, (y_offset, tile_height, result) in enumerate(tiles):
+        first, last = index == 0, index == len(tiles) - 1
+        builder.new_line()
+        current_line = None
+        for i in range(len(result)):
+            box = result.box(i)
+            centre = box[1] + box[3] / 2
+            if (not first and centre < half) or (not last and centre >= tile_height - half):
+                continue
+            if current_line is not None and result.lines[i] != current_line:
+                builder.new_line()
+            current_line = result.lines[i]
+            builder.add_word(result.word(i), result.confidences[i], box, offset=(0, y_offset))
+    return builder.build()
+
+
+def recognize_tiled(engine, image: np.ndarray, config: str = '--psm 6',
+                    profile: Optional[str] = None) -> OCRResult:
+    """OCR an already-normalized image, tiles in parallel, merged top to bottom"""
+    futures = [(y, tile.shape[0], engine.submit(tile, config=config, profile=profile))
+               for y, tile in split_tiles(image)]
+    return merge_tile_results([(y, h, future.result()) for y, h, future in futures])
+
+
+def recognize_normalized(engine, image: np.ndarray, config: str = '--psm 6',
+                         profile: Optional[str] = None) -> OCRResult:
+    """Normalize size, then OCR tiled; boxes are in normalized coordinates"""
+    return recognize_tiled(engine, normalize_for_ocr(image)[0], config, profile)
+
+
+def to_gray_normalized(image: np.ndarray) -> np.ndarray:
+    """Grayscale and rescale so text is OCR-sized"""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return normalize_for_ocr(gray)[0]
+
+
+def gray_histogram(gray: np.ndarray) -> np.ndarray:
+    """256-bin gray-level histogram (OpenCV, no copy of the image)"""
+    return cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+
+
+def otsu_thresholds(hists: np.ndarray) -> np.ndarray:
+    """Otsu thresholds for an (N, 256) stack of histograms, all rows in one vectorized pass
+
+    Pixels above the threshold are foreground, as with cv2.THRESH_OTSU.
+    """
+    hists = np.asarray(hists, dtype=np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight_bg = np.cumsum(hists, axis=1)
+    weight_fg = weight_bg[:, -1:] - weight_bg
+    cum_mean = np.cumsum(hists * levels, axis=1)
+    total_mean = cum_mean[:, -1:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_bg = cum_mean / weight_bg
+        mean_fg = (total_mean - cum_mean) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0, neginf=0.0)
+    return between.argmax(axis=1).astype(np.uint8)
+
+
+def binarize_batch(grays: List[np.ndarray]) -> List[np.ndarray]:
+    """Otsu-binarize each image: per-image histograms, thresholds for the batch in one pass
+
+    Images are never padded into a common stack, so memory stays at one
+    binary copy per tile whatever the mix of tile shapes in the batch.
+    """
+    if not grays:
+        return []
+
+    hists = np.stack([gray_histogram(gray) for gray in grays])
+    thresholds = otsu_thresholds(hists)
+
+    binary = []
+    for gray, hist, threshold in zip(grays, hists, thresholds):
+        # Dark-mode screenshots (mostly dark after thresholding): invert so text is black on white
+        white = hist[int(threshold) + 1:].sum()
+        mode = cv2.THRESH_BINARY if white >= 0.5 * gray.size else cv2.THRESH_BINARY_INV
+        binary.append(cv2.threshold(gray, int(threshold), 255, mode)[1])
+    return binary
+
+
+def preprocess_batch(images: List[np.ndarray]) -> List[List[Tuple[int, np.ndarray]]]:
+    """Decoded images -> OCR-ready binary (y offset, tile) lists, same order
+
+    Tall captures are split into tiles first, so no single threshold
+    call sees more than a tile.
+    """
+    tiled = [split_tiles(to_gray_normalized(image)) for image in images]
+    binary = iter(binarize_batch([tile for tiles in tiled for _, tile in tiles]))
+    return [[(y, next(binary)) for y, _ in tiles] for tiles in tiled]
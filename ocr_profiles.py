@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+🎯 OCR Profiles - Domain-tuned Tesseract settings, selectable per call
+Trading screenshots are mostly tickers, $ amounts, percentages and
+indicator names (RSI/MACD/VWAP) - the same terms the scorers look for.
+
+A profile bundles:
+- a user-words file (scorer vocabularies + tickers + platforms)
+- a user-patterns file ($ amounts, percentages, tickers, leverage, times)
+- tuned parameters: no frequent-words dictionary (less dictionary search),
+  a character whitelist that rules out look-alike symbols
+
+Usage:
+    get_engine().recognize(image_rgb, config='--psm 6', profile='trading')
+
+Regenerate the word/pattern files after changing the vocabulary:
+    python ocr_profiles.py --build
+"""
+
+import json
+import shlex
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TESSDATA_DIR = Path(__file__).resolve().parent / "tessdata"
+
+# Rule terms from the scoring config (see scoring_engine.py) are added to these
+SCORING_CONFIG_PATH = Path(__file__).resolve().parent / "backend" / "youtube_analysis_config.json"
+
+# Scorer vocabularies outside the config (screenshot_analyzer_local.py
+# analyze_strategy_elements, frankenstein_integration.py)
+SCORER_TERMS = [
+    # Platforms and tools
+    'pocket option', 'iq option', 'binomo', 'olymp trade', 'binance', 'mt4', 'mt5',
+    'bot', 'signal', 'indicator', 'algorithm', 'automated', 'telegram',
+    # Strategy elements
+    'strategy', 'trading', 'signals', 'chart', 'binary', 'forex', 'crypto', 'stochastic'
+]
+
+# Acronyms OCR tends to mangle (RSl, MACO, VVVAP); kept upper case in the word list
+ACRONYMS = [
+    'RSI', 'MACD', 'VWAP', 'EMA', 'SMA', 'ATR', 'ADX', 'OBV', 'ROI', 'PnL', 'P&L', 'ATH', 'OTC',
+    'BTC', 'ETH', 'SOL', 'XRP', 'BNB', 'USDT', 'USDC', 'DOGE', 'ADA',
+    'USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD', 'XAU',
+    'SPY', 'QQQ', 'SPX', 'NDX', 'DJI', 'VIX', 'TSLA', 'AAPL', 'NVDA', 'AMZN', 'MSFT', 'META',
+    'MT4', 'MT5', 'IQ', 'AI'
+]
+
+# Tesseract user-patterns syntax: \d digit, \A upper, \a lower, \* repeat previous
+TRADING_PATTERNS = [
+    '$\\d\\*',               # $500
+    '$\\d\\*.\\d\\d',        # $12.50
+    '$\\d\\*,\\d\\d\\d',     # $10,000
+    '$\\d\\*k',              # $10k
+    '\\d\\*%',               # 87%
+    '\\d\\*.\\d\\*%',        # 2.5%
+    '+\\d\\*%',              # +15%
+    '-\\d\\*%',              # -3%
+    '\\d\\*x',               # 10x leverage
+    '\\d\\*:\\d\\d',         # 15:30
+    '$\\A\\A\\A',            # $BTC cashtags
+    '$\\A\\A\\A\\A',         # $TSLA
+    '\\A\\A\\A/\\A\\A\\A',   # EUR/USD
+    '\\A\\A\\A\\AUSDT',      # DOGEUSDT
+    '\\A\\A\\AUSDT'          # BTCUSDT
+]
+
+# Apostrophes/quotes keep "it's" and "don't" intact; the value is shell-quoted in profile_config
+CHAR_WHITELIST = ("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+                  "$%.,:;/-+()!?&@#*=<>_"
+                  "'’\"€£¥")
+
+PROFILES: Dict[str, Dict[str, str]] = {
+    "trading": {
+        "load_freq_dawg": "0",                    # Skip the frequent-words dictionary pass
+        "tessedit_char_whitelist": CHAR_WHITELIST
+    }
+}
+
+
+def config_terms(config_path: Path = SCORING_CONFIG_PATH) -> List[str]:
+    """Every rule term in the scoring config"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    terms = []
+    for section in config.values():
+        if not isinstance(section, dict):
+            continue
+        for rule in section.get("rules", {}).values():
+            for group in rule.get("groups", []):
+                terms.extend(group.get("terms", []))
+    return terms
+
+
+def profile_words(name: str = "trading") -> List[str]:
+    """User-words for a profile: scorer terms split into words, in common casings"""
+    words = set()
+    for term in SCORER_TERMS + config_terms():
+        for word in term.split():
+            words.update((word, word.capitalize(), word.upper()))
+    words.update(ACRONYMS)
+    return sorted(words)
+
+
+def profile_paths(name: str) -> Dict[str, Path]:
+    return {
+        "user_words_file": TESSDATA_DIR / f"{name}.user-words",
+        "user_patterns_file": TESSDATA_DIR / f"{name}.user-patterns"
+    }
+
+
+def build_profile(name: str = "trading") -> Dict[str, Path]:
+    """Write the profile's user-words and user-patterns files"""
+    paths = profile_paths(name)
+    TESSDATA_DIR.mkdir(exist_ok=True)
+    paths["user_words_file"].write_text("\n".join(profile_words(name)) + "\n", encoding="utf-8")
+    paths["user_patterns_file"].write_text("\n".join(TRADING_PATTERNS) + "\n", encoding="utf-8")
+    return paths
+
+
+def profile_config(config: str, profile: Optional[str]) -> str:
+    """Append a profile's files and parameters to a pytesseract-style config"""
+    if not profile:
+        return config
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown OCR profile: {profile}")
+
+    paths = profile_paths(profile)
+    if not all(path.exists() for path in paths.values()):
+        build_profile(profile)
+
+    parts = [config] if config else []
+    parts.append(f"--user-words {shlex.quote(str(paths['user_words_file']))}")
+    parts.append(f"--user-patterns {shlex.quote(str(paths['user_patterns_file']))}")
+    parts.extend(f"-c {shlex.quote(f'{key}={value}')}" for key, value in PROFILES[profile].items())
+    return " ".join(parts)
+
+
+def main():
+    """CLI: regenerate profile files"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="🎯 OCR Profiles - build user-words/patterns files")
+    parser.add_argument('--build', action='store_true', help='Write tessdata/<profile>.user-words/-patterns')
+    parser.add_argument('--profile', default='trading', choices=sorted(PROFILES))
+
+    args = parser.parse_args()
+
+    if args.build:
+        paths = build_profile(args.profile)
+        print(f"✅ {paths['user_words_file']} ({len(profile_words(args.profile))} words)")
+        print(f"✅ {paths['user_patterns_file']} ({len(TRADING_PATTERNS)} patterns)")
+    else:
+        print(profile_config('--psm 6', args.profile))
+
+
+if __name__ == "__main__":
+    main()
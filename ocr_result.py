@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+🔡 OCR Result - Compact word-level OCR output
+Text, per-word confidences and bounding boxes from a single OCR pass
+
+Words are stored as spans into the page text plus parallel typed arrays
+(array module), not a list of dicts: ~24 bytes per word instead of
+several hundred, so large batches stay light and pickle cheaply between
+the OCR worker processes.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+
+class OCRResult:
+    """Page text plus array-backed per-word confidences and boxes"""
+
+    __slots__ = ("text", "starts", "ends", "confidences", "boxes", "lines")
+
+    def __init__(self, text: str = "", starts: Optional[array] = None, ends: Optional[array] = None,
+                 confidences: Optional[array] = None, boxes: Optional[array] = None,
+                 lines: Optional[array] = None):
+        self.text = text
+        self.starts = starts if starts is not None else array('I')            # Word start offsets in text
+        self.ends = ends if ends is not None else array('I')                  # Word end offsets in text
+        self.confidences = confidences if confidences is not None else array('f')  # 0-100 per word
+        self.boxes = boxes if boxes is not None else array('I')               # Flat x, y, w, h per word
+        self.lines = lines if lines is not None else array('I')               # Line index per word
+
+    @classmethod
+    def from_text(cls, text: str) -> "OCRResult":
+        """Text-only result (no word data), e.g. for fallbacks"""
+        return cls(text)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.text.strip())
+
+    def word(self, i: int) -> str:
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def box(self, i: int) -> Box:
+        return tuple(self.boxes[i * 4:i * 4 + 4])
+
+    def words(self) -> Iterator[Tuple[str, float, Box]]:
+        """(word, confidence, box) for every recognised word"""
+        for i in range(len(self)):
+            yield self.word(i), self.confidences[i], self.box(i)
+
+    @property
+    def mean_confidence(self) -> float:
+        """Mean word confidence (0-100), 0.0 when no words were recognised"""
+        return sum(self.confidences) / len(self.confidences) if self.confidences else 0.0
+
+    def low_confidence_words(self, threshold: float = 60.0) -> List[str]:
+        return [self.word(i) for i, conf in enumerate(self.confidences) if conf < threshold]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (used by the OCR cache)"""
+        return {
+            "text": self.text,
+            "starts": self.starts.tolist(),
+            "ends": self.ends.tolist(),
+            "confidences": [round(c, 1) for c in self.confidences],
+            "boxes": self.boxes.tolist(),
+            "lines": self.lines.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "OCRResult":
+        if isinstance(data, str):
+            return cls.from_text(data)
+        return cls(
+            data.get("text", ""),
+            array('I', data.get("starts", [])),
+            array('I', data.get("ends", [])),
+            array('f', data.get("confidences", [])),
+            array('I', data.get("boxes", [])),
+            array('I', data.get("lines", []))
+        )
+
+
+class OCRResultBuilder:
+    """Accumulate words line by line into an OCRResult"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._pos = 0
+        self._line = 0
+        self._line_has_words = False
+        self._has_words = False
+        self._pending_break = ""
+        self.result = OCRResult()
+
+    def _append(self, piece: str):
+        self._parts.append(piece)
+        self._pos += len(piece)
+
+    def new_line(self, paragraph: bool = False):
+        """Start a new line (blank line between paragraphs, as image_to_string does)"""
+        if not self._line_has_words:
+            if paragraph and self._has_words:
+                self._pending_break = "\n\n"
+            return
+        self._line += 1
+        self._line_has_words = False
+        self._pending_break = "\n\n" if paragraph else "\n"
+
+    def add_word(self, word: str, confidence: float, box: Box, offset: Tuple[int, int] = (0, 0)):
+        word = word.strip()
+        if not word:
+            return
+
+        if self._line_has_words:
+            self._append(" ")
+        elif self._has_words:
+            self._append(self._pending_break or "\n")
+        self._pending_break = ""
+
+        result = self.result
+        result.starts.append(self._pos)
+        self._append(word)
+        result.ends.append(self._pos)
+        result.confidences.append(max(0.0, float(confidence)))
+        result.boxes.extend((int(box[0]) + offset[0], int(box[1]) + offset[1], int(box[2]), int(box[3])))
+        result.lines.append(self._line)
+
+        self._line_has_words = True
+        self._has_words = True
+
+    def add_result(self, other: OCRResult, offset: Tuple[int, int] = (0, 0)):
+        """Append another result's words (e.g. a crop) on the current line, shifting boxes"""
+        last_line = None
+        for i in range(len(other)):
+            if last_line is not None and other.lines[i] != last_line:
+                self.new_line()
+            self.add_word(other.word(i), other.confidences[i], other.box(i), offset)
+            last_line = other.lines[i]
+
+    def build(self) -> OCRResult:
+        self.result.text = "".join(self._parts)
+        return self.result
+
+
+def result_from_tsv(data: Dict[str, List[Any]]) -> OCRResult:
+    """Build an OCRResult from pytesseract image_to_data(output_type=DICT)"""
+    builder = OCRResultBuilder()
+    current_key = None
+
+    for i, word in enumerate(data.get("text", [])):
+        conf = float(data["conf"][i])
+        if conf < 0 or not str(word).strip():
+            continue
+
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if current_key is not None and key != current_key:
+            builder.new_line(paragraph=key[:2] != current_key[:2])
+        current_key = key
+
+        box = (data["left"][i], data["top"][i], data["width"][i], data["height"][i])
+        builder.add_word(str(word), conf, box)
+
+    return builder.build()
@@ -23,6 +23,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from scoring_engine import document_features, get_scoring_engine
+
 # Setup logging
 Path('lens-data').mkdir(exist_ok=True)
 logging.basicConfig(
@@ -374,35 +376,15 @@ OUTPUT (JSON):
         kathy = all_analysis.get("kathy_analysis", {})
         fraud = all_analysis.get("fraud_analysis", {})
         
-        # Calculate overall pAIt score
-        claudia_scores = claudia.get("pait_scores", {})
-        base_score = claudia_scores.get("total_score", 60)
-        fraud_penalty = fraud.get("fraud_score", 5) * 5  # Reduce score for fraud indicators
-        
-        final_pait_score = max(0, min(100, base_score - fraud_penalty))
-        
-        # Generate recommendation
-        if final_pait_score >= 80:
-            recommendation = "EXCELLENT - Highly recommended for learning"
-            badge = "🏆 Top Quality"
-        elif final_pait_score >= 65:
-            recommendation = "GOOD - Valuable insights with precautions"
-            badge = "✅ Quality Content"
-        elif final_pait_score >= 50:
-            recommendation = "MIXED - Some value, proceed with caution"
-            badge = "⚠️ Proceed Carefully"
-        elif final_pait_score >= 35:
-            recommendation = "RISKY - Educational value limited"
-            badge = "🚨 High Risk"
-        else:
-            recommendation = "AVOID - Likely fraudulent or misleading"
-            badge = "❌ Avoid"
+        # Calculate overall pAIt score: Claudia's total minus a fraud penalty
+        # (weights in the member_review_scoring config section)
+        features = all_analysis.get("features") or self.review_features("", all_analysis)
+        final_pait_score = self.review_pait_score(features)
         
         return {
             "review_id": f"review_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             "pait_score": final_pait_score,
-            "recommendation": recommendation,
-            "badge": badge,
+            **self.review_labels(final_pait_score),
             "best_takeaways": jbot.get("member_value", {}).get("takeaways", [])[:3],
             "key_warnings": fraud.get("member_warnings", [])[:2],
             "frankenstein_potential": claudia.get("frankenstein_enhancements", {}).get("improvements", [])[:2],
@@ -413,6 +395,42 @@ OUTPUT (JSON):
             "member_summary": self._generate_member_summary(jbot, claudia, fraud)
         }
     
+    def review_features(self, content_text: str, all_analysis: Dict) -> Dict[str, Any]:
+        """Scoring inputs: keyword/claim counts plus the parsed agent sub-scores"""
+        jbot = all_analysis.get("jbot_analysis", {})
+        claudia_scores = all_analysis.get("claudia_analysis", {}).get("pait_scores", {})
+        fraud = all_analysis.get("fraud_analysis", {})
+        
+        agent_scores = {
+            "claudia_total_score": claudia_scores.get("total_score", 60),
+            "jbot_educational_score": jbot.get("educational_value", {}).get("score", 5),
+            "fraud_score": fraud.get("fraud_score", 5),
+            "red_flags": len(fraud.get("red_flags", []))
+        }
+        for name in ("strategy_logic", "risk_management", "educational_value", "implementation_clarity"):
+            if name in claudia_scores:
+                agent_scores[f"claudia_{name}"] = claudia_scores[name]
+        
+        return document_features(content_text, agent_scores)
+    
+    def review_pait_score(self, features: Dict[str, Any]):
+        """Member review pAIt score (0-100) from stored features"""
+        profile = get_scoring_engine().profile("member_review_scoring")
+        return profile.overall(profile.category_scores(features))
+    
+    def review_labels(self, pait_score: float) -> Dict[str, str]:
+        """Recommendation and badge for a member review pAIt score"""
+        if pait_score >= 80:
+            return {"recommendation": "EXCELLENT - Highly recommended for learning", "badge": "🏆 Top Quality"}
+        elif pait_score >= 65:
+            return {"recommendation": "GOOD - Valuable insights with precautions", "badge": "✅ Quality Content"}
+        elif pait_score >= 50:
+            return {"recommendation": "MIXED - Some value, proceed with caution", "badge": "⚠️ Proceed Carefully"}
+        elif pait_score >= 35:
+            return {"recommendation": "RISKY - Educational value limited", "badge": "🚨 High Risk"}
+        else:
+            return {"recommendation": "AVOID - Likely fraudulent or misleading", "badge": "❌ Avoid"}
+    
     def _generate_member_summary(self, jbot: Dict, claudia: Dict, fraud: Dict) -> str:
         """Generate a concise summary for members"""
         
@@ -468,6 +486,9 @@ OUTPUT (JSON):
             logger.info("Running fraud detection...")
             results["fraud_analysis"] = self.fraud_detection_check(content_text)
         
+        # Persist scoring inputs so weight changes can re-score without re-querying the models
+        results["features"] = self.review_features(content_text, results)
+        
         # Generate member review
         results["member_review"] = self.generate_member_review(results)
         
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+🧮 Archive Rescorer - Batch re-scoring of stored analyses
+Re-applies the current scoring config to every saved analysis without
+re-running OCR or the analyzers
+
+Each scoring profile (see scoring_engine.py) is compiled to matrices and
+a whole archive is scored at once:
+
+    X  = term counts, N docs × T terms (one keyword scan per doc, sparse)
+    G  = (X > 0) @ M                  M: T × groups incidence
+    G' = min(G or feature column, cap)
+    C  = clip(base + G' · points)     N × categories
+    overall = clip(scale · Σ weight_c · C[:, c])
+
+then only documents whose scores changed are written back (atomically).
+
+Archives:
+- youtube:    lens-data/youtube-analysis     (pait_scoring on stored features)
+- screenshot: lens-data/screenshot_analysis  (screenshot_scoring on content_analyzed
+              plus features from the stored sub-analyses)
+- visual:     lens-data/visual_analysis      (visual_scoring weights over stored components)
+- ollama:     lens-data/ollama_analysis      (member_review_scoring on stored features,
+              agent sub-scores included - no model calls)
+
+Analyses saved with a current feature vector (scoring_engine.document_features,
+version FEATURES_VERSION) are scored from it. Older YouTube analyses, and
+ones whose vector predates the current version, fall back to textContent,
+which only keeps the first 500 characters of OCR text; ones at that cap
+are skipped unless --allow-truncated is given. Older Ollama analyses
+have nothing to re-score from and are skipped.
+
+Usage:
+    python rescore_archive.py --dry-run
+    python rescore_archive.py --archive youtube screenshot
+    python rescore_archive.py --since 2025-08-18      # Only analyses from that date on
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+sys.path.append(str(Path(__file__).resolve().parent / "backend"))
+
+from keyword_matcher import shared_matcher
+from scoring_engine import FEATURES_VERSION, ScoringProfile, camel_case, document_features, get_scoring_engine
+
+ARCHIVE_DIRS = {
+    "youtube": "youtube-analysis",
+    "screenshot": "screenshot_analysis",
+    "visual": "visual_analysis",
+    "ollama": "ollama_analysis"
+}
+
+# Analysis date field of each archive, used by --since
+DATE_FIELDS = {
+    "youtube": "timestamp",
+    "screenshot": "analysis_timestamp",
+    "visual": "analysis_date",
+    "ollama": "analysis_date"
+}
+
+TEXT_CONTENT_LIMIT = 500  # youtube_analysis_service stores textContent[:500]
+
+
+class BatchScorer:
+    """A scoring profile compiled to NumPy arrays for whole-archive scoring"""
+
+    def __init__(self, profile: ScoringProfile):
+        self.profile = profile
+        self.term_index = {term: i for i, term in enumerate(profile.terms)}
+        groups = len(profile.group_points)
+
+        # Term -> group incidence (the sparse T × G matrix)
+        rows, cols = [], []
+        for term, term_groups in profile.term_groups.items():
+            for group in term_groups:
+                rows.append(self.term_index[term])
+                cols.append(group)
+        shape = (len(profile.terms), groups)
+        if SCIPY_AVAILABLE:
+            self.incidence = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+        else:
+            self.incidence = np.zeros(shape)
+            self.incidence[rows, cols] = 1
+
+        self.caps = np.array([np.inf if cap is None else cap for cap in profile.group_caps], dtype=float)
+        self.group_column = [profile.categories.index(category) for category in profile.group_category]
+        bounds = [profile.bounds[category] for category in profile.categories]
+        self.base = np.array([base for base, _, _ in bounds], dtype=float)
+        self.low = np.array([-np.inf if low is None else low for _, low, _ in bounds], dtype=float)
+        self.high = np.array([np.inf if high is None else high for _, _, high in bounds], dtype=float)
+
+        # Categories whose rules are all whole numbers score as ints, like ScoringProfile does
+        self.integral = {}
+        for column, category in enumerate(profile.categories):
+            numbers = [value for value in bounds[column] if value is not None]
+            numbers += [points for group, points in enumerate(profile.group_points) if self.group_column[group] == column]
+            self.integral[category] = all(isinstance(value, int) for value in numbers)
+
+    def term_matrix(self, texts: List[str]):
+        """N × T term counts from one keyword scan per document"""
+        matcher = shared_matcher()
+        return self.count_matrix({term: len(positions) for term, positions in matcher.scan(text or "").offsets.items()}
+                                 for text in texts)
+
+    def count_matrix(self, term_counts: Iterable[Dict[str, int]]):
+        """N × T term counts from stored per-document hit counts"""
+        rows, cols, counts = [], [], []
+        row = -1
+        for row, hits in enumerate(term_counts):
+            for term, count in hits.items():
+                column = self.term_index.get(term)
+                if column is not None and count:
+                    rows.append(row)
+                    cols.append(column)
+                    counts.append(count)
+
+        shape = (row + 1, len(self.term_index))
+        if SCIPY_AVAILABLE:
+            return sparse.csr_matrix((counts, (rows, cols)), shape=shape)
+        matrix = np.zeros(shape)
+        matrix[rows, cols] = counts
+        return matrix
+
+    def category_scores(self, term_counts, features: Optional[Dict[str, "np.ndarray"]] = None) -> "np.ndarray":
+        """N × categories, same rules as ScoringProfile.category_scores"""
+        profile = self.profile
+        presence = (term_counts > 0).astype(float)
+        group_counts = presence @ self.incidence
+        if SCIPY_AVAILABLE:
+            group_counts = group_counts.toarray() if sparse.issparse(group_counts) else np.asarray(group_counts)
+
+        features = features or {}
+        word_count = features.get("word_count")
+        for group, feature in enumerate(profile.group_feature):
+            if feature is None:
+                continue
+            values = word_count if feature == "word_count" else features.get(feature)
+            column = np.zeros(group_counts.shape[0]) if values is None else np.asarray(values, dtype=float)
+            if profile.group_per[group] != 1:
+                column = column // profile.group_per[group]
+            group_counts[:, group] = column
+        group_counts = np.minimum(group_counts, self.caps)
+
+        # Accumulate group by group so float sums match the per-document order
+        scores = np.tile(self.base, (group_counts.shape[0], 1))
+        for group, column in enumerate(self.group_column):
+            scores[:, column] += profile.group_points[group] * group_counts[:, group]
+        return np.clip(scores, self.low, self.high)
+
+    def score_features(self, rows: List[Dict[str, Any]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Category and overall scores from stored feature vectors (document_features)"""
+        names = {feature for feature in self.profile.group_feature if feature is not None}
+        features = {name: [row.get(name, 0) for row in rows] for name in names}
+        categories = self.category_scores(self.count_matrix(row.get("terms", {}) for row in rows), features)
+        return categories, self.overall(categories)
+
+    def overall(self, category_scores: "np.ndarray") -> "np.ndarray":
+        """Weighted category sum, scaled and clipped to score_range"""
+        profile = self.profile
+        total = np.zeros(category_scores.shape[0])
+        for column, category in enumerate(profile.categories):
+            total = total + category_scores[:, column] * profile.weights[category] * profile.scale
+        low, high = profile.score_range
+        return np.clip(total, -np.inf if low is None else low, np.inf if high is None else high)
+
+    def category_dicts(self, category_scores: "np.ndarray") -> List[Dict[str, float]]:
+        categories = self.profile.categories
+        return [
+            {category: int(value) if self.integral[category] else float(value)
+             for category, value in zip(categories, row)}
+            for row in category_scores.tolist()
+        ]
+
+
+def load_archive(directory: Path, date_field: str, since: Optional[str] = None) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Stored analyses, optionally only those dated on or after `since` (ISO date)"""
+    since_epoch = datetime.fromisoformat(since).timestamp() if since else None
+    documents = []
+    for path in sorted(directory.glob("*.json")):
+        # Files older than `since` can't hold newer analyses - skip without parsing
+        if since_epoch is not None and path.stat().st_mtime < since_epoch:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping {path.name}: {e}")
+            continue
+        if not isinstance(document, dict):
+            continue
+        if since and str(document.get(date_field) or datetime.fromtimestamp(path.stat().st_mtime).isoformat()) < since:
+            continue
+        documents.append((path, document))
+    return documents
+
+
+def write_atomic(path: Path, document: Dict[str, Any], ensure_ascii: bool):
+    """Write to a temp file in the same directory, then rename over the original"""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=ensure_ascii)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def current_features(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The stored feature vector, or None if missing or from an older FEATURES_VERSION"""
+    features = document.get("features")
+    if isinstance(features, dict) and features.get("version") == FEATURES_VERSION:
+        return features
+    return None
+
+
+def report_stale(documents: List[Tuple[Path, Dict]], kept: List[Tuple[Path, Dict]], archive: str):
+    """Say how many stale feature vectors had nothing to be recomputed from"""
+    kept_paths = {path for path, _ in kept}
+    skipped = [path for path, doc in documents
+               if path not in kept_paths and "features" in doc and current_features(doc) is None]
+    if skipped:
+        print(f"⚠️ Skipping {len(skipped)} {archive} analyses with stale features "
+              f"(need version {FEATURES_VERSION}, no text to recompute from)")
+
+
+def rescore_youtube(documents: List[Tuple[Path, Dict]], allow_truncated: bool = False) -> List[Tuple[Path, Dict]]:
+    """New paitScores/profitabilityGrade for YouTube analyses; returns changed documents"""
+    from youtube_analysis_service import YouTubeAnalysisService
+
+    # Stale feature vectors are recomputed from textContent like pre-features analyses
+    usable = [(path, doc) for path, doc in documents if "paitScores" in doc and (
+        current_features(doc) or "textContent" in doc and (allow_truncated or len(doc["textContent"]) < TEXT_CONTENT_LIMIT))]
+    report_stale(documents, usable, "youtube")
+    documents = usable
+    if not documents:
+        return []
+
+    scorer = BatchScorer(get_scoring_engine().profile("pait_scoring"))
+    rows = [current_features(doc) or document_features(doc["textContent"], terms=scorer.profile.terms)
+            for _, doc in documents]
+    categories, overall = scorer.score_features(rows)
+    service = YouTubeAnalysisService()
+
+    changed = []
+    for (path, doc), scores, total in zip(documents, scorer.category_dicts(categories), overall.tolist()):
+        pait_scores = {**{camel_case(name): value for name, value in scores.items()}, "overallScore": int(total)}
+        if pait_scores == doc["paitScores"]:
+            continue
+        doc["paitScores"] = pait_scores
+        doc["profitabilityGrade"] = service.determine_profitability_grade(pait_scores["overallScore"])
+        doc["rescoredAt"] = datetime.now().isoformat()
+        changed.append((path, doc))
+    return changed
+
+
+def rescore_screenshot(documents: List[Tuple[Path, Dict]], base_dir: str) -> List[Tuple[Path, Dict]]:
+    """New pait_components/final_assessment for screenshot analyses; returns changed documents"""
+    from screenshot_analyzer_local import ScreenshotAnalyzer
+
+    documents = [(path, doc) for path, doc in documents if "pait_components" in doc and "content_analyzed" in doc]
+    if not documents:
+        return []
+
+    analyzer = ScreenshotAnalyzer(base_dir)
+    scorer = BatchScorer(get_scoring_engine().profile("screenshot_scoring"))
+    rows = [document_features(doc["content_analyzed"], analyzer.pait_features(
+                doc["profit_analysis"], doc["strategy_analysis"], doc["educational_analysis"]), scorer.profile.terms)
+            for _, doc in documents]
+    categories, overall = scorer.score_features(rows)
+
+    changed = []
+    for (path, doc), scores, total in zip(documents, scorer.category_dicts(categories), overall.tolist()):
+        components = {**scores, "total_pait_score": total}
+        if components == doc["pait_components"]:
+            continue
+        doc["pait_components"] = components
+        doc.setdefault("final_assessment", {}).update({"pait_score": total, **analyzer.assessment_labels(total)})
+        doc["member_summary"] = analyzer._generate_member_summary(total, doc["strategy_analysis"],
+                                                                  doc["educational_analysis"])
+        doc["rescored_at"] = datetime.now().isoformat()
+        changed.append((path, doc))
+    return changed
+
+
+def rescore_visual(documents: List[Tuple[Path, Dict]], base_dir: str) -> List[Tuple[Path, Dict]]:
+    """New overall_pait_score/recommendation for visual analyses; returns changed documents"""
+    from visual_analyzer import VisualContentAnalyzer
+
+    profile = get_scoring_engine().profile("visual_scoring")
+    documents = [(path, doc) for path, doc in documents
+                 if all(name in doc.get("pait_analysis", {}).get("components", {}) for name in profile.categories)]
+    if not documents:
+        return []
+
+    analyzer = VisualContentAnalyzer(base_dir)
+    scorer = BatchScorer(profile)
+    components = np.array([[doc["pait_analysis"]["components"][name]["score"] for name in profile.categories]
+                           for _, doc in documents], dtype=float)
+    overall = np.round(scorer.overall(components), 2)
+
+    changed = []
+    for (path, doc), total in zip(documents, overall.tolist()):
+        pait_analysis = doc["pait_analysis"]
+        if total == pait_analysis.get("overall_pait_score"):
+            continue
+        pait_analysis["overall_pait_score"] = total
+        pait_analysis["recommendation"] = analyzer.pait_recommendation(total)
+        doc["rescored_at"] = datetime.now().isoformat()
+        changed.append((path, doc))
+    return changed
+
+
+def rescore_ollama(documents: List[Tuple[Path, Dict]], base_dir: str) -> List[Tuple[Path, Dict]]:
+    """New member review scores for Ollama analyses (and their member_reviews copies)"""
+    from ollama_video_analyzer import OllamaVideoAnalyzer
+
+    # No transcript is stored with the review, so stale feature vectors can't be recomputed
+    usable = [(path, doc) for path, doc in documents if current_features(doc) and "member_review" in doc]
+    report_stale(documents, usable, "ollama")
+    documents = usable
+    if not documents:
+        return []
+
+    analyzer = OllamaVideoAnalyzer(base_dir)
+    scorer = BatchScorer(get_scoring_engine().profile("member_review_scoring"))
+    _, overall = scorer.score_features([doc["features"] for _, doc in documents])
+    integral = all(scorer.integral.values()) and all(isinstance(weight, int) for weight in scorer.profile.weights.values())
+
+    changed = []
+    for (path, doc), total in zip(documents, overall.tolist()):
+        total = int(total) if integral and float(total).is_integer() else total
+        review = doc["member_review"]
+        if total == review.get("pait_score"):
+            continue
+        review.update({"pait_score": total, **analyzer.review_labels(total)})
+        doc["rescored_at"] = datetime.now().isoformat()
+        changed.append((path, doc))
+
+        review_path = analyzer.reviews_dir / f"{review['review_id']}_member_review.json"
+        if review_path.exists():
+            changed.append((review_path, review))
+    return changed
+
+
+def rescore_archive(archive: str, base_dir: str = "lens-data", dry_run: bool = False,
+                    allow_truncated: bool = False, since: Optional[str] = None) -> Dict[str, Any]:
+    """Rescore one archive directory; returns a summary"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for batch re-scoring (pip install numpy)")
+
+    directory = Path(base_dir) / ARCHIVE_DIRS[archive]
+    start = time.perf_counter()
+    documents = load_archive(directory, DATE_FIELDS[archive], since) if directory.exists() else []
+    loaded = time.perf_counter()
+
+    if archive == "youtube":
+        changed = rescore_youtube(documents, allow_truncated)
+    elif archive == "screenshot":
+        changed = rescore_screenshot(documents, base_dir)
+    elif archive == "visual":
+        changed = rescore_visual(documents, base_dir)
+    else:
+        changed = rescore_ollama(documents, base_dir)
+    scored = time.perf_counter()
+
+    if not dry_run:
+        ensure_ascii = archive == "youtube"  # Match each analyzer's own json.dump settings
+        for path, document in changed:
+            write_atomic(path, document, ensure_ascii)
+
+    return {
+        "archive": archive,
+        "documents": len(documents),
+        "changed": len({path for path, _ in changed if path.parent == directory}),
+        "written": 0 if dry_run else len(changed),
+        "load_seconds": loaded - start,
+        "score_seconds": scored - loaded,
+        "write_seconds": time.perf_counter() - scored
+    }
+
+
+def main():
+    """CLI interface for batch re-scoring"""
+    parser = argparse.ArgumentParser(description="🧮 Archive Rescorer - apply the current scoring config to saved analyses")
+    parser.add_argument('--archive', nargs='+', choices=sorted(ARCHIVE_DIRS), default=sorted(ARCHIVE_DIRS),
+                        help='Archives to rescore (default: all)')
+    parser.add_argument('--data-dir', default='lens-data', help='Data directory (default: lens-data)')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing files')
+    parser.add_argument('--allow-truncated', action='store_true',
+                        help='Also rescore YouTube analyses whose stored text hit the 500-char cap')
+    parser.add_argument('--since', help='Only analyses dated on or after this ISO date (e.g. 2025-08-18)')
+
+    args = parser.parse_args()
+
+    if args.since:
+        try:
+            datetime.fromisoformat(args.since)
+        except ValueError:
+            parser.error(f"--since expects an ISO date, got {args.since!r}")
+
+    print(f"\n🧮 ARCHIVE RESCORE{' (dry run)' if args.dry_run else ''}")
+    print("=" * 60)
+    print(f"{'archive':<12}{'docs':>8}{'changed':>9}{'load s':>9}{'score s':>9}{'write s':>9}")
+    for archive in args.archive:
+        summary = rescore_archive(archive, args.data_dir, args.dry_run, args.allow_truncated, args.since)
+        print(f"{archive:<12}{summary['documents']:>8}{summary['changed']:>9}"
+              f"{summary['load_seconds']:>9.2f}{summary['score_seconds']:>9.2f}{summary['write_seconds']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+🧮 Scoring Engine - Config-driven pAIt scoring
+Rules and weights live in backend/youtube_analysis_config.json, not in code
+
+Each scoring profile (pait_scoring, screenshot_scoring, visual_scoring)
+is compiled once into:
+- a sparse term -> rule-group incidence map (the term/category matrix)
+- per-group points and caps, per-category base/min/max bounds
+- category weights, score scale and overall score range
+
+Scoring a document is then one keyword scan (keyword_matcher, shared
+with every other scorer) followed by a sparse dot product:
+
+    group_count[g] = Σ_t present(t) · M[t, g]        (capped per group)
+    category[c]    = clamp(base_c + Σ_g points_g · group_count[g])
+    overall        = clamp(scale · Σ_c weight_c · category[c])
+
+Groups can also read numeric features instead of terms: `word_count` is
+built in, anything else is supplied by the caller (e.g. red-flag counts).
+
+The inputs are persisted with each saved analysis (document_features:
+keyword hit counts, word/claim counts, agent sub-scores), so archives can
+be re-scored after a weight change without re-running OCR or the LLM
+agents (see rescore_archive.py).
+
+The config file is re-read when its mtime changes (checked at most every
+couple of seconds), so weights and rules can be tuned without a restart.
+
+Usage:
+    from scoring_engine import get_scoring_engine
+    profile = get_scoring_engine().profile("pait_scoring")
+    result = profile.score(text)   # {"categories": {...}, "overall": 612.0}
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from claim_patterns import count_claims
+from keyword_matcher import register_vocabulary, scan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / "backend" / "youtube_analysis_config.json"
+RELOAD_INTERVAL = 2.0  # Seconds between config mtime checks
+
+FEATURES_VERSION = 2  # 2: claim_count from claim_patterns.count_claims
+
+
+def camel_case(name: str) -> str:
+    """technical_accuracy -> technicalAccuracy (the YouTube result keys)"""
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+def document_features(text: str, features: Optional[Dict[str, Any]] = None,
+                      terms: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Persistable scoring inputs for one document
+
+    Hit counts cover every rule term of every profile (or the given
+    terms), so any profile can later be re-scored from them.
+    """
+    if terms is None:
+        terms = get_scoring_engine().terms
+    hits = scan(text or "")
+    return {
+        "version": FEATURES_VERSION,
+        "terms": {term: len(hits.offsets[term]) for term in terms if term in hits.offsets},
+        "word_count": len((text or "").split()),
+        "claim_count": count_claims(text or ""),
+        **(features or {})
+    }
+
+
+def _clamp(value, low, high):
+    if low is not None:
+        value = max(low, value)
+    if high is not None:
+        value = min(high, value)
+    return value
+
+
+class ScoringProfile:
+    """One compiled scoring section of the config"""
+
+    def __init__(self, name: str, section: Dict[str, Any]):
+        self.name = name
+        self.weights: Dict[str, float] = dict(section.get("categories", {}))
+        self.categories: List[str] = list(self.weights)
+        self.scale = section.get("score_scale", 1)
+        self.score_range = tuple(section.get("score_range", (None, None)))
+
+        rules = section.get("rules", {})
+        self.bounds: Dict[str, tuple] = {}
+        self.group_category: List[str] = []
+        self.group_points: List[float] = []
+        self.group_caps: List[Optional[float]] = []
+        self.group_feature: List[Optional[str]] = []
+        self.group_per: List[int] = []
+        self.term_groups: Dict[str, List[int]] = {}  # Sparse term -> group incidence
+
+        for category in self.categories:
+            rule = rules.get(category, {})
+            self.bounds[category] = (rule.get("base", 0), rule.get("min"), rule.get("max"))
+
+            for group in rule.get("groups", []):
+                index = len(self.group_points)
+                self.group_category.append(category)
+                self.group_points.append(group.get("points", 1))
+                self.group_caps.append(group.get("cap"))
+                self.group_feature.append(group.get("feature"))
+                self.group_per.append(group.get("per", 1))
+                for term in group.get("terms", []):
+                    self.term_groups.setdefault(term.lower(), []).append(index)
+
+        self.terms: List[str] = sorted(self.term_groups)
+        register_vocabulary(self.terms)
+
+    def extract_features(self, text: str, features: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Per-document features: term hit counts, word/claim counts and caller-supplied values"""
+        return document_features(text, features, self.terms)
+
+    def category_scores(self, features: Dict[str, Any]) -> Dict[str, float]:
+        """Sparse dot product of present terms with the term/group map, then bounds"""
+        counts = [0] * len(self.group_points)
+        for term, hit_count in features.get("terms", {}).items():
+            if hit_count:
+                for group in self.term_groups.get(term, ()):
+                    counts[group] += 1
+
+        scores = {category: self.bounds[category][0] for category in self.categories}
+        for group, category in enumerate(self.group_category):
+            feature = self.group_feature[group]
+            if feature is None:
+                count = counts[group]
+            else:
+                count = features.get(feature, 0)
+                if self.group_per[group] != 1:
+                    count //= self.group_per[group]
+            cap = self.group_caps[group]
+            if cap is not None:
+                count = min(count, cap)
+            scores[category] += self.group_points[group] * count
+
+        for category, (_, low, high) in self.bounds.items():
+            scores[category] = _clamp(scores[category], low, high)
+        return scores
+
+    def overall(self, category_scores: Dict[str, float]) -> float:
+        """Weighted category sum, scaled and clamped to score_range"""
+        total = sum(category_scores[category] * weight * self.scale for category, weight in self.weights.items())
+        return _clamp(total, *self.score_range)
+
+    def score(self, text: str = "", features: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Category scores and overall score for one document"""
+        categories = self.category_scores(self.extract_features(text, features))
+        return {"categories": categories, "overall": self.overall(categories)}
+
+
+class ScoringEngine:
+    """Compiled scoring profiles, hot-reloaded from the config file"""
+
+    def __init__(self, config_path: Optional[str] = None, reload_interval: float = RELOAD_INTERVAL):
+        self.config_path = Path(config_path or os.environ.get("LENS_SCORING_CONFIG", DEFAULT_CONFIG_PATH))
+        self.reload_interval = reload_interval
+        self._profiles: Dict[str, ScoringProfile] = {}
+        self.terms: List[str] = []  # Rule terms of all profiles
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Re-read and recompile the config; keeps the previous rules if it is invalid"""
+        try:
+            mtime = self.config_path.stat().st_mtime
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            profiles = {name: ScoringProfile(name, section) for name, section in config.items()
+                        if isinstance(section, dict) and "categories" in section}
+        except Exception as e:
+            logger.warning(f"Scoring config not reloaded ({self.config_path}): {e}")
+            return False
+
+        with self._lock:
+            self._profiles = profiles
+            self.terms = sorted({term for profile in profiles.values() for term in profile.terms})
+            self._mtime = mtime
+        logger.info(f"Scoring config loaded: {', '.join(profiles)}")
+        return True
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        try:
+            mtime = self.config_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def profile(self, name: str) -> ScoringProfile:
+        """Current compiled profile (picks up config edits)"""
+        self._maybe_reload()
+        with self._lock:
+            return self._profiles[name]
+
+
+_engine: Optional[ScoringEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_scoring_engine() -> ScoringEngine:
+    """Process-wide shared scoring engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ScoringEngine()
+        return _engine
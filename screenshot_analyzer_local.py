@@ -10,15 +10,24 @@ This works NOW with your existing setup:
 """
 
 import cv2
-import pytesseract
-from PIL import Image
 import requests
 import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
-import re
+
+from ocr_engine import get_engine
+from ocr_result import OCRResult
+from keyword_matcher import register_vocabulary, scan
+from claim_patterns import extract_claims
+from scoring_engine import get_scoring_engine
+
+# Strategy vocabularies (matched in one shared scan, see keyword_matcher.py)
+PLATFORMS = register_vocabulary(["pocket option", "iq option", "binomo", "olymp trade", "binance", "mt4", "mt5"])
+TOOLS = register_vocabulary(["bot", "signal", "indicator", "algorithm", "ai", "automated"])
+INDICATORS = register_vocabulary(["rsi", "macd", "bollinger", "moving average", "support", "resistance"])
+register_vocabulary(["binary", "forex", "crypto", "telegram"])
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -43,42 +52,33 @@ class ScreenshotAnalyzer:
     
     def extract_text_from_screenshot(self, image_path: str) -> str:
         """Extract text using OCR"""
+        return self.extract_ocr_result(image_path).text.strip()
+    
+    def extract_ocr_result(self, image_path: str) -> OCRResult:
+        """Text plus per-word confidences and boxes from a single OCR pass"""
         try:
             # Load image
             image = cv2.imread(image_path)
             if image is None:
-                return ""
+                return OCRResult()
             
             # Convert to RGB
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(image_rgb)
             
-            # OCR extraction
-            text = pytesseract.image_to_string(pil_image, config='--psm 6')
-            return text.strip()
+            # OCR extraction (shared warm worker pool, trading vocabulary profile)
+            return get_engine().recognize(image_rgb, config='--psm 6', profile='trading')
             
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
-            return ""
+            return OCRResult()
     
     def analyze_profit_claims(self, text: str) -> Dict[str, Any]:
         """Analyze profit claims in the content"""
         
-        # Extract monetary amounts
-        money_pattern = r'\$[\d,]+(?:\.\d{2})?'
-        amounts = re.findall(money_pattern, text)
-        
-        # Extract time periods
-        time_patterns = [
-            r'(\d+)\s*(hour|hr|minute|min|day|week|month)s?',
-            r'in\s+(\d+)\s*(hour|hr|minute|min|day|week|month)s?',
-            r'just\s+(\d+)\s*(hour|hr|minute|min|day|week|month)s?'
-        ]
-        
-        time_claims = []
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text.lower())
-            time_claims.extend(matches)
+        # Money amounts and time periods in one OCR-tolerant pass (see claim_patterns.py)
+        claims = extract_claims(text)
+        amounts = claims["amounts"]
+        time_claims = claims["time_claims"]
         
         # Calculate realism score
         realism_score = 10  # Start optimistic
@@ -89,7 +89,7 @@ class ScreenshotAnalyzer:
             realism_score -= 4
             red_flags.append("Hourly profit claims")
         
-        if "99%" in text or "100%" in text:
+        if "99%" in text or "100%" in text or {"99", "100"} & set(claims["percentages"]):
             realism_score -= 3
             red_flags.append("Unrealistic success rates")
         
@@ -107,24 +107,19 @@ class ScreenshotAnalyzer:
     def analyze_strategy_elements(self, text: str) -> Dict[str, Any]:
         """Identify trading strategies and tools"""
         
-        # Common trading platforms
-        platforms = ["pocket option", "iq option", "binomo", "olymp trade", "binance", "mt4", "mt5"]
-        found_platforms = [p for p in platforms if p.lower() in text.lower()]
+        hits = scan(text)
         
-        # Trading tools/bots
-        tools = ["bot", "signal", "indicator", "algorithm", "ai", "automated"]
-        found_tools = [t for t in tools if t.lower() in text.lower()]
-        
-        # Technical indicators
-        indicators = ["rsi", "macd", "bollinger", "moving average", "support", "resistance"]
-        found_indicators = [i for i in indicators if i.lower() in text.lower()]
+        # Common trading platforms, tools/bots and technical indicators
+        found_platforms = hits.found(PLATFORMS)
+        found_tools = hits.found(TOOLS)
+        found_indicators = hits.found(INDICATORS)
         
         # Strategy types
-        if "binary" in text.lower():
+        if "binary" in hits:
             strategy_type = "Binary Options"
-        elif "forex" in text.lower():
+        elif "forex" in hits:
             strategy_type = "Forex"
-        elif "crypto" in text.lower():
+        elif "crypto" in hits:
             strategy_type = "Cryptocurrency"
         else:
             strategy_type = "General Trading"
@@ -134,8 +129,8 @@ class ScreenshotAnalyzer:
             "platforms": found_platforms,
             "tools": found_tools,
             "indicators": found_indicators,
-            "mentions_bot": "bot" in text.lower(),
-            "mentions_telegram": "telegram" in text.lower()
+            "mentions_bot": "bot" in hits,
+            "mentions_telegram": "telegram" in hits
         }
     
     def assess_educational_value(self, text: str) -> Dict[str, Any]:
@@ -180,50 +175,26 @@ class ScreenshotAnalyzer:
     
     def calculate_pait_components(self, text: str, profit_analysis: Dict, 
                                  strategy_analysis: Dict, educational_analysis: Dict) -> Dict[str, Any]:
-        """Calculate pAIt component scores"""
+        """Calculate pAIt component scores (rules in the screenshot_scoring config section)"""
         
-        # Strategy Logic (0-25)
-        strategy_logic = 15  # Base score
-        if strategy_analysis["indicators"]:
-            strategy_logic += 5
-        if strategy_analysis["strategy_type"] != "General Trading":
-            strategy_logic += 3
-        if profit_analysis["realism_score"] > 7:
-            strategy_logic += 2
-        strategy_logic = min(25, strategy_logic)
-        
-        # Risk Transparency (0-25)
-        risk_transparency = 10  # Base score
-        if "risk" in text.lower():
-            risk_transparency += 8
-        if "loss" in text.lower():
-            risk_transparency += 5
-        if profit_analysis["red_flags"]:
-            risk_transparency = max(5, risk_transparency - len(profit_analysis["red_flags"]) * 3)
-        risk_transparency = min(25, risk_transparency)
-        
-        # Proof Quality (0-25)
-        proof_quality = 12  # Base score
-        if "screenshot" in text.lower() or "proof" in text.lower():
-            proof_quality += 6
-        if "result" in text.lower():
-            proof_quality += 4
-        if profit_analysis["realism_score"] < 6:
-            proof_quality -= 8
-        proof_quality = max(0, min(25, proof_quality))
-        
-        # Educational Merit (0-25)
-        educational_merit = educational_analysis["score"] * 2.5  # Convert 0-10 to 0-25
-        educational_merit = min(25, educational_merit)
-        
-        total_score = strategy_logic + risk_transparency + proof_quality + educational_merit
+        features = self.pait_features(profit_analysis, strategy_analysis, educational_analysis)
+        result = get_scoring_engine().profile("screenshot_scoring").score(text, features)
         
         return {
-            "strategy_logic": strategy_logic,
-            "risk_transparency": risk_transparency,
-            "proof_quality": proof_quality,
-            "educational_merit": educational_merit,
-            "total_pait_score": total_score
+            **result["categories"],  # strategy_logic, risk_transparency, proof_quality, educational_merit (0-25 each)
+            "total_pait_score": result["overall"]
+        }
+    
+    def pait_features(self, profit_analysis: Dict, strategy_analysis: Dict,
+                      educational_analysis: Dict) -> Dict[str, Any]:
+        """Non-text scoring features from the sub-analyses"""
+        return {
+            "has_indicators": int(bool(strategy_analysis["indicators"])),
+            "specific_strategy": int(strategy_analysis["strategy_type"] != "General Trading"),
+            "realistic_claims": int(profit_analysis["realism_score"] > 7),
+            "unrealistic_claims": int(profit_analysis["realism_score"] < 6),
+            "red_flags": len(profit_analysis["red_flags"]),
+            "educational_score": educational_analysis["score"]
         }
     
     def generate_frankenstein_recommendations(self, strategy_analysis: Dict, 
@@ -283,23 +254,6 @@ class ScreenshotAnalyzer:
         # Final assessment
         total_score = pait_components["total_pait_score"]
         
-        if total_score >= 80:
-            recommendation = "EXCELLENT - Highly recommended"
-            badge = "🏆 Top Quality"
-            risk_level = "LOW"
-        elif total_score >= 65:
-            recommendation = "GOOD - Valuable with precautions"
-            badge = "✅ Quality Content"
-            risk_level = "MEDIUM"
-        elif total_score >= 50:
-            recommendation = "MIXED - Proceed carefully"
-            badge = "⚠️ Caution Advised"
-            risk_level = "HIGH"
-        else:
-            recommendation = "RISKY - Avoid or educational only"
-            badge = "🚨 High Risk"
-            risk_level = "VERY HIGH"
-        
         # Compile results
         analysis_results = {
             "content_analyzed": content_text,
@@ -312,9 +266,8 @@ class ScreenshotAnalyzer:
             "frankenstein_recommendations": frankenstein_recs,
             "final_assessment": {
                 "pait_score": total_score,
-                "recommendation": recommendation,
-                "badge": badge,
-                "risk_level": risk_level
+                **self.assessment_labels(total_score),
+                "ocr_confidence": metadata.get("ocr_confidence")  # Mean word confidence when OCR'd
             },
             "member_summary": self._generate_member_summary(
                 total_score, strategy_analysis, educational_analysis
@@ -326,6 +279,17 @@ class ScreenshotAnalyzer:
         
         return analysis_results
     
+    def assessment_labels(self, total_score: float) -> Dict[str, str]:
+        """Recommendation, badge and risk level for a total pAIt score"""
+        if total_score >= 80:
+            return {"recommendation": "EXCELLENT - Highly recommended", "badge": "🏆 Top Quality", "risk_level": "LOW"}
+        elif total_score >= 65:
+            return {"recommendation": "GOOD - Valuable with precautions", "badge": "✅ Quality Content", "risk_level": "MEDIUM"}
+        elif total_score >= 50:
+            return {"recommendation": "MIXED - Proceed carefully", "badge": "⚠️ Caution Advised", "risk_level": "HIGH"}
+        else:
+            return {"recommendation": "RISKY - Avoid or educational only", "badge": "🚨 High Risk", "risk_level": "VERY HIGH"}
+    
     def _generate_member_summary(self, score: int, strategy_analysis: Dict, 
                                educational_analysis: Dict) -> str:
         """Generate member-friendly summary"""
@@ -414,12 +378,18 @@ def main():
         
     elif args.image:
         # Extract text from image
-        text = analyzer.extract_text_from_screenshot(args.image)
+        ocr_result = analyzer.extract_ocr_result(args.image)
+        text = ocr_result.text.strip()
         if not text:
             print("❌ Could not extract text from image")
             return
         
-        results = analyzer.analyze_screenshot_content(text)
+        results = analyzer.analyze_screenshot_content(text, {
+            "source": args.image,
+            "timestamp": datetime.now().isoformat(),
+            "ocr_confidence": round(ocr_result.mean_confidence, 1),
+            "ocr_word_count": len(ocr_result)
+        })
         
     elif args.text:
         # Analyze provided text
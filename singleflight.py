@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+🛫 Single Flight - Coalesce concurrent identical analyses
+When a screenshot goes viral, dozens of members upload the same bytes
+within seconds. While an analysis for a content hash is in flight, later
+callers attach to it and get the same result (or the same exception)
+instead of running OCR and the H100 call again.
+
+- SingleFlight.do(key, fn, ...): thread-based, for the Flask apps
+- SingleFlight.do_async(key, coro_fn, ...): asyncio-based, for the ASGI
+  service (the shared task survives a cancelled caller while others still
+  wait on it, and is cancelled when the last one leaves)
+- do_with_progress: like do, and every caller's progress callback sees
+  the shared run's stage events (late joiners get a replay)
+
+Only in-flight work is shared; nothing is cached once it finishes (the
+OCR cache covers that). Counters in the metrics registry:
+
+    lens_singleflight_calls_total{group, role="leader"|"follower"}
+    lens_singleflight_saved_seconds_total{group}
+
+Usage:
+    from singleflight import SingleFlight, content_key
+    flights = SingleFlight("analyze")
+    result = flights.do(content_key(image_data), analyze_upload, image_data, filename)
+"""
+
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from metrics import get_registry
+
+CALLS = get_registry().counter(
+    "lens_singleflight_calls_total", "Analyses started (leader) or joined in flight (follower)", ("group", "role"))
+SAVED_SECONDS = get_registry().counter(
+    "lens_singleflight_saved_seconds_total", "Analysis seconds avoided by joining an in-flight run", ("group",))
+
+
+def content_key(data: bytes) -> str:
+    """Content hash of an upload (same bytes, same key)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProgressRelay:
+    """Fans one run's progress(stage, details) calls out to every caller sharing it"""
+
+    def __init__(self):
+        self._events: List[Tuple[str, Any]] = []
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable):
+        """Add a listener, replaying the stages it missed"""
+        with self._lock:
+            for stage, details in self._events:
+                listener(stage, details)
+            self._listeners.append(listener)
+
+    def __call__(self, stage: str, details: Any):
+        with self._lock:
+            self._events.append((stage, details))
+            for listener in self._listeners:
+                listener(stage, details)
+
+
+class _Flight:
+    def __init__(self, future):
+        self.future = future
+        self.followers = 0
+        self.waiters = 0  # do_async callers still awaiting the result
+        self.relay = ProgressRelay()
+        self.started = time.perf_counter()
+
+
+class SingleFlight:
+    """Run a call once per key while it is in flight; concurrent callers share its outcome"""
+
+    def __init__(self, group: str):
+        self.group = group
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+        self.saved_seconds = 0.0
+
+    def do(self, key: str, function: Callable, *args, **kwargs):
+        """function(*args, **kwargs), shared with concurrent callers of the same key"""
+        return self._do(key, None, lambda relay: function(*args, **kwargs))
+
+    def do_with_progress(self, key: str, function: Callable, *args, progress: Callable = None):
+        """function(*args, relay) where relay forwards stage events to every caller's progress"""
+        return self._do(key, progress, lambda relay: function(*args, relay))
+
+    def _do(self, key: str, progress, run: Callable):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(Future())
+            else:
+                flight.followers += 1
+            if progress is not None:
+                flight.relay.subscribe(progress)
+        self._count(leader)
+
+        if not leader:
+            return flight.future.result()
+
+        try:
+            flight.future.set_result(run(flight.relay))
+        except BaseException as e:
+            flight.future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            self._finish(flight)
+        return flight.future.result()
+
+    async def do_async(self, key: str, function: Callable, *args):
+        """await function(*args), shared with concurrent awaiters of the same key"""
+        flight = self._async_flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = self._async_flights[key] = _Flight(asyncio.ensure_future(function(*args)))
+
+            def done(task):
+                if self._async_flights.get(key) is flight:
+                    del self._async_flights[key]
+                self._finish(flight)
+
+            flight.future.add_done_callback(done)
+        else:
+            flight.followers += 1
+        self._count(leader)
+
+        # A caller that goes away must not cancel the run other callers wait on,
+        # but once nobody is waiting the run is cancelled instead of finishing unseen
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                if self._async_flights.get(key) is flight:
+                    del self._async_flights[key]  # Later callers start a fresh run
+                flight.future.cancel()
+
+    def _count(self, leader: bool):
+        with self._lock:
+            if leader:
+                self.leaders += 1
+            else:
+                self.followers += 1
+        CALLS.inc(self.group, "leader" if leader else "follower")
+
+    def _finish(self, flight: _Flight):
+        saved = (time.perf_counter() - flight.started) * flight.followers
+        if saved:
+            with self._lock:
+                self.saved_seconds += saved
+            SAVED_SECONDS.inc(self.group, amount=saved)
+
+    def stats(self) -> Dict[str, Any]:
+        """Runs started, runs joined and analysis seconds avoided"""
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "inFlight": len(self._flights) + len(self._async_flights),
+                "savedSeconds": round(self.saved_seconds, 3)
+            }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test the async analysis service (backend/asgi_app.py)
+"""
+
+import sys
+import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import asgi_app
+from asgi_app import AdmissionGate
+
+def test_gate_backpressure():
+    """Requests past in-flight + queue are rejected, drain waits for the rest"""
+    print("🧪 Testing admission limits...")
+
+    async def scenario():
+        gate = AdmissionGate(max_in_flight=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def request():
+            async with gate.admitted():
+                await release.wait()
+
+        tasks = [asyncio.create_task(request()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert gate.rejection() == 429 and gate.retry_after() >= 1
+
+        assert not await gate.drain(0.01)
+        assert gate.rejection() == 503
+        release.set()
+        assert await gate.drain(1.0)
+        await asyncio.gather(*tasks)
+        return gate.report()
+
+    report = asyncio.run(scenario())
+    assert report["rejected"] == 1 and report["queued"] == 0
+
+    print(f"✅ Gate: {report}")
+    return True
+
+def test_analyze_response_shape():
+    """The ASGI /api/analyze returns the Flask response shape"""
+    print("🧪 Testing /api/analyze over ASGI...")
+    if not asgi_app.ASGI_AVAILABLE:
+        print("⚠️ starlette/uvicorn not installed, skipping")
+        return True
+
+    from starlette.testclient import TestClient
+
+    image = np.full((60, 200, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "$500", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    png = cv2.imencode(".png", image)[1].tobytes()
+
+    with TestClient(asgi_app.create_app(workers=1, max_queue=2)) as client:
+        response = client.post("/api/analyze", files={"image": ("capture.png", png, "image/png")})
+        assert response.status_code == 200
+        body = response.json()
+        assert set(body) == {"ocrText", "tags", "confidence", "paitScore", "metadata"}
+        assert body["metadata"]["imageSize"] == f"{len(png)} bytes"
+
+        assert client.post("/api/analyze", data={"other": "x"}).status_code == 400
+        assert client.get("/api/health").json()["load"]["inFlight"] == 0
+
+    print(f"✅ Response keys: {sorted(body)}")
+    return True
+
+def test_batch_streams_ndjson():
+    """/api/analyze/batch streams one timed line per image and enforces its limits"""
+    print("🧪 Testing /api/analyze/batch...")
+    if not asgi_app.ASGI_AVAILABLE:
+        print("⚠️ starlette/uvicorn not installed, skipping")
+        return True
+
+    from starlette.testclient import TestClient
+
+    png = cv2.imencode(".png", np.full((40, 120, 3), 255, dtype=np.uint8))[1].tobytes()
+    files = [("images", (f"shot_{index}.png", png, "image/png")) for index in range(3)]
+
+    with TestClient(asgi_app.create_app(workers=2, batch_max_files=3)) as client:
+        response = client.post("/api/analyze/batch", files=files)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(line["index"] for line in lines) == [0, 1, 2]
+        assert all(line["status"] == 200 and "paitScore" in line["result"] for line in lines)
+        assert all(line["timing"]["totalMs"] >= line["timing"]["analysisMs"] for line in lines)
+
+        too_many = files + [("images", ("extra.png", png, "image/png"))]
+        assert client.post("/api/analyze/batch", files=too_many).status_code == 413
+        assert client.post("/api/analyze/batch", data={"other": "x"}).status_code == 400
+
+    print(f"✅ {len(lines)} NDJSON lines, timing: {lines[0]['timing']}")
+    return True
+
+def test_batch_reserves_a_place_per_image():
+    """A batch that would overflow the queue gets 429 while single uploads still fit"""
+    print("🧪 Testing batch admission...")
+    if not asgi_app.ASGI_AVAILABLE:
+        print("⚠️ starlette/uvicorn not installed, skipping")
+        return True
+
+    import httpx
+
+    png = cv2.imencode(".png", np.full((40, 120, 3), 255, dtype=np.uint8))[1].tobytes()
+    files = [("images", (f"shot_{index}.png", png, "image/png")) for index in range(3)]
+
+    async def scenario():
+        app = asgi_app.create_app(workers=1, max_in_flight=1, max_queue=2)
+        async with app.router.lifespan_context(app):
+            gate = app.state.gate
+            release = asyncio.Event()
+
+            async def single_upload():
+                async with gate.admitted():  # A single-image request holding its place
+                    await release.wait()
+
+            holders = [asyncio.create_task(single_upload()) for _ in range(2)]
+            await asyncio.sleep(0)
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://lens") as client:
+                batch = await client.post("/api/analyze/batch", files=files)
+                assert gate.rejection() is None  # One more single upload would still be admitted
+                assert gate.pending == 2
+
+                release.set()
+                await asyncio.gather(*holders)
+                accepted = await client.post("/api/analyze/batch", files=files)
+            return batch, accepted
+
+    batch, accepted = asyncio.run(scenario())
+    assert batch.status_code == 429
+    assert int(batch.headers["Retry-After"]) == 10  # (2 queued + 3 images) x 2s default, 1 slot
+    assert accepted.status_code == 200 and len(accepted.text.splitlines()) == 3
+
+    print(f"✅ Oversized batch: 429, Retry-After {batch.headers['Retry-After']}s")
+    return True
+
+def test_abandoned_analysis_keeps_its_place():
+    """A client that leaves mid-analysis drops its queued work; the running pool task still counts"""
+    print("🧪 Testing abandoned analyses...")
+    from singleflight import SingleFlight
+
+    async def scenario():
+        gate = AdmissionGate(max_in_flight=1, max_queue=1)
+        flights = SingleFlight("test_abandoned")
+        running = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def analysis(name):
+            calls.append(name)
+            running.set()
+            release.wait()
+            return name
+
+        async def request(name):
+            async with gate.admitted():
+                return await flights.do_async(name, gate.run, executor, analysis, name)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            started = asyncio.create_task(request("started"))
+            queued = asyncio.create_task(request("queued"))
+            await asyncio.to_thread(running.wait)
+            started.cancel()
+            queued.cancel()  # The client went away: both are cancelled
+            await asyncio.gather(started, queued, return_exceptions=True)
+
+            # The pool task is still running: its slot and place stay taken
+            held = (gate.pending, gate.in_flight, gate.rejection(2))
+            release.set()
+            assert await gate.drain(1.0)
+        return held, gate.report(), calls
+
+    held, report, calls = asyncio.run(scenario())
+    assert held == (1, 1, 429)
+    assert report["inFlight"] == 0 and report["queued"] == 0 and calls == ["started"]
+
+    print(f"✅ Held while running: pending={held[0]}, in flight={held[1]}")
+    return True
+
+def main():
+    print("⚡ ASGI Service Test Suite")
+    print("=" * 40)
+
+    results = [test_gate_backpressure(), test_analyze_response_shape(), test_batch_streams_ndjson(),
+               test_batch_reserves_a_place_per_image(), test_abandoned_analysis_keeps_its_place()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
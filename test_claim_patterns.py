@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test the precompiled claim and score regex bank
+"""
+
+from claim_patterns import extract_claims, extract_score
+
+def test_ocr_tolerant_claims():
+    """Clean and OCR-garbled readings give the same claims"""
+    print("🧪 Testing claim extraction...")
+    clean = extract_claims("MADE $1,500 IN 24 HOURS - 100% WIN RATE, $322 in 1 Hour")
+    garbled = extract_claims("MADE S1,5OO IN 24 HOURS - 1OO% WIN RATE, $322 in l Hour")
+
+    assert clean == garbled
+    assert clean["amounts"] == ["$1,500", "$322"]
+    assert clean["time_claims"] == [("24", "hour"), ("1", "hour")]
+    assert clean["percentages"] == ["100"]
+
+    # Look-alikes only count inside number tokens
+    assert extract_claims("$50off, I day trade all day")["amounts"] == ["$50"]
+    assert extract_claims("I day trade all day")["time_claims"] == []
+
+    # S1/S2/S3 are support pivots, not dollar amounts
+    assert extract_claims("Price bounced off S1 then S2 pivot, R1 target")["amounts"] == []
+    assert extract_claims("Stop below S3, target S2.")["amounts"] == []
+    assert extract_claims("Made S1.50 a share, S25 a day")["amounts"] == ["$1.50", "$25"]
+
+    print(f"✅ {clean}")
+    return True
+
+def test_score_priority():
+    """Explicit pAIt score wins over later /100 and score mentions"""
+    print("🧪 Testing score extraction...")
+    assert extract_score("Score: 40. Later: pAIt score: 82") == 82
+    assert extract_score("overall score: 300, rated 55/100") == 55
+    assert extract_score("pAIt score: 820") is None  # Out of range everywhere
+    assert extract_score("no rating here") is None
+
+    print("✅ Priorities match the old pattern loop")
+    return True
+
+def main():
+    print("💰 Claim Patterns Test Suite")
+    print("=" * 40)
+
+    results = [test_ocr_tolerant_claims(), test_score_priority()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test multi-process cron workers: rename claims and the supervisor (backend/cron_supervisor.py)
+"""
+
+import os
+import sys
+import time
+import json
+import shutil
+import socket
+import asyncio
+import tempfile
+import subprocess
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+def write_upload(directory: str, name: str):
+    image = np.full((400, 600, 3), 250, dtype=np.uint8)
+    cv2.putText(image, "RSI breakout strategy", (20, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (20, 20, 20), 2)
+    cv2.imwrite(os.path.join(directory, name), image)
+
+def in_scratch_dir(test):
+    def run():
+        scratch = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(scratch)
+            return test()
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(scratch)
+    run.__name__, run.__doc__ = test.__name__, test.__doc__
+    return run
+
+@in_scratch_dir
+def test_claims_are_exclusive():
+    """A worker whose lease expired keeps its claim; a crashed worker's claims go back to uploads/"""
+    print("🧪 Testing rename claims...")
+    from youtube_cron_processor import YouTubeCronProcessor
+
+    slow = YouTubeCronProcessor(concurrency=1, worker_name="worker-0")
+    other = YouTubeCronProcessor(concurrency=1, worker_name="worker-1")
+    for processor in (slow, other):
+        processor.log_message = lambda message: None
+        processor.queue.lease_seconds = 0.1
+
+    write_upload(slow.watch_dir, "viral.png")
+    slow.enqueue_uploads([os.path.join(slow.watch_dir, "viral.png")])
+    job = slow.queue.lease(slow.worker_id)[0]
+    claimed_path = slow.claim(job.payload["path"])  # worker-0 is still analyzing when its lease runs out
+    time.sleep(0.15)
+
+    stolen = other.queue.lease(other.worker_id)[0]
+    assert not asyncio.run(other.process_job(stolen))  # Claimed elsewhere: released, not re-analyzed
+    row = other.queue.get("viral.png")
+    assert row["state"] == "pending" and row["attempts"] == 1 and row["available_at"] > time.time() + 60
+
+    # worker-0 crashes; its replacement returns the claim
+    assert os.path.exists(claimed_path)
+    restarted = YouTubeCronProcessor(concurrency=1, worker_name="worker-0")
+    restarted.log_message = lambda message: None
+    assert restarted.recover_claims() == 1 and os.path.exists(job.payload["path"])
+    assert os.listdir(restarted.in_progress_dir) == []
+
+    print("✅ One claim per upload; crashed claims recovered")
+    return True
+
+@in_scratch_dir
+def test_supervisor_workers_share_the_backlog():
+    """--workers 2 --once: every upload processed exactly once, stats rolled up per worker"""
+    print("🧪 Testing supervisor with two workers...")
+    from cron_supervisor import CronSupervisor
+
+    os.makedirs("lens-data/uploads")
+    for index in range(6):
+        write_upload("lens-data/uploads", f"short_{index}.png")
+
+    supervisor = CronSupervisor(2, {"concurrency": 1, "file_timeout": 60.0}, once=True, stats_interval=0)
+    assert supervisor.run() == 0
+
+    with open("lens-data/processing_stats.json") as f:
+        stats = json.load(f)
+    assert stats["totalProcessed"] == 6 and sorted(os.listdir("lens-data/processed")) == [
+        f"short_{index}.png" for index in range(6)]
+    assert sum(worker["processed"] for worker in stats["byWorker"].values()) == 6
+    assert stats["supervisor"]["queue"]["done"] == 6 and stats["supervisor"]["restarts"] == 0
+
+    print(f"✅ By worker: {stats['byWorker']}")
+    return True
+
+@in_scratch_dir
+def test_standalone_processes_keep_their_claims():
+    """Standalone processes claim into their own directory and only recover those of exited processes"""
+    print("🧪 Testing standalone claim recovery...")
+    from youtube_cron_processor import YouTubeCronProcessor, process_claim_dir
+
+    processor = YouTubeCronProcessor(concurrency=1)
+    processor.log_message = lambda message: None
+    assert processor.in_progress_dir.endswith(process_claim_dir()) and processor.worker_name is None
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    running = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        host = socket.gethostname()
+        for owner in (f"{host}-{exited.pid}", f"{host}-{running.pid}", "worker-0"):
+            os.makedirs(os.path.join(processor.in_progress_root, owner))
+            write_upload(os.path.join(processor.in_progress_root, owner), f"{owner}.png")
+
+        assert processor.recover_claims() == 1
+        assert os.listdir(processor.watch_dir) == [f"{host}-{exited.pid}.png"]
+        assert not os.path.exists(os.path.join(processor.in_progress_root, f"{host}-{exited.pid}"))
+        assert os.listdir(os.path.join(processor.in_progress_root, f"{host}-{running.pid}"))  # Still in flight
+        assert os.listdir(os.path.join(processor.in_progress_root, "worker-0"))  # The supervisor's to recover
+    finally:
+        running.kill()
+        running.wait()
+
+    print("✅ Only exited processes' claims recovered")
+    return True
+
+@in_scratch_dir
+def test_shutdown_releases_running_jobs():
+    """Cancelling run_continuous (SIGTERM) releases the lease and claim at once, without waiting for OCR"""
+    print("🧪 Testing graceful shutdown...")
+    from youtube_cron_processor import YouTubeCronProcessor
+
+    processor = YouTubeCronProcessor(concurrency=1, worker_name="worker-0", stats_interval=0)
+    processor.log_message = lambda message: None
+    write_upload(processor.watch_dir, "long.png")
+    pool_processes = []
+
+    async def hang(file_path, executor=None):
+        task = asyncio.get_running_loop().run_in_executor(executor, time.sleep, 60)
+        pool_processes.extend(executor._processes.values())
+        return await task
+
+    processor.service.process_youtube_analysis = hang
+
+    async def scenario():
+        run = asyncio.ensure_future(processor.run_continuous(60, use_inotify=False))
+        while not pool_processes:
+            await asyncio.sleep(0.05)
+        started = time.monotonic()
+        run.cancel()
+        await run
+        return time.monotonic() - started
+
+    stopped_in = asyncio.run(scenario())
+    assert stopped_in < 10 and not any(process.is_alive() for process in pool_processes)
+    row = processor.queue.get("long.png")
+    assert row["state"] == "pending" and row["attempts"] == 0  # Released, not failed
+    assert os.path.exists(os.path.join(processor.watch_dir, "long.png"))
+    assert os.listdir(processor.in_progress_dir) == []
+
+    print(f"✅ Stopped in {stopped_in:.2f}s with the upload back in uploads/")
+    return True
+
+def main():
+    print("👷 Cron Supervisor Test Suite")
+    print("=" * 40)
+
+    results = [test_claims_are_exclusive(), test_standalone_processes_keep_their_claims(),
+               test_shutdown_releases_running_jobs(), test_supervisor_workers_share_the_backlog()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the shared keyword matcher against plain substring checks
+"""
+
+import random
+
+from keyword_matcher import KeywordMatcher, register_vocabulary, scan
+
+VOCABULARY = ['stop loss', 'stop', 'loss', 'loss management', 'risk', 'risk disclosure',
+              'ai', 'a', '$', '100%', '@', 'signal', 'signals', "before it's too late"]
+
+def test_offsets_match_substring_search():
+    """Every occurrence (overlapping, prefix and infix terms) is reported"""
+    print("🧪 Testing offsets against str.startswith...")
+    matcher = KeywordMatcher(VOCABULARY)
+    rng = random.Random(3)
+    alphabet = list("abcdeilmnoprstg $%@10'")
+
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        text += " Stop Loss Management, RISK disclosure: signals AI 100% before it's too late"
+        hits = matcher.scan(text)
+        text_lower = text.lower()
+        for term in VOCABULARY:
+            expected = [i for i in range(len(text_lower)) if text_lower.startswith(term, i)]
+            assert hits.offsets.get(term, []) == expected, (text, term)
+
+    print("✅ Offsets match")
+    return True
+
+def test_shared_scan():
+    """Registered lists are read from one memoised scan; unknown terms still work"""
+    print("🧪 Testing shared scan...")
+    terms = register_vocabulary(['moving average', 'rsi', 'macd'])
+    hits = scan("RSI divergence above the Moving Average")
+
+    assert hits.found(terms) == ['moving average', 'rsi']
+    assert hits.count(terms) == 2
+    assert hits.any(['macd', 'rsi'])
+    assert 'divergence' in hits          # Not registered: falls back to substring check
+    assert scan("RSI divergence above the Moving Average") is hits
+
+    print("✅ Shared scan works")
+    return True
+
+def main():
+    print("🔎 Keyword Matcher Test Suite")
+    print("=" * 40)
+
+    results = [test_offsets_match_substring_search(), test_shared_scan()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test stage timers and Prometheus rendering (metrics.py)
+"""
+
+import time
+
+from metrics import MetricsRegistry, collect_timings, get_registry, stage
+
+def test_stage_timings():
+    """Stages timed inside collect_timings land in the request and the histogram"""
+    print("🧪 Testing stage timers...")
+    histogram = get_registry().histogram("lens_stage_seconds", "")
+    before = histogram.count("test_stage")
+
+    with collect_timings() as timings:
+        with stage("test_stage"):
+            time.sleep(0.01)
+        with stage("test_stage"):
+            pass
+
+    assert histogram.count("test_stage") == before + 2
+    assert timings.stages["test_stage"] >= 0.01
+    assert timings.total_seconds >= timings.stages["test_stage"]
+
+    print(f"✅ Timings: {timings.as_ms()}")
+    return True
+
+def test_prometheus_render():
+    """Histograms render cumulative buckets, sum and count"""
+    print("🧪 Testing Prometheus text format...")
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency", ("stage",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "ocr")
+    latency.observe(0.5, "ocr")
+    registry.counter("demo_total", "Demo counter").inc(amount=3)
+
+    text = registry.render()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="ocr",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="ocr",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="ocr",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{stage="ocr"} 2' in text
+    assert 'demo_total 3' in text
+
+    print(f"✅ Rendered {len(text.splitlines())} lines")
+    return True
+
+def main():
+    print("⏱️ Metrics Test Suite")
+    print("=" * 40)
+
+    results = [test_stage_timings(), test_prometheus_render()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
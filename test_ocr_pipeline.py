@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test the OCR pipeline building blocks: cache, result, tiling, Otsu, region fallback
+(no Tesseract needed - a fake engine stands in for the pool)
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+
+import text_regions
+from ocr_cache import OCRCache
+from ocr_engine import _parse_config
+from ocr_preprocess import TILE_HEIGHT, TILE_OVERLAP, binarize_batch, gray_histogram, merge_tile_results, otsu_thresholds
+from ocr_profiles import CHAR_WHITELIST, profile_config
+from ocr_result import OCRResult, OCRResultBuilder
+
+
+class FakeEngine:
+    """Records submitted images; every call reads back one word per image"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, image, config='--psm 6', profile=None):
+        self.calls.append((image.shape, config))
+        builder = OCRResultBuilder()
+        builder.add_word(f"word{len(self.calls)}", 90.0, (0, 0, 10, 10))
+        future = Future()
+        future.set_result(builder.build())
+        return future
+
+
+def build_result(words):
+    """OCRResult from (word, confidence, box, line) tuples"""
+    builder = OCRResultBuilder()
+    current_line = None
+    for word, confidence, box, line in words:
+        if current_line is not None and line != current_line:
+            builder.new_line()
+        current_line = line
+        builder.add_word(word, confidence, box)
+    return builder.build()
+
+
+def test_cache_memory_lru():
+    """Memory tier evicts least-recently-used entries and keeps byte counts exact"""
+    print("🧪 Testing OCR cache memory LRU...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        value = "x" * 100
+        entry_size = len(json.dumps({"value": value}))
+        cache = OCRCache(temp_dir, max_memory_bytes=entry_size * 2, max_disk_bytes=1 << 20)
+
+        cache.put("aa1", value)
+        cache.put("aa2", value)
+        assert cache.get("aa1") == value           # aa1 is now most recent
+        cache.put("aa3", value)                   # Evicts aa2, not aa1
+
+        stats = cache.stats()
+        assert stats["memory_entries"] == 2 and stats["evictions"] == 1
+        assert stats["memory_bytes"] == entry_size * 2
+
+        assert cache.get("aa2") == value           # Still on disk
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1 and stats["disk_hits"] == 1
+        assert stats["memory_bytes"] == entry_size * 2
+
+        cache.clear()
+        assert cache.stats()["memory_bytes"] == 0
+        assert cache.get("missing") is None and cache.stats()["misses"] == 1
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("✅ LRU order and memory bytes correct")
+    return True
+
+
+def test_cache_disk_eviction():
+    """Disk tier drops the oldest files to 90% of its budget and tracks bytes on disk"""
+    print("🧪 Testing OCR cache disk eviction...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        value = "y" * 200
+        payload_size = len(json.dumps({"value": value}))
+        cache = OCRCache(temp_dir, max_memory_bytes=1 << 20, max_disk_bytes=payload_size * 4)
+
+        keys = [f"b{i:02d}" for i in range(4)]
+        for age, key in enumerate(keys):
+            cache.put(key, value)
+            os.utime(cache._path(key), (time.time() - 100 + age, time.time() - 100 + age))
+
+        assert cache.stats()["disk_bytes"] == payload_size * 4
+        cache.put("b99", value)                   # Over budget: oldest go until <= 90%
+
+        on_disk = sorted(path.stem for path in cache.cache_dir.glob("*/*.json"))
+        assert on_disk == ["b02", "b03", "b99"], on_disk
+        disk_bytes = cache.stats()["disk_bytes"]
+        assert disk_bytes == sum(path.stat().st_size for path in cache.cache_dir.glob("*/*.json"))
+        assert disk_bytes <= payload_size * 4 * 0.9
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Evicted to {disk_bytes} bytes, newest entries kept")
+    return True
+
+
+def test_result_round_trip():
+    """OCRResult survives to_dict/JSON/from_dict; whitespace-only results are falsy"""
+    print("🧪 Testing OCRResult round-trip...")
+    result = build_result([("Buy", 91.5, (1, 2, 30, 12), 0), ("$BTC", 72.5, (35, 2, 40, 12), 0),
+                           ("now", 55.0, (1, 20, 25, 12), 1)])
+    restored = OCRResult.from_dict(json.loads(json.dumps(result.to_dict())))
+
+    assert restored.text == result.text == "Buy $BTC\nnow"
+    assert [word for word, _, _ in restored.words()] == ["Buy", "$BTC", "now"]
+    assert restored.box(1) == (35, 2, 40, 12)
+    assert list(restored.lines) == [0, 0, 1]
+    assert list(restored.confidences) == [91.5, 72.5, 55.0]
+    assert restored.low_confidence_words() == ["now"]
+
+    assert result and restored
+    assert not OCRResult() and not OCRResult.from_text("  \n ")
+    assert OCRResult.from_dict("plain text").text == "plain text"
+
+    print("✅ Text, words, boxes, lines and confidences preserved")
+    return True
+
+
+def test_tile_merge_order():
+    """Tiles merge top to bottom, words in an overlap are kept once, boxes shifted"""
+    print("🧪 Testing tile merge...")
+    step = TILE_HEIGHT - TILE_OVERLAP
+    overlap_top = TILE_HEIGHT - TILE_OVERLAP + 10      # In tile 0's lower half of the overlap
+    top = build_result([("first", 90, (0, 10, 40, 20), 0), ("dup", 90, (0, overlap_top, 40, 20), 1)])
+    bottom = build_result([("dup", 90, (0, 10, 40, 20), 0), ("last", 90, (0, 500, 40, 20), 1)])
+
+    merged = merge_tile_results([(0, TILE_HEIGHT, top), (step, TILE_HEIGHT, bottom)])
+    assert merged.text == "first\ndup\nlast", merged.text
+    assert merged.box(1) == (0, step + 10, 40, 20)       # Kept from the lower tile, shifted
+    assert merged.box(2) == (0, step + 500, 40, 20)
+
+    print(f"✅ Merged: {merged.text!r}")
+    return True
+
+
+def test_batched_otsu_matches_opencv():
+    """Batched Otsu gives cv2's THRESH_OTSU threshold and binary on mixed tile shapes"""
+    print("🧪 Testing batched Otsu vs OpenCV...")
+    rng = np.random.default_rng(7)
+    grays = []
+    for height, width, ink in [(120, 300, 40), (900, 200, 90), (33, 47, 10), (400, 400, 120)]:
+        gray = rng.normal(225, 12, (height, width))
+        gray[rng.random((height, width)) < 0.2] = rng.normal(ink, 15)
+        grays.append(np.clip(gray, 0, 255).astype(np.uint8))
+
+    thresholds = otsu_thresholds(np.stack([gray_histogram(gray) for gray in grays]))
+    for gray, threshold, binary in zip(grays, thresholds, binarize_batch(grays)):
+        expected_threshold, expected = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        assert int(threshold) == int(expected_threshold)
+        assert binary.shape == gray.shape and np.array_equal(binary, expected)
+
+    # Dark mode comes back inverted: text black on white
+    dark = 255 - grays[0]
+    binary = binarize_batch([dark])[0]
+    assert (binary == 255).mean() > 0.5
+
+    print(f"✅ Thresholds match: {thresholds.tolist()}")
+    return True
+
+
+def test_region_fallback_thresholds():
+    """No regions or regions over FULL_FRAME_COVERAGE -> whole frame, tiled; otherwise crops"""
+    print("🧪 Testing region fallback thresholds...")
+    original = text_regions.detect_text_regions
+    image = np.full((1000, 1000, 3), 255, np.uint8)
+    try:
+        text_regions.detect_text_regions = lambda image: []
+        engine = FakeEngine()
+        result = text_regions.ocr_text_regions(image, engine)
+        assert engine.calls == [((1000, 1000, 3), '--psm 6')] and result["regions"] == []
+
+        # Over the coverage limit: one full-frame call
+        text_regions.detect_text_regions = lambda image: [(0, 0, 1000, 450), (0, 500, 1000, 450)]
+        engine = FakeEngine()
+        result = text_regions.ocr_text_regions(image, engine)
+        assert len(engine.calls) == 1 and result["pixels_scanned"] == 1000 * 1000
+
+        # Under it: one --psm 7 call per region, merged in reading order
+        text_regions.detect_text_regions = lambda image: [(0, 0, 1000, 300), (0, 500, 1000, 300)]
+        engine = FakeEngine()
+        result = text_regions.ocr_text_regions(image, engine)
+        assert [config for _, config in engine.calls] == ['--psm 7', '--psm 7']
+        assert result["text"] == "word1\nword2" and result["pixels_scanned"] == 600_000
+
+        # Tall capture with no regions: the fallback is tiled, not one huge call
+        text_regions.detect_text_regions = lambda image: []
+        engine = FakeEngine()
+        text_regions.ocr_text_regions(np.full((TILE_HEIGHT * 2, 500), 255, np.uint8), engine)
+        assert len(engine.calls) > 1 and all(shape[0] <= TILE_HEIGHT for shape, _ in engine.calls)
+    finally:
+        text_regions.detect_text_regions = original
+
+    print("✅ Fallback at 0 regions and >80% coverage, tiled for tall captures")
+    return True
+
+
+def test_profile_config_round_trip():
+    """The trading whitelist (quotes, currency symbols) survives config quoting"""
+    print("🧪 Testing profile config quoting...")
+    psm, variables = _parse_config(profile_config('--psm 6', 'trading'))
+    assert psm == 6
+    assert variables["tessedit_char_whitelist"] == CHAR_WHITELIST
+    assert all(char in CHAR_WHITELIST for char in "'’\"€£¥")
+
+    print("✅ Whitelist intact after shlex split")
+    return True
+
+
+def main():
+    print("🔡 OCR Pipeline Test Suite")
+    print("=" * 40)
+
+    results = [test_cache_memory_lru(), test_cache_disk_eviction(), test_result_round_trip(),
+               test_tile_merge_order(), test_batched_otsu_matches_opencv(), test_region_fallback_thresholds(),
+               test_profile_config_round_trip()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the append-only processing stats log (backend/processing_stats.py)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from multiprocessing import Pool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from processing_stats import ProcessingStatsLog
+
+def record_many(args):
+    """One processor appending events (run in separate processes)"""
+    directory, worker, count = args
+    stats = ProcessingStatsLog(os.path.join(directory, "events.jsonl"), os.path.join(directory, "stats.json"))
+    for index in range(count):
+        score = 300 + worker * 100 + index
+        grade = "High" if score >= 800 else "Moderate" if score >= 600 else "Low" if score >= 400 else "Critical"
+        stats.record({"paitScores": {"overallScore": score}, "profitabilityGrade": grade},
+                     processing_seconds=0.1 * (index + 1), file_name=f"w{worker}_{index}.png")
+        if index % 10 == 0:
+            stats.snapshot()  # Concurrent snapshots must not lose counts
+    return count
+
+def test_concurrent_processors():
+    """Several processes appending and snapshotting at once lose no events"""
+    print("🧪 Testing concurrent processors...")
+    with tempfile.TemporaryDirectory() as directory:
+        with Pool(4) as pool:
+            recorded = sum(pool.map(record_many, [(directory, worker, 50) for worker in range(4)]))
+
+        stats = ProcessingStatsLog(os.path.join(directory, "events.jsonl"),
+                                   os.path.join(directory, "stats.json")).snapshot()
+        with open(os.path.join(directory, "stats.json")) as f:
+            assert json.load(f)["totalProcessed"] == recorded
+
+    today = max(stats["dailyStats"])
+    assert stats["totalProcessed"] == 200 and stats["dailyStats"][today] == 200
+    assert sum(stats["scoreDistribution"].values()) == 200
+
+    percentiles = stats["dailyPercentiles"][today]
+    assert percentiles["paitScore"]["min"] == 300 and percentiles["paitScore"]["max"] == 649
+    assert percentiles["processingMs"]["p50"] <= percentiles["processingMs"]["p99"] <= 5000
+
+    print(f"✅ {stats['totalProcessed']} events, pAIt {percentiles['paitScore']}")
+    return True
+
+def test_carry_over_and_partial_lines():
+    """A pre-log processing_stats.json is kept; a half-written line waits for the next read"""
+    print("🧪 Testing legacy carry-over...")
+    with tempfile.TemporaryDirectory() as directory:
+        events_path = os.path.join(directory, "events.jsonl")
+        stats_path = os.path.join(directory, "stats.json")
+        with open(stats_path, "w") as f:
+            json.dump({"totalProcessed": 10, "averagePAItScore": 500,
+                       "scoreDistribution": {"high": 0, "moderate": 0, "low": 10, "critical": 0},
+                       "lastProcessed": "2020-01-01T00:00:00", "dailyStats": {"2020-01-01": 10}}, f)
+
+        stats = ProcessingStatsLog(events_path, stats_path, retention_days=30)
+        stats.record({"paitScores": {"overallScore": 900}, "profitabilityGrade": "High"}, 1.0)
+        with open(events_path, "a") as f:
+            f.write('{"ts": "2099-01-01T00:0')  # Writer still mid-line
+
+        snapshot = stats.snapshot()
+        assert snapshot["totalProcessed"] == 11 and round(snapshot["averagePAItScore"], 2) == 536.36
+        assert snapshot["scoreDistribution"]["high"] == 1 and snapshot["scoreDistribution"]["low"] == 10
+        assert "2020-01-01" not in snapshot["dailyStats"]  # Outside the retention window
+
+    print(f"✅ Snapshot: {snapshot['totalProcessed']} processed, average {snapshot['averagePAItScore']:.1f}")
+    return True
+
+def test_compaction_keeps_totals():
+    """Expired events roll into one baseline; totals survive, other readers re-fold"""
+    print("🧪 Testing log compaction...")
+    with tempfile.TemporaryDirectory() as directory:
+        events_path = os.path.join(directory, "events.jsonl")
+        stats_path = os.path.join(directory, "stats.json")
+        with open(events_path, "w") as f:
+            for day in range(1, 31):
+                f.write(json.dumps({"ts": f"2020-01-{day:02d}T12:00:00", "paitScore": 400,
+                                    "grade": "low", "processingMs": 10.0, "worker": "old"}) + "\n")
+
+        reader = ProcessingStatsLog(events_path, stats_path, retention_days=30)
+        assert reader.refresh().total == 30
+
+        stats = ProcessingStatsLog(events_path, stats_path, retention_days=30)
+        stats.record({"paitScores": {"overallScore": 900}, "profitabilityGrade": "High"}, 1.0, worker="new")
+        snapshot = stats.snapshot()
+
+        with open(events_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 2 and lines[0]["type"] == "baseline" and lines[0]["totalProcessed"] == 30
+        assert snapshot["totalProcessed"] == 31 and snapshot["averagePAItScore"] == (30 * 400 + 900) / 31
+        assert snapshot["byWorker"]["old"]["processed"] == 30
+        assert not stats.compact()  # Nothing left to roll
+
+        stats.record({"paitScores": {"overallScore": 100}, "profitabilityGrade": "Critical"}, 1.0)
+        again = reader.snapshot()  # Its offset pointed into the replaced file
+        assert again["totalProcessed"] == 32 and again["scoreDistribution"]["low"] == 30
+        assert again["scoreDistribution"]["critical"] == 1
+
+    print(f"✅ Log compacted to {len(lines)} lines, {again['totalProcessed']} processed kept")
+    return True
+
+def main():
+    print("📊 Processing Stats Test Suite")
+    print("=" * 40)
+
+    results = [test_concurrent_processors(), test_carry_over_and_partial_lines(), test_compaction_keeps_totals()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
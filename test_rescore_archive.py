@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test batch re-scoring of stored analyses
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from rescore_archive import BatchScorer, rescore_archive
+from scoring_engine import FEATURES_VERSION, document_features, get_scoring_engine
+
+def test_batch_matches_profile():
+    """Matrix scoring gives the same scores as ScoringProfile.score"""
+    print("🧪 Testing batch vs per-document scores...")
+    profile = get_scoring_engine().profile("pait_scoring")
+    texts = [
+        "Entry on the RSI + MACD breakout, stop loss below support. Guaranteed profit!",
+        "First identify the trend, then wait for confirmation. Risk 1% position size.",
+        ""
+    ]
+
+    scorer = BatchScorer(profile)
+    categories = scorer.category_scores(scorer.term_matrix(texts),
+                                        {"word_count": [len(text.split()) for text in texts]})
+    overall = scorer.overall(categories).tolist()
+
+    for text, scores, total in zip(texts, scorer.category_dicts(categories), overall):
+        expected = profile.score(text)
+        assert scores == expected["categories"]
+        assert total == expected["overall"]
+
+    print(f"✅ {len(texts)} documents match")
+    return True
+
+def test_rescore_writes_changed():
+    """Stale YouTube scores are rewritten, current ones are left alone"""
+    print("🧪 Testing archive write-back...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        archive = Path(temp_dir) / "youtube-analysis"
+        archive.mkdir()
+        text = "Breakout entry with a stop loss"
+        stale = {"paitScores": {"overallScore": 999}, "profitabilityGrade": "High", "textContent": text}
+        (archive / "stale.json").write_text(json.dumps(stale), encoding="utf-8")
+
+        summary = rescore_archive("youtube", temp_dir, dry_run=True)
+        assert summary["changed"] == 1 and summary["written"] == 0
+
+        summary = rescore_archive("youtube", temp_dir)
+        assert summary["written"] == 1
+        rescored = json.loads((archive / "stale.json").read_text(encoding="utf-8"))
+        assert rescored["paitScores"]["overallScore"] != 999
+        assert "rescoredAt" in rescored
+
+        assert rescore_archive("youtube", temp_dir)["changed"] == 0
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Rescored: 999 -> {rescored['paitScores']['overallScore']}")
+    return True
+
+def test_rescore_from_features():
+    """Ollama reviews re-score from stored agent sub-scores, filtered by --since"""
+    print("🧪 Testing feature-vector re-scoring...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        archive = Path(temp_dir) / "ollama_analysis"
+        archive.mkdir()
+        features = {"version": FEATURES_VERSION, "terms": {}, "claudia_total_score": 80, "fraud_score": 3}
+        analysis = {"analysis_date": "2025-09-01T10:00:00", "features": features,
+                    "member_review": {"review_id": "review_1", "pait_score": 75}}
+        (archive / "review_1_full_analysis.json").write_text(json.dumps(analysis), encoding="utf-8")
+
+        assert rescore_archive("ollama", temp_dir, since="2025-10-01")["documents"] == 0
+
+        assert rescore_archive("ollama", temp_dir, since="2025-08-01")["written"] == 1
+        rescored = json.loads((archive / "review_1_full_analysis.json").read_text(encoding="utf-8"))
+        assert rescored["member_review"]["pait_score"] == 80 - 3 * 5
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Rescored: 75 -> {rescored['member_review']['pait_score']}")
+    return True
+
+def test_stale_features_recomputed_or_skipped():
+    """Vectors from an older FEATURES_VERSION are rebuilt from text, or skipped without it"""
+    print("🧪 Testing stale feature vectors...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        youtube = Path(temp_dir) / "youtube-analysis"
+        youtube.mkdir()
+        text = "Guaranteed profit! Entry on the breakout with a stop loss"
+        stale = {**document_features(text), "version": FEATURES_VERSION - 1, "terms": {}, "word_count": 0}
+        analysis = {"paitScores": {"overallScore": 999}, "features": stale, "textContent": text}
+        (youtube / "old.json").write_text(json.dumps(analysis), encoding="utf-8")
+
+        assert rescore_archive("youtube", temp_dir)["written"] == 1
+        rescored = json.loads((youtube / "old.json").read_text(encoding="utf-8"))
+        expected = get_scoring_engine().profile("pait_scoring").score(text)["overall"]
+        assert rescored["paitScores"]["overallScore"] == int(expected)
+
+        ollama = Path(temp_dir) / "ollama_analysis"
+        ollama.mkdir()
+        review = {"features": {"version": FEATURES_VERSION - 1, "terms": {}, "claudia_total_score": 80},
+                  "member_review": {"review_id": "review_2", "pait_score": 75}}
+        (ollama / "review_2_full_analysis.json").write_text(json.dumps(review), encoding="utf-8")
+
+        summary = rescore_archive("ollama", temp_dir)
+        assert summary["documents"] == 1 and summary["changed"] == 0
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Stale YouTube vector recomputed ({int(expected)}), stale Ollama vector skipped")
+    return True
+
+def main():
+    print("🧮 Archive Rescorer Test Suite")
+    print("=" * 40)
+
+    results = [test_batch_matches_profile(), test_rescore_writes_changed(), test_rescore_from_features(),
+               test_stale_features_recomputed_or_skipped()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
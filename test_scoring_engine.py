@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the config-driven pAIt scoring engine
+"""
+
+import os
+import json
+import shutil
+import tempfile
+
+from scoring_engine import ScoringEngine, DEFAULT_CONFIG_PATH
+
+def test_pait_rules():
+    """Category rules from youtube_analysis_config.json"""
+    print("🧪 Testing pait_scoring rules...")
+    profile = ScoringEngine().profile("pait_scoring")
+
+    text = "Entry on the RSI + MACD breakout, stop loss below support. Guaranteed profit!"
+    result = profile.score(text)
+    categories = result["categories"]
+
+    assert categories["technical_accuracy"] == 8       # rsi, macd, breakout, support
+    assert categories["execution_feasibility"] == 4    # entry, stop loss
+    assert categories["risk_management"] == 2          # stop loss (minimum 2)
+    assert categories["market_conditions"] == 4        # minimum
+    assert categories["strategy_clarity"] == 3         # short, no structure words
+    assert categories["profitability_potential"] == 2  # profit - guaranteed, floor 2
+    assert 200 <= result["overall"] <= 1000
+
+    print(f"✅ Overall score: {result['overall']}")
+    return True
+
+def test_hot_reload():
+    """Weight edits are picked up without rebuilding the engine"""
+    print("🧪 Testing config hot reload...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        config_path = os.path.join(temp_dir, "config.json")
+        shutil.copy(DEFAULT_CONFIG_PATH, config_path)
+
+        engine = ScoringEngine(config_path, reload_interval=0)
+        before = engine.profile("pait_scoring").score("rsi macd support")["overall"]
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        config["pait_scoring"]["categories"]["technical_accuracy"] = 0.5
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        stat = os.stat(config_path)
+        os.utime(config_path, (stat.st_atime, stat.st_mtime + 1))
+
+        after = engine.profile("pait_scoring").score("rsi macd support")["overall"]
+        assert after > before
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Reloaded: {before} -> {after}")
+    return True
+
+def main():
+    print("🧮 Scoring Engine Test Suite")
+    print("=" * 40)
+
+    results = [test_pait_rules(), test_hot_reload()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
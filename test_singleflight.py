@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test in-flight request coalescing (singleflight.py)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from singleflight import SingleFlight, content_key
+
+def test_threads_share_one_run():
+    """Concurrent callers with the same key run the function once"""
+    print("🧪 Testing threaded coalescing...")
+    flights = SingleFlight("test_threads")
+    release = threading.Event()
+    runs = []
+
+    def analyze(data):
+        runs.append(data)
+        release.wait(5)
+        return {"bytes": len(data)}
+
+    key = content_key(b"viral screenshot")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flights.do, key, analyze, b"viral screenshot") for _ in range(8)]
+        while flights.stats()["followers"] < 7:
+            threading.Event().wait(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(runs) == 1 and all(result == {"bytes": 16} for result in results)
+    stats = flights.stats()
+    assert stats["leaders"] == 1 and stats["followers"] == 7 and stats["inFlight"] == 0
+
+    # Finished work is not cached: the next call runs again
+    release.set()
+    flights.do(key, analyze, b"viral screenshot")
+    assert len(runs) == 2
+
+    print(f"✅ Stats: {stats}")
+    return True
+
+def test_async_shares_result_and_errors():
+    """Awaiters share the task's result or exception; the task is cancelled only when every awaiter is"""
+    print("🧪 Testing asyncio coalescing...")
+    flights = SingleFlight("test_async")
+
+    async def scenario():
+        calls, completed = [], []
+
+        async def analyze(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            completed.append(value)
+            if value == "bad":
+                raise ValueError("unreadable image")
+            return value.upper()
+
+        waiters = [asyncio.ensure_future(flights.do_async("k", analyze, "ok")) for _ in range(3)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        results = await asyncio.gather(*waiters[1:])
+
+        failures = await asyncio.gather(*[flights.do_async("bad", analyze, "bad") for _ in range(2)],
+                                        return_exceptions=True)
+
+        # The only awaiter leaves: its run is cancelled, and the next caller starts a new one
+        alone = asyncio.ensure_future(flights.do_async("gone", analyze, "gone"))
+        await asyncio.sleep(0.01)
+        alone.cancel()
+        await asyncio.sleep(0)
+        rerun = await flights.do_async("gone", analyze, "gone")
+        return calls, completed, results, failures, rerun
+
+    calls, completed, results, failures, rerun = asyncio.run(scenario())
+    assert calls == ["ok", "bad", "gone", "gone"] and results == ["OK", "OK"] and rerun == "GONE"
+    assert completed == ["ok", "bad", "gone"]  # The abandoned run never finished
+    assert flights.stats()["inFlight"] == 0
+    assert all(isinstance(failure, ValueError) for failure in failures)
+
+    print(f"✅ Stats: {flights.stats()}")
+    return True
+
+def main():
+    print("🛫 Single Flight Test Suite")
+    print("=" * 40)
+
+    results = [test_threads_share_one_run(), test_async_shares_result_and_errors()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test event-driven upload detection (backend/upload_watcher.py)
+"""
+
+import sys
+import time
+import shutil
+import asyncio
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import upload_watcher
+from upload_watcher import UploadWatcher
+
+async def detect_upload(use_inotify):
+    """Write an upload after the watcher started; return (path, stats)"""
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        uploads, processed = temp_dir / "uploads", temp_dir / "processed"
+        uploads.mkdir()
+        processed.mkdir()
+        (processed / "done.png").write_bytes(b"old")
+        (uploads / "done.png").write_bytes(b"old")  # Already processed: never queued
+        (uploads / "notes.txt").write_text("not an image")
+
+        # Rescans are an hour apart: only an inotify event or a poll can find the new upload
+        watcher = UploadWatcher(str(uploads), str(processed), rescan_interval=3600,
+                                settle_seconds=0.0, use_inotify=use_inotify, poll_interval=0.05)
+        await watcher.start()
+        assert watcher.mode == ("inotify" if use_inotify else "polling")
+        try:
+            (uploads / "shot.png").write_bytes(b"\x89PNG fake")
+            path = await asyncio.wait_for(watcher.get(), timeout=5)
+            Path(path).rename(processed / Path(path).name)  # As process_file does on success
+            watcher.task_done(path)
+            await asyncio.sleep(0.1)
+            return Path(path).name, watcher.stats()
+        finally:
+            watcher.stop()
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_watch_modes():
+    """Both inotify and the polling fallback queue new uploads only, without waiting for a rescan"""
+    print("🧪 Testing upload watcher...")
+    modes = [False] + ([True] if upload_watcher.INOTIFY_AVAILABLE else [])
+    if not upload_watcher.INOTIFY_AVAILABLE:
+        print(f"⚠️ inotify_simple not installed{' (required on Linux)' if sys.platform == 'linux' else ''}, "
+              f"testing polling only")
+
+    for use_inotify in modes:
+        started = time.perf_counter()
+        name, stats = asyncio.run(detect_upload(use_inotify))
+        assert name == "shot.png"
+        assert stats["detected"] == 1 and stats["queueDepth"] == 0
+        print(f"✅ {stats['mode']}: detected in {time.perf_counter() - started:.3f}s")
+    return True
+
+def main():
+    print("👀 Upload Watcher Test Suite")
+    print("=" * 40)
+
+    results = [test_watch_modes()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
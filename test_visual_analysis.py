@@ -100,8 +100,46 @@ def demonstrate_real_world_usage():
         print(f"   Command: {example['command']}")
         print(f"   Purpose: {example['description']}")
 
+def test_race_needs_a_full_read():
+    """race mode: a confident single-word read does not beat a fuller full-page read"""
+    print("🧪 Testing PSM race...")
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from ocr_result import OCRResultBuilder
+
+    def reading(text, confidence):
+        builder = OCRResultBuilder()
+        for index, word in enumerate(text.split()):
+            builder.add_word(word, confidence, (index * 50, 0, 40, 20))
+        return builder.build()
+
+    class RaceEngine:
+        """PSM 8 answers first with one confident word; PSM 3 reads the page confidently, later"""
+        def __init__(self, readings):
+            self.readings = readings
+            self.pool = ThreadPoolExecutor(max_workers=4)
+
+        def submit(self, image, config):
+            delay, result = self.readings[int(config.split()[-1])]
+            return self.pool.submit(lambda: time.sleep(delay) or result)
+
+    page = "MADE $1,500 IN 24 HOURS 100% WIN RATE STRATEGY"
+    analyzer = VisualContentAnalyzer("test-output", ocr_mode="race")
+    engine = RaceEngine({6: (0.05, reading(page, 60)), 3: (0.2, reading(page, 90)),
+                         8: (0.0, reading("MADE", 96)), 13: (0.0, reading("MADE $1,500", 95))})
+    result, psm = analyzer._race_psm_candidates(engine, None, 6)
+    assert psm == 3 and result.text == page
+
+    engine.readings[6] = (0.05, reading(page, 85))  # A confident predicted read wins outright
+    result, psm = analyzer._race_psm_candidates(engine, None, 6)
+    assert psm == 6
+
+    print("✅ Partial confident reads lose to the full page")
+    return True
+
 if __name__ == "__main__":
     test_visual_analyzer()
+    test_race_needs_a_full_read()
     demonstrate_real_world_usage()
     
     print(f"\n🚀 VISUAL ANALYSIS IS READY!")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test background visual analysis jobs (backend/visual_analysis.py)
+"""
+
+import io
+import sys
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from flask import Flask
+from visual_analysis import JOB_STAGES, VisualAnalysisBackend, VisualAnalysisJobs, register_visual_analysis_job_routes
+
+class SlowKathyBackend(VisualAnalysisBackend):
+    """Backend whose H100 call blocks until released (no network)"""
+
+    def __init__(self, output_dir):
+        self.h100_ip = "127.0.0.1"
+        self.ollama_base = "http://127.0.0.1:11434"
+        self.output_dir = Path(output_dir)
+        self.release = threading.Event()
+
+    def get_kathy_analysis(self, content_text):
+        self.release.wait(5)
+        return "Technical accuracy 7/10, strategic depth 8/10."
+
+def test_job_lifecycle():
+    """POST returns at once; polling and SSE show every stage in order"""
+    print("🧪 Testing visual analysis jobs...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        backend = SlowKathyBackend(temp_dir)
+        jobs = VisualAnalysisJobs(backend, workers=2)
+        app = Flask(__name__)
+        register_visual_analysis_job_routes(app, jobs)
+        client = app.test_client()
+
+        response = client.post("/api/visual-analysis/jobs", data={"image": (io.BytesIO(b"demo_image_data"), "post.png")},
+                               content_type="multipart/form-data")
+        assert response.status_code == 202
+        job_id = response.get_json()["job_id"]
+        assert client.get(f"/api/visual-analysis/jobs/{job_id}").get_json()["status"] in ("queued", "running")
+
+        backend.release.set()
+        stream = client.get(f"/api/visual-analysis/jobs/{job_id}/events").get_data(as_text=True)
+        events = [line.split(": ", 1)[1] for line in stream.splitlines() if line.startswith("event: ")]
+        assert events == ["queued", "started", "ocr_done", "kathy_done", "package_saved", "done"]
+        final = json.loads([line for line in stream.splitlines() if line.startswith("data: ")][-1][6:])
+        assert final["result"]["success"]
+
+        # Reconnects resume after Last-Event-ID; one that isn't ours replays everything
+        resumed = client.get(f"/api/visual-analysis/jobs/{job_id}/events", headers={"Last-Event-ID": "4"})
+        assert resumed.get_data(as_text=True).count("event: ") == 2
+        garbled = client.get(f"/api/visual-analysis/jobs/{job_id}/events", headers={"Last-Event-ID": "abc"})
+        assert garbled.status_code == 200 and garbled.get_data(as_text=True) == stream
+
+        job = client.get(f"/api/visual-analysis/jobs/{job_id}").get_json()
+        assert job["status"] == "done" and job["stage"] == "package_saved"
+        assert len(list(Path(temp_dir).glob("visual_pait_*.json"))) == 1
+        assert client.get("/api/visual-analysis/jobs/missing").status_code == 404
+        jobs.shutdown()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ Stages: {' -> '.join(events)}")
+    return True
+
+def test_identical_uploads_share_a_run():
+    """Jobs for the same image bytes share one Kathy call and see every stage"""
+    print("🧪 Testing coalesced visual analyses...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        backend = SlowKathyBackend(temp_dir)
+        jobs = VisualAnalysisJobs(backend, workers=3)
+        followers = VisualAnalysisBackend.flights.stats()["followers"]
+        job_ids = [jobs.submit(b"viral_scam_screenshot", {"filename": f"upload_{index}.png"}) for index in range(3)]
+        while VisualAnalysisBackend.flights.stats()["followers"] < followers + 2:
+            threading.Event().wait(0.01)
+        backend.release.set()
+        jobs.shutdown()
+
+        snapshots = [jobs.get(job_id) for job_id in job_ids]
+        assert all(job["status"] == "done" for job in snapshots)
+        assert all([event["event"] for event in job["events"]][2:5] == list(JOB_STAGES) for job in snapshots)
+        assert len({job["result"]["analysis"]["analysis_metadata"]["analysis_id"] for job in snapshots}) == 1
+        assert len(list(Path(temp_dir).glob("visual_pait_*.json"))) == 1
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"✅ 3 uploads, 1 analysis: {VisualAnalysisBackend.flights.stats()}")
+    return True
+
+def test_backlog_limit_and_pruned_jobs():
+    """Submissions past the backlog get 429; a job pruned mid-stream ends the stream cleanly"""
+    print("🧪 Testing job backlog limit...")
+    temp_dir = tempfile.mkdtemp()
+    try:
+        backend = SlowKathyBackend(temp_dir)
+        jobs = VisualAnalysisJobs(backend, workers=1, max_backlog=1)
+        app = Flask(__name__)
+        register_visual_analysis_job_routes(app, jobs)
+        client = app.test_client()
+
+        def post(name):
+            return client.post("/api/visual-analysis/jobs", data={"image": (io.BytesIO(name.encode()), name)},
+                               content_type="multipart/form-data")
+
+        accepted = [post(f"image_{index}.png") for index in range(2)]  # One running, one queued
+        assert [response.status_code for response in accepted] == [202, 202]
+        full = post("image_2.png")
+        assert full.status_code == 429 and int(full.headers["Retry-After"]) >= 1
+        assert jobs.rejected == 1
+
+        backend.release.set()
+        for response in accepted:
+            while jobs.get(response.get_json()["job_id"])["status"] not in ("done", "failed"):
+                threading.Event().wait(0.01)
+        assert post("image_3.png").status_code == 202  # Room again once the backlog drained
+        jobs.shutdown()
+
+        # The job disappears between its final event and the result lookup
+        job_id = accepted[0].get_json()["job_id"]
+        lookups = iter([jobs.get])  # The route's existence check sees it, the result lookup doesn't
+        jobs.get = lambda job_id: next(lookups, lambda _: None)(job_id)
+        stream = client.get(f"/api/visual-analysis/jobs/{job_id}/events")
+        assert stream.status_code == 200
+        final = json.loads([line for line in stream.get_data(as_text=True).splitlines()
+                            if line.startswith("data: ")][-1][6:])
+        assert final["event"] == "done" and final["result"] is None
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("✅ 429 past the backlog, pruned job streamed without a TypeError")
+    return True
+
+def main():
+    print("🎨 Visual Analysis Jobs Test Suite")
+    print("=" * 40)
+
+    results = [test_job_lifecycle(), test_identical_uploads_share_a_run(), test_backlog_limit_and_pruned_jobs()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test the durable leased work queue (work_queue.py) and the cron processor on top of it
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import tempfile
+from multiprocessing import Pool
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from work_queue import WorkQueue
+
+def lease_all(path):
+    """One worker process leasing and acking until the queue is empty"""
+    queue = WorkQueue(path, "test")
+    keys = []
+    while True:
+        jobs = queue.lease(f"worker-{os.getpid()}")
+        if not jobs:
+            return keys
+        keys.append(jobs[0].key)
+        queue.ack(jobs[0])
+
+def test_processes_never_share_a_job():
+    """Concurrent worker processes each get distinct jobs and together get all of them"""
+    print("🧪 Testing multi-process leasing...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "queue.db")
+        queue = WorkQueue(path, "test")
+        for index in range(200):
+            queue.enqueue(f"upload_{index}.png", {"index": index})
+        assert not queue.enqueue("upload_0.png")  # Already queued
+
+        with Pool(4) as pool:
+            leased = [key for keys in pool.map(lease_all, [path] * 4) for key in keys]
+
+        assert len(leased) == len(set(leased)) == 200
+        stats = queue.stats()
+        assert stats["done"] == 200 and stats["pending"] == stats["leased"] == 0
+
+    print(f"✅ 200 jobs leased exactly once: {stats}")
+    return True
+
+def test_backoff_dead_letter_and_lease_expiry():
+    """Failures back off exponentially, then dead-letter; an expired lease is handed out again"""
+    print("🧪 Testing retries, dead letters and crash recovery...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = WorkQueue(os.path.join(directory, "queue.db"), "test", lease_seconds=0.2,
+                          max_attempts=3, backoff_base=0.1)
+        queue.enqueue("flaky.png")
+
+        delays = []
+        for attempt in range(1, 4):
+            while not (jobs := queue.lease()):
+                time.sleep(0.01)
+            assert jobs[0].attempts == attempt
+            failed_at = time.time()
+            state = queue.fail(jobs[0], "OCR failed")
+            delays.append(queue.get("flaky.png")["available_at"] - failed_at)
+        assert state == "dead" and queue.lease() == []
+        assert 0.09 < delays[0] < 0.11 and 0.19 < delays[1] < 0.21  # 0.1s, then 0.2s
+
+        assert queue.retry_dead() == 1
+        crashed = queue.lease("crashed-worker")[0]
+        assert queue.lease() == []  # Still leased
+        time.sleep(0.25)  # No heartbeat: the lease expires
+        recovered = queue.lease("worker-2")[0]
+        assert recovered.key == "flaky.png" and not queue.ack(crashed) and queue.ack(recovered)
+
+        queue.enqueue("slow.png")
+        job = queue.lease()[0]
+        with queue.keep_alive(job, interval=0.05):
+            time.sleep(0.4)  # Twice the lease, kept alive by heartbeats
+            assert queue.lease() == []
+        assert queue.ack(job)
+
+    print("✅ Backoff, dead-letter and lease expiry behave")
+    return True
+
+def test_cron_failures_wait_out_backoff():
+    """A broken upload is not retried on the next cron run; good uploads are processed and acked"""
+    print("🧪 Testing cron processor on the queue...")
+    from youtube_cron_processor import YouTubeCronProcessor
+
+    scratch = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(scratch)
+        processor = YouTubeCronProcessor(concurrency=1)
+        processor.log_message = lambda message: None
+
+        image = np.full((400, 600, 3), 250, dtype=np.uint8)
+        cv2.putText(image, "RSI breakout strategy", (20, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (20, 20, 20), 2)
+        cv2.imwrite(os.path.join(processor.watch_dir, "good.png"), image)
+        cv2.imwrite(os.path.join(processor.watch_dir, "broken.png"), image)
+
+        analyze = processor.service.process_youtube_analysis
+
+        async def analyze_or_fail(file_path, executor=None):
+            if file_path.endswith("broken.png"):
+                return {"error": "Claire timed out"}
+            return await analyze(file_path, executor)
+
+        processor.service.process_youtube_analysis = analyze_or_fail
+
+        from youtube_cron_processor import QUEUE_DEPTH, START_LATENCY
+        starts = START_LATENCY.count()
+        assert asyncio.run(processor.run_once()) == 1
+        assert processor.queue.get("good.png")["state"] == "done"
+        assert START_LATENCY.count() == starts + 2 and len(processor.start_latencies) == 2
+        broken = processor.queue.get("broken.png")
+        assert broken["state"] == "pending" and broken["attempts"] == 1
+
+        assert asyncio.run(processor.run_once()) == 0  # Backing off: not retried every cycle
+        assert processor.queue.get("broken.png")["attempts"] == 1
+        processor.log_if_drained()
+        assert QUEUE_DEPTH.value() == 1  # broken.png, from the shared queue
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch)
+
+    print(f"✅ broken.png backing off: {broken['last_error'][:60]}")
+    return True
+
+def test_timeout_kills_the_pool_task():
+    """A timed-out file's pool task is killed before the upload goes back for a retry"""
+    print("🧪 Testing per-file timeout...")
+    from youtube_cron_processor import YouTubeCronProcessor
+
+    scratch = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(scratch)
+        processor = YouTubeCronProcessor(concurrency=1, file_timeout=1.0)
+        processor.log_message = lambda message: None
+        cv2.imwrite(os.path.join(processor.watch_dir, "stuck.png"), np.full((100, 100, 3), 250, dtype=np.uint8))
+
+        pool_processes = []
+
+        async def hang(file_path, executor=None):
+            task = asyncio.get_running_loop().run_in_executor(executor, time.sleep, 60)
+            pool_processes.extend(executor._processes.values())
+            return await task
+
+        processor.service.process_youtube_analysis = hang
+        processor.enqueue_uploads([os.path.join(processor.watch_dir, "stuck.png")])
+        job = processor.queue.lease(processor.worker_id)[0]
+
+        started = time.monotonic()
+        assert not asyncio.run(processor.process_job(job))
+        assert time.monotonic() - started < 10
+        assert pool_processes and not any(process.is_alive() for process in pool_processes)
+        assert processor.executor is None and processor.pool_generation == 1
+        assert os.path.exists(os.path.join(processor.watch_dir, "stuck.png"))
+        row = processor.queue.get("stuck.png")
+        assert row["state"] == "pending" and row["attempts"] == 1 and "timed out" in row["last_error"]
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch)
+
+    print("✅ Pool task killed, upload backing off")
+    return True
+
+def main():
+    print("📬 Work Queue Test Suite")
+    print("=" * 40)
+
+    results = [test_processes_never_share_a_job(), test_backoff_dead_letter_and_lease_expiry(),
+               test_cron_failures_wait_out_backoff(), test_timeout_kills_the_pool_task()]
+
+    print("\n" + "=" * 40)
+    print(f"✅ {sum(results)}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
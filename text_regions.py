@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+🔲 Text Regions - Find text before OCR on social-media screenshots
+Morphological-gradient text detector (CPU, OpenCV only)
+
+Phone screenshots of YouTube/TikTok/Telegram are mostly video frame,
+avatars and blank chrome. Detecting text bands first and sending only
+those crops to the OCR pool cuts the pixels Tesseract scans; crops are
+OCR'd in parallel and merged back in reading order.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from ocr_preprocess import recognize_tiled
+from ocr_result import OCRResultBuilder
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+DETECTION_WIDTH = 1000       # Detect on a downscaled copy, map boxes back
+MIN_BOX_SIDE = 8             # px at detection scale
+MAX_TEXT_HEIGHT_RATIO = 0.15 # Taller blobs are photos/video frames, not text
+MIN_FILL, MAX_FILL = 0.10, 0.95
+CROP_PADDING = 4             # px at original scale, keeps ascenders/descenders
+FULL_FRAME_COVERAGE = 0.8    # Regions covering more than this -> just OCR the frame
+
+
+def detect_text_regions(image: np.ndarray) -> List[Box]:
+    """Text-like boxes in original image coordinates, reading order"""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+
+    scale = min(1.0, DETECTION_WIDTH / width)
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+    small_h, small_w = small.shape
+
+    # Character strokes light up in the morphological gradient
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    # Join characters into words/lines with a wide, short closing
+    joined = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w < MIN_BOX_SIDE or h < MIN_BOX_SIDE or h > small_h * MAX_TEXT_HEIGHT_RATIO:
+            continue
+        fill = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+        if not MIN_FILL <= fill <= MAX_FILL:
+            continue
+        boxes.append((x, y, w, h))
+
+    boxes = merge_boxes(boxes)
+
+    # Back to original coordinates with padding
+    regions = []
+    for x, y, w, h in boxes:
+        x0 = max(0, int(x / scale) - CROP_PADDING)
+        y0 = max(0, int(y / scale) - CROP_PADDING)
+        x1 = min(width, int((x + w) / scale) + CROP_PADDING)
+        y1 = min(height, int((y + h) / scale) + CROP_PADDING)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+
+    return [box for line in group_lines(regions) for box in line]
+
+
+def merge_boxes(boxes: List[Box]) -> List[Box]:
+    """Merge boxes on the same text line whose horizontal gap is under a line height"""
+    merged = True
+    boxes = list(boxes)
+    while merged:
+        merged = False
+        boxes.sort(key=lambda b: (b[1], b[0]))
+        result = []
+        for box in boxes:
+            for i, other in enumerate(result):
+                if _same_line(box, other) and _horizontal_gap(box, other) < max(box[3], other[3]):
+                    result[i] = _union(box, other)
+                    merged = True
+                    break
+            else:
+                result.append(box)
+        boxes = result
+    return boxes
+
+
+def group_lines(boxes: List[Box]) -> List[List[Box]]:
+    """Group boxes into lines (top to bottom), each sorted left to right"""
+    lines: List[List[Box]] = []
+    for box in sorted(boxes, key=lambda b: b[1] + b[3] / 2):
+        if lines and _same_line(box, _union_all(lines[-1])):
+            lines[-1].append(box)
+        else:
+            lines.append([box])
+    return [sorted(line, key=lambda b: b[0]) for line in lines]
+
+
+def _same_line(a: Box, b: Box) -> bool:
+    overlap = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    return overlap > 0.5 * min(a[3], b[3])
+
+
+def _horizontal_gap(a: Box, b: Box) -> int:
+    return max(a[0], b[0]) - min(a[0] + a[2], b[0] + b[2])
+
+
+def _union(a: Box, b: Box) -> Box:
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1, y1 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _union_all(boxes: List[Box]) -> Box:
+    result = boxes[0]
+    for box in boxes[1:]:
+        result = _union(result, box)
+    return result
+
+
+def ocr_text_regions(image: np.ndarray, engine, config: str = '--psm 6',
+                     region_config: str = '--psm 7') -> Dict[str, Any]:
+    """OCR only the detected text regions (in parallel) and merge in reading order
+
+    With no usable regions the whole image is OCR'd in tiles (recognize_tiled).
+    """
+    height, width = image.shape[:2]
+    regions = detect_text_regions(image)
+    region_pixels = sum(w * h for _, _, w, h in regions)
+
+    if not regions or region_pixels > FULL_FRAME_COVERAGE * width * height:
+        result = recognize_tiled(engine, image, config=config)  # Tall captures: bounded cost per call
+        return {
+            "text": result.text,
+            "result": result,
+            "regions": [],
+            "pixels_scanned": width * height,
+            "pixels_total": width * height
+        }
+
+    # Regions are single text lines, which OCR best as raw lines; all crops run in parallel
+    lines = group_lines(regions)
+    futures = [[engine.submit(image[y:y + h, x:x + w], config=region_config) for x, y, w, h in line]
+               for line in lines]
+
+    # Merge crop results into one page result, boxes shifted back to image coordinates
+    builder = OCRResultBuilder()
+    for line, line_futures in zip(lines, futures):
+        builder.new_line()
+        for (x, y, _, _), future in zip(line, line_futures):
+            try:
+                builder.add_result(future.result(), offset=(x, y))
+            except Exception:
+                continue
+    result = builder.build()
+
+    return {
+        "text": result.text,
+        "result": result,
+        "regions": [list(box) for line in lines for box in line],
+        "pixels_scanned": region_pixels,
+        "pixels_total": width * height
+    }
@@ -11,9 +11,11 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
+from metrics import instrument_flask
 
 app = Flask(__name__)
 CORS(app)
+instrument_flask(app, "video-collection-api")
 
 # Base directory for video collections
 BASE_DIR = Path("/home/jbot/aiiq_video_collection")
@@ -146,6 +148,7 @@ if __name__ == '__main__':
     print(f"   GET /video_pait_scores") 
     print(f"   GET /health")
     print(f"   GET /status")
+    print(f"   GET /metrics")
     
     # Create base directory if it doesn't exist
     BASE_DIR.mkdir(exist_ok=True)
@@ -23,6 +23,9 @@ from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
 import logging
 
+from keyword_matcher import register_vocabulary, scan
+from scoring_engine import get_scoring_engine
+
 # Setup logging
 Path('lens-data').mkdir(exist_ok=True)
 logging.basicConfig(
@@ -35,27 +38,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Credibility vocabularies (matched in one shared scan, see keyword_matcher.py)
+PLATFORM_INDICATORS = {
+    "youtube": ["views", "subscribers", "subscribe", "like"],
+    "tiktok": ["followers", "likes", "@"],
+    "instagram": ["followers", "posts", "@"],
+    "telegram": ["telegram", "channel", "bot"],
+    "discord": ["discord", "server"]
+}
+register_vocabulary(*PLATFORM_INDICATORS.values())
+
+CREDIBILITY_POSITIVE = register_vocabulary([
+    "verified", "official", "licensed", "regulated", 
+    "years experience", "track record", "audited",
+    "risk disclosure", "past performance"
+])
+
+CREDIBILITY_NEGATIVE = register_vocabulary([
+    "secret", "exclusive", "limited time", "act now",
+    "before it's too late", "insiders only", "leaked"
+])
+
 class VisualContentAnalyzer:
     """Analyze trading content from screenshots and images"""
     
-    def __init__(self, base_dir: str = "lens-data"):
+    # Page segmentation candidates, in the order the exhaustive mode tries them
+    PSM_CANDIDATES = [
+        6,   # Uniform block of text
+        3,   # Fully automatic page segmentation
+        8,   # Single word
+        13   # Raw line
+    ]
+    
+    # adaptive: predict one PSM from layout stats, single OCR pass
+    # race: run all candidates in parallel; the predicted PSM wins if confident,
+    #       else the first confident candidate that reads as much text as it did
+    # exhaustive: run all candidates, keep the longest text (original behaviour)
+    OCR_MODES = ("adaptive", "race", "exhaustive")
+    
+    # Share of the predicted PSM's characters a fallback must read to win the race
+    # (single word/line modes are often confident about a fraction of the text)
+    RACE_MIN_COVERAGE = 0.8
+    
+    def __init__(self, base_dir: str = "lens-data", ocr_mode: str = "adaptive",
+                 confidence_threshold: float = 80.0):
         self.base_dir = Path(base_dir)
         self.analysis_dir = self.base_dir / "visual_analysis"
         self.screenshots_dir = self.base_dir / "screenshots"
         
+        if ocr_mode not in self.OCR_MODES:
+            raise ValueError(f"Unknown OCR mode '{ocr_mode}' (expected one of {self.OCR_MODES})")
+        self.ocr_mode = ocr_mode
+        self.confidence_threshold = confidence_threshold  # Mean word confidence, 0-100
+        
         # Create directories
         for dir_path in [self.analysis_dir, self.screenshots_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
         logger.info("Visual Content Analyzer initialized")
     
-    def extract_text_from_image(self, image_path: str) -> Dict[str, Any]:
+    def extract_text_from_image(self, image_path: str, ocr_mode: Optional[str] = None) -> Dict[str, Any]:
         """Extract text from image using OCR"""
+        mode = ocr_mode or self.ocr_mode
         try:
             # Try to import OCR libraries
             import cv2
-            import pytesseract
-            from PIL import Image
+            from ocr_engine import get_engine, OCR_AVAILABLE
+            from layout_classifier import predict_psm
+            if not OCR_AVAILABLE:
+                raise ImportError("No OCR backend (tesserocr/pytesseract) installed")
             
             # Load and process image
             image = cv2.imread(image_path)
@@ -64,28 +115,24 @@ class VisualContentAnalyzer:
             
             # Convert to RGB for better OCR
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(image_rgb)
+            engine = get_engine()
             
-            # Extract text with different OCR configurations
-            configs = [
-                '--psm 6',  # Uniform block of text
-                '--psm 3',  # Fully automatic page segmentation
-                '--psm 8',  # Single word
-                '--psm 13'  # Raw line
-            ]
-            
-            best_text = ""
-            for config in configs:
-                try:
-                    text = pytesseract.image_to_string(pil_image, config=config)
-                    if len(text.strip()) > len(best_text.strip()):
-                        best_text = text
-                except:
-                    continue
+            if mode == "adaptive":
+                psm = predict_psm(image_rgb)
+                best = engine.recognize(image_rgb, config=f'--psm {psm}')
+            elif mode == "race":
+                best, psm = self._race_psm_candidates(engine, image_rgb, predict_psm(image_rgb))
+            else:
+                best, psm = self._exhaustive_psm_candidates(engine, image_rgb)
             
             return {
-                "text": best_text.strip(),
+                "text": best.text.strip(),
                 "extraction_method": "tesseract_ocr",
+                "ocr_mode": mode,
+                "psm": psm,
+                "word_count": len(best),
+                "mean_confidence": round(best.mean_confidence, 1),
+                "low_confidence_words": best.low_confidence_words()[:20],
                 "success": True
             }
             
@@ -107,6 +154,67 @@ class VisualContentAnalyzer:
             logger.error(f"OCR extraction failed: {e}")
             return {"error": str(e), "text": "", "success": False}
     
+    def _exhaustive_psm_candidates(self, engine, image_rgb) -> Tuple[Any, Optional[int]]:
+        """Run every PSM candidate and keep the longest output"""
+        from ocr_result import OCRResult
+        
+        futures = [engine.submit(image_rgb, f'--psm {psm}') for psm in self.PSM_CANDIDATES]
+        
+        best, best_psm = OCRResult(), None
+        for psm, future in zip(self.PSM_CANDIDATES, futures):
+            try:
+                result = future.result()
+                if len(result.text.strip()) > len(best.text.strip()):
+                    best, best_psm = result, psm
+            except:
+                continue
+        
+        return best, best_psm
+    
+    def _race_psm_candidates(self, engine, image_rgb, predicted_psm: int) -> Tuple[Any, Optional[int]]:
+        """Run candidates in parallel; the predicted PSM decides, the others are fallbacks
+        
+        A confident predicted result wins outright. Otherwise the first
+        confident fallback that reads at least RACE_MIN_COVERAGE of the
+        predicted result's text wins, else the longest output.
+        """
+        from concurrent.futures import as_completed
+        from ocr_result import OCRResult
+        
+        # Predicted PSM goes first so it is picked up first when workers are scarce
+        predicted_future = engine.submit(image_rgb, f'--psm {predicted_psm}')
+        fallbacks = {engine.submit(image_rgb, f'--psm {psm}'): psm
+                     for psm in self.PSM_CANDIDATES if psm != predicted_psm}
+        
+        try:
+            try:
+                predicted = predicted_future.result()
+            except:
+                predicted = OCRResult()
+            if predicted and predicted.mean_confidence >= self.confidence_threshold:
+                return predicted, predicted_psm
+            
+            min_chars = self.RACE_MIN_COVERAGE * len(predicted.text.strip())
+            best, best_psm = predicted, predicted_psm if predicted else None
+            for future in as_completed(fallbacks):
+                try:
+                    result = future.result()
+                except:
+                    continue
+                
+                text_length = len(result.text.strip())
+                if result and result.mean_confidence >= self.confidence_threshold and text_length >= min_chars:
+                    return result, fallbacks[future]
+                
+                # Nothing confident yet: fall back to the exhaustive rule
+                if text_length > len(best.text.strip()):
+                    best, best_psm = result, fallbacks[future]
+        finally:
+            for future in [predicted_future, *fallbacks]:
+                future.cancel()
+        
+        return best, best_psm
+    
     def analyze_profit_claims(self, text: str) -> Dict[str, Any]:
         """Analyze profit claims in the text"""
         
@@ -157,35 +265,18 @@ class VisualContentAnalyzer:
     def analyze_visual_credibility(self, text: str, image_path: str) -> Dict[str, Any]:
         """Analyze visual credibility markers"""
         
-        # Platform indicators
-        platform_indicators = {
-            "youtube": ["views", "subscribers", "subscribe", "like"],
-            "tiktok": ["followers", "likes", "@"],
-            "instagram": ["followers", "posts", "@"],
-            "telegram": ["telegram", "channel", "bot"],
-            "discord": ["discord", "server"]
-        }
+        hits = scan(text)
         
+        # Platform indicators
         detected_platform = "unknown"
-        for platform, keywords in platform_indicators.items():
-            if any(keyword.lower() in text.lower() for keyword in keywords):
+        for platform, keywords in PLATFORM_INDICATORS.items():
+            if hits.any(keywords):
                 detected_platform = platform
                 break
         
         # Credibility markers
-        credibility_positive = [
-            "verified", "official", "licensed", "regulated", 
-            "years experience", "track record", "audited",
-            "risk disclosure", "past performance"
-        ]
-        
-        credibility_negative = [
-            "secret", "exclusive", "limited time", "act now",
-            "before it's too late", "insiders only", "leaked"
-        ]
-        
-        positive_markers = [marker for marker in credibility_positive if marker.lower() in text.lower()]
-        negative_markers = [marker for marker in credibility_negative if marker.lower() in text.lower()]
+        positive_markers = hits.found(CREDIBILITY_POSITIVE)
+        negative_markers = hits.found(CREDIBILITY_NEGATIVE)
         
         # Calculate credibility score
         base_score = 2.5  # Neutral starting point
@@ -206,6 +297,23 @@ class VisualContentAnalyzer:
         
         profit_analysis = analysis_data.get("profit_claims", {})
         credibility_analysis = analysis_data.get("credibility", {})
+        ocr_analysis = analysis_data.get("ocr", {})
+        
+        # Legible overlay text is the one presentation signal the OCR pass gives for free:
+        # mean word confidence 0-100 maps onto 1.0-4.0 (50 -> the old 2.5 default)
+        if ocr_analysis.get("word_count"):
+            ocr_confidence = ocr_analysis.get("mean_confidence", 50.0)
+            presentation = {
+                "score": round(1.0 + 3.0 * ocr_confidence / 100, 2),
+                "reasoning": f"Text legibility: {ocr_analysis['word_count']} words at {ocr_confidence}% mean OCR confidence",
+                "ocr_confidence": ocr_confidence
+            }
+        else:
+            presentation = {
+                "score": 2.5,  # Default - could be enhanced with image analysis
+                "reasoning": "Visual presentation analysis (basic)",
+                "note": "Could be enhanced with advanced computer vision"
+            }
         
         # Component scoring (0-5 scale)
         components = {
@@ -224,41 +332,32 @@ class VisualContentAnalyzer:
                 "reasoning": f"Platform: {credibility_analysis.get('platform', 'unknown')}, {len(credibility_analysis.get('positive_markers', []))} positive vs {len(credibility_analysis.get('negative_markers', []))} negative markers",
                 "platform": credibility_analysis.get("platform", "unknown")
             },
-            "presentation_quality": {
-                "score": 2.5,  # Default - could be enhanced with image analysis
-                "reasoning": "Visual presentation analysis (basic)",
-                "note": "Could be enhanced with advanced computer vision"
-            }
-        }
-        
-        # Calculate overall score
-        weights = {
-            "profit_claims": 0.35,
-            "risk_disclosure": 0.25,
-            "visual_credibility": 0.25,
-            "presentation_quality": 0.15
+            "presentation_quality": presentation
         }
         
-        overall_score = sum(components[comp]["score"] * weights[comp] for comp in weights)
+        # Calculate overall score (weights in the visual_scoring config section)
+        profile = get_scoring_engine().profile("visual_scoring")
+        overall_score = profile.overall({comp: components[comp]["score"] for comp in profile.categories})
         overall_score = round(overall_score, 2)
         
-        # Generate recommendation
-        if overall_score >= 4.0:
-            recommendation = "HIGH CREDIBILITY - Worth investigating"
-        elif overall_score >= 3.0:
-            recommendation = "MODERATE - Proceed with caution"
-        elif overall_score >= 2.0:
-            recommendation = "LOW CREDIBILITY - High risk content"
-        else:
-            recommendation = "AVOID - Likely fraudulent claims"
-        
         return {
             "overall_pait_score": overall_score,
             "components": components,
-            "recommendation": recommendation,
+            "recommendation": self.pait_recommendation(overall_score),
             "scoring_method": "visual_analysis_v1"
         }
     
+    def pait_recommendation(self, overall_score: float) -> str:
+        """Recommendation for an overall visual pAIt score (0-5)"""
+        if overall_score >= 4.0:
+            return "HIGH CREDIBILITY - Worth investigating"
+        elif overall_score >= 3.0:
+            return "MODERATE - Proceed with caution"
+        elif overall_score >= 2.0:
+            return "LOW CREDIBILITY - High risk content"
+        else:
+            return "AVOID - Likely fraudulent claims"
+    
     def analyze_image(self, image_path: str) -> Dict[str, Any]:
         """Complete visual analysis pipeline"""
         
@@ -336,11 +435,13 @@ Perfect for analyzing:
     parser.add_argument('image_path', help='Path to image file to analyze')
     parser.add_argument('--output-dir', default='lens-data',
                        help='Output directory (default: lens-data)')
+    parser.add_argument('--ocr-mode', default='adaptive', choices=VisualContentAnalyzer.OCR_MODES,
+                       help='Page segmentation strategy (default: adaptive)')
     
     args = parser.parse_args()
     
     # Initialize analyzer
-    analyzer = VisualContentAnalyzer(args.output_dir)
+    analyzer = VisualContentAnalyzer(args.output_dir, ocr_mode=args.ocr_mode)
     
     # Analyze image
     try:
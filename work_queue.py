@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+📬 Work Queue - Durable leased job queue on SQLite (WAL)
+Processing state lives in a database instead of "is the file in
+processed/ yet", so a crash never loses or silently repeats work and a
+failing upload stops being retried every cycle.
+
+- enqueue(key, payload): idempotent per key; a key that finished (done)
+  is queued again, pending/leased/dead keys are left alone
+- lease(owner): hands out available jobs atomically (BEGIN IMMEDIATE), so
+  any number of worker processes can pull from the same file
+- heartbeat(job) / keep_alive(job): extend the lease while working; a
+  worker that dies stops heartbeating and the job is leased again once
+  the lease expires
+- ack(job): done
+- fail(job, error): pending again after exponential backoff
+  (backoff_base * 2^(attempts-1), capped at backoff_max), or dead once
+  max_attempts is used up; retry_dead() puts dead jobs back
+
+Job states: pending → leased → done | pending (retry) | dead
+
+Usage:
+    queue = WorkQueue("lens-data/work_queue.db", "uploads")
+    queue.enqueue("short_0001.png", {"path": "lens-data/uploads/short_0001.png"})
+    for job in queue.lease("worker-1"):
+        with queue.keep_alive(job):
+            ...
+        queue.ack(job)  # or queue.fail(job, str(error))
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+STATES = ("pending", "leased", "done", "dead")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (queue, state, available_at);
+"""
+
+
+def default_owner() -> str:
+    """host:pid, for lease_owner"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Job:
+    """A leased job; lease_token proves the lease is still ours"""
+    id: int
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: str
+
+
+class WorkQueue:
+    """One named queue in a SQLite database shared by every worker process"""
+
+    def __init__(self, path: str = "lens-data/work_queue.db", queue: str = "uploads",
+                 lease_seconds: float = 300.0, max_attempts: int = 5,
+                 backoff_base: float = 30.0, backoff_max: float = 3600.0):
+        self.path = path
+        self.queue = queue
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()  # One connection, shared by keep_alive threads
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # Durable across process crashes; WAL fsyncs at checkpoint
+        self._db.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")  # Take the write lock up front: no lease races between processes
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def enqueue(self, key: str, payload: Optional[Dict] = None, delay: float = 0.0) -> bool:
+        """Queue a job under key; True if it was added (or re-queued after finishing)"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                """INSERT INTO jobs (queue, key, payload, available_at, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (queue, key) DO UPDATE SET
+                       payload = excluded.payload, state = 'pending', attempts = 0, last_error = NULL,
+                       available_at = excluded.available_at, updated_at = excluded.updated_at
+                   WHERE state = 'done'""",
+                (self.queue, key, json.dumps(payload or {}), now + delay, now, now))
+            return cursor.rowcount > 0
+
+    def lease(self, owner: Optional[str] = None, limit: int = 1) -> List[Job]:
+        """Lease up to limit available jobs (pending and due, or with an expired lease)"""
+        now = time.time()
+        owner = owner or default_owner()
+        with self._transaction() as db:
+            # A job whose worker died on its last attempt is not handed out again
+            db.execute(
+                """UPDATE jobs SET state = 'dead', last_error = 'lease expired on final attempt', updated_at = ?
+                   WHERE queue = ? AND state = 'leased' AND available_at <= ? AND attempts >= ?""",
+                (now, self.queue, now, self.max_attempts))
+            rows = db.execute(
+                """SELECT id, key, payload, attempts FROM jobs
+                   WHERE queue = ? AND state IN ('pending', 'leased') AND available_at <= ?
+                   ORDER BY available_at, id LIMIT ?""",
+                (self.queue, now, limit)).fetchall()
+
+            jobs = []
+            for row in rows:
+                token = uuid.uuid4().hex
+                db.execute(
+                    """UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?,
+                       lease_token = ?, available_at = ?, updated_at = ? WHERE id = ?""",
+                    (owner, token, now + self.lease_seconds, now, row["id"]))
+                jobs.append(Job(row["id"], row["key"], json.loads(row["payload"]), row["attempts"] + 1, token))
+            return jobs
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extend the lease; False if it was lost (expired and taken by another worker)"""
+        now = time.time()
+        return self._update_leased(job, "available_at = ?, updated_at = ?", (now + self.lease_seconds, now))
+
+    def ack(self, job: Job) -> bool:
+        """Mark the job done; False if the lease was lost"""
+        return self._update_leased(job, "state = 'done', lease_token = NULL, last_error = NULL, updated_at = ?",
+                                   (time.time(),))
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> Optional[str]:
+        """Back off and retry, or dead-letter (no retries left, or retry=False); the new state"""
+        now = time.time()
+        if retry and job.attempts < self.max_attempts:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1))
+            state = "pending"
+        else:
+            delay = 0.0
+            state = "dead"
+        updated = self._update_leased(
+            job, "state = ?, available_at = ?, last_error = ?, lease_token = NULL, updated_at = ?",
+            (state, now + delay, str(error)[:1000], now))
+        return state if updated else None
+
+    def release(self, job: Job, delay: float = 0.0) -> bool:
+        """Give the job back unprocessed (shutdown, busy elsewhere); the attempt is not counted"""
+        now = time.time()
+        return self._update_leased(
+            job, "state = 'pending', attempts = attempts - 1, available_at = ?, lease_token = NULL, updated_at = ?",
+            (now + delay, now))
+
+    def _update_leased(self, job: Job, assignments: str, params: tuple) -> bool:
+        with self._transaction() as db:
+            cursor = db.execute(f"UPDATE jobs SET {assignments} WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                                params + (job.id, job.lease_token))
+            return cursor.rowcount > 0
+
+    @contextmanager
+    def keep_alive(self, job: Job, interval: Optional[float] = None):
+        """Heartbeat from a background thread while the block runs"""
+        stop = threading.Event()
+        interval = interval or self.lease_seconds / 3
+
+        def beat():
+            while not stop.wait(interval):
+                if not self.heartbeat(job):
+                    return
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield job
+        finally:
+            stop.set()
+            thread.join()
+
+    def retry_dead(self, key: Optional[str] = None) -> int:
+        """Put dead jobs (or one key) back to pending with a fresh attempt budget"""
+        now = time.time()
+        query = "UPDATE jobs SET state = 'pending', attempts = 0, available_at = ?, updated_at = ? WHERE queue = ? AND state = 'dead'"
+        params = (now, now, self.queue)
+        if key is not None:
+            query += " AND key = ?"
+            params += (key,)
+        with self._transaction() as db:
+            return db.execute(query, params).rowcount
+
+    def prune(self, older_than_seconds: float = 30 * 86400) -> int:
+        """Delete done jobs last touched before the cutoff"""
+        with self._transaction() as db:
+            return db.execute("DELETE FROM jobs WHERE queue = ? AND state = 'done' AND updated_at < ?",
+                              (self.queue, time.time() - older_than_seconds)).rowcount
+
+    def next_available_in(self) -> Optional[float]:
+        """Seconds until the next pending job or lease expiry is due (0 if one is due now, None if idle)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(available_at) FROM jobs WHERE queue = ? AND state IN ('pending', 'leased')",
+                (self.queue,)).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """A job's row by key (state, attempts, last_error, ...)"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE queue = ? AND key = ?", (self.queue, key)).fetchone()
+        return dict(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Jobs per state and the age of the oldest due job"""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state", (self.queue,)).fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(created_at) FROM jobs WHERE queue = ? AND state = 'pending' AND available_at <= ?",
+                (self.queue, now)).fetchone()[0]
+        stats = {state: counts.get(state, 0) for state in STATES}
+        stats["oldestPendingSeconds"] = round(now - oldest, 1) if oldest else None
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()